@@ -0,0 +1,34 @@
+"""
+Built-in .env parser vs python-dotenv
+
+    PYTHONPATH=. python benchmarks/bench_envfile.py [lines]
+"""
+
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+from ipl_config.envfile import read_env
+from ipl_config.source import read_env_file
+
+
+def main(lines: int = 10000) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        env = Path(tmp) / '.env'
+        with open(env, 'w', encoding='utf-8') as f:
+            for i in range(lines):
+                f.write(f"APP_KEY_{i}='value {i}'  # comment\n")
+            f.write(Path('tests/.env').read_text())
+
+        for name, fn in (
+            ('builtin', lambda: read_env(env)),
+            ('builtin mmap', lambda: read_env(env, use_mmap=True)),
+            ('dotenv', lambda: read_env_file(env, parser='dotenv')),
+        ):
+            n, elapsed = timeit.Timer(fn).autorange()
+            print(f"{name:>14}: {elapsed / n * 1000:8.2f}ms per {lines} lines")
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
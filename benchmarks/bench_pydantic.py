@@ -0,0 +1,71 @@
+"""
+`ipl_config.BaseSettings` (pydantic v1) vs `ipl_config.v2.BaseSettings`
+(pydantic-core): instantiation and json dump throughput, needs pydantic v2
+
+    PYTHONPATH=. python benchmarks/bench_pydantic.py [items]
+"""
+
+import io
+import json
+import sys
+import timeit
+from typing import Any, Callable, Dict, List, Tuple
+
+from pydantic import BaseModel as BaseModelV2
+from pydantic.v1 import BaseModel as BaseModelV1
+
+from ipl_config import BaseSettings as BaseSettingsV1
+from ipl_config.v2 import BaseSettings as BaseSettingsV2
+
+
+def make_classes(base_model: type, base_settings: type) -> type:
+    class Upstream(base_model):  # type: ignore[misc, valid-type]
+        host: str
+        port: int
+        weight: float = 1.0
+        tags: List[str] = []
+
+    class Settings(base_settings):  # type: ignore[misc, valid-type]
+        name: str
+        upstreams: List[Upstream]
+        limits: Dict[str, int]
+
+    return Settings
+
+
+def main(items: int = 1000) -> None:
+    doc = {
+        'name': 'app',
+        'upstreams': [
+            {'host': f"h{i}", 'port': i, 'tags': ['a', 'b']}
+            for i in range(items)
+        ],
+        'limits': {f"k{i}": i for i in range(items)},
+    }
+    config = json.dumps(doc).encode()
+
+    for name, settings in (
+        ('v1', make_classes(BaseModelV1, BaseSettingsV1)),
+        ('v2', make_classes(BaseModelV2, BaseSettingsV2)),
+    ):
+        bench(name, settings, config, items)
+
+
+def bench(name: str, settings: type, config: bytes, items: int) -> None:
+    def init() -> Any:
+        return settings(
+            env_file=None, config_file=config, config_format='json'
+        )
+
+    cfg = init()
+    cases: Tuple[Tuple[str, Callable[[], Any]], ...] = (
+        ('init', init),
+        ('dump', lambda: cfg.write_json(io.StringIO())),
+    )
+    for case, fn in cases:
+        n, elapsed = timeit.Timer(fn).autorange()
+        print(f"{name} {case:>5}: {elapsed / n * 1000:8.2f}ms per {items}")
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -1,4 +1,6 @@
+from .holder import SettingsHolder
 from .settings import BaseSettings
+from .sourceset import SourceSet
 
 
-__all__ = ('BaseSettings',)
+__all__ = 'BaseSettings', 'SettingsHolder', 'SourceSet'
@@ -22,5 +22,19 @@ try:
 except ImportError:
     yaml = ImportError('pyyaml is not installed')  # type: ignore[no-redef]
 
+try:
+    from multiprocessing import shared_memory  # py38
+except ImportError:
+    shared_memory = ImportError(  # type: ignore[assignment]
+        'multiprocessing.shared_memory requires python 3.8+'
+    )
+
+try:
+    from importlib import metadata  # py38
+except ImportError:
+    metadata = ImportError(  # type: ignore[assignment]
+        'importlib.metadata requires python 3.8+'
+    )
+
 
-__all__ = 'dotenv', 'hcl2', 'toml', 'yaml'
+__all__ = 'dotenv', 'hcl2', 'metadata', 'shared_memory', 'toml', 'yaml'
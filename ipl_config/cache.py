@@ -0,0 +1,150 @@
+"""
+Persistent parse cache for config files, like `__pycache__` for configs.
+
+The parsed document is pickled into the cache directory under
+the key of the content hash, the parser name and the parser version.
+Pickles are trusted only in a private cache: the directory is created
+with the 0o700 mode, a directory or an entry of another user or writable
+by others is not used.
+"""
+
+import os
+import pickle  # nosec
+import tempfile
+from hashlib import blake2b
+from os import PathLike
+from pathlib import Path
+from typing import Any, Union
+from warnings import warn
+
+from .dumploads import BytesLike, ConfigLoadCallable, is_bytes_like
+
+
+CACHE_SUFFIX = '.pickle'
+
+
+class ParseCache:
+    __slots__ = 'directory', 'max_size'
+
+    def __init__(
+        self, directory: Union[str, PathLike], max_size: int = 64 * 2**20
+    ) -> None:
+        self.directory: Path = Path(directory).expanduser()
+        self.max_size: int = max_size
+
+    def key(self, content: bytes, parser: str, version: str) -> str:
+        h = blake2b(content, digest_size=20)
+        h.update(b'\0' + parser.encode() + b'\0' + version.encode())
+        return h.hexdigest()
+
+    def load(
+        self,
+        source: Union[str, PathLike, BytesLike],
+        loader: ConfigLoadCallable,
+        version: str = '',
+        **kw: Any,
+    ) -> Any:
+        """
+        Parse the file or the content with the loader or take it from the cache
+        :param kw: loader options, `version` must tell them apart
+        """
+        if is_bytes_like(source):
+            content = bytes(source)  # type: ignore[arg-type]
+        else:
+            content = Path(source).expanduser().read_bytes()  # type: ignore
+        name = getattr(loader, '__qualname__', type(loader).__name__)
+        cache_file = self.directory / (
+            self.key(content, name, version) + CACHE_SUFFIX
+        )
+
+        if not self.is_private():
+            warn(
+                f"Parse cache {str(self.directory)!r} is not private,"
+                ' not used',
+                UserWarning,
+            )
+            return loader(content, **kw)
+
+        try:
+            with open(cache_file, 'rb') as f:
+                if _is_private(os.fstat(f.fileno())):
+                    obj = pickle.load(f)  # nosec
+                    try:
+                        os.utime(cache_file)
+                    except OSError:  # the hit is valid anyway
+                        pass
+                    return obj
+        except (OSError, EOFError, pickle.UnpicklingError):
+            pass
+
+        obj = loader(content, **kw)
+        try:
+            self.store(cache_file, obj)
+        except OSError:  # read-only or full fs, just parse every time
+            pass
+        return obj
+
+    def is_private(self) -> bool:
+        """
+        :return: True if the directory is missing or private to the user
+        """
+        try:
+            st = os.stat(self.directory)
+        except FileNotFoundError:
+            return True
+        except OSError:
+            return False
+        return _is_private(st)
+
+    def store(self, cache_file: Path, obj: Any) -> None:
+        self.directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(
+            dir=self.directory, prefix='.', suffix=CACHE_SUFFIX
+        )
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, cache_file)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        self.evict()
+
+    def evict(self) -> None:
+        """
+        Remove the least recently used entries above `max_size`
+        """
+        entries = []
+        total = 0
+        for p in self.directory.glob('*' + CACHE_SUFFIX):
+            try:
+                st = p.stat()
+            except FileNotFoundError:  # concurrent eviction
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+            total += st.st_size
+
+        for _, size, p in sorted(entries, key=lambda x: x[0]):
+            if total <= self.max_size:
+                break
+            try:
+                p.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self) -> None:
+        for p in self.directory.glob('*' + CACHE_SUFFIX):
+            try:
+                p.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def _is_private(st: os.stat_result) -> bool:
+    """
+    Owned by the user and not writable by others, always on Windows
+    """
+    if not hasattr(os, 'getuid'):  # pragma: no cover
+        return True
+    return st.st_uid == os.getuid() and not st.st_mode & 0o022
@@ -0,0 +1,221 @@
+"""
+Usage:
+    python -m ipl_config validate pkg.module:Settings conf/*.yaml -j 8
+    python -m ipl_config convert config.tf config.yaml
+    python -m ipl_config dump pkg.module:Settings -c config.yaml -f env
+
+An error is reported on stderr with the exit code 1.
+"""
+
+import argparse
+import importlib
+import sys
+import time
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+
+from .dumploads import (
+    ConfigDumpCallable,
+    ConfigLoadCallable,
+    hcl2_load,
+    json_dump,
+    json_load,
+    toml_dump,
+    toml_load,
+    yaml_dump,
+    yaml_load,
+)
+from .settings import BaseSettings
+from .source import (
+    FileSettingsStrategy,
+    Hcl2SettingsStrategy,
+    JsonSettingsStrategy,
+    TomlSettingsStrategy,
+    YamlSettingsStrategy,
+)
+
+
+FORMATS: Dict[
+    str,
+    Tuple[
+        Type[FileSettingsStrategy],
+        ConfigLoadCallable,
+        Optional[ConfigDumpCallable],
+    ],
+] = {
+    'json': (JsonSettingsStrategy, json_load, json_dump),
+    'yaml': (YamlSettingsStrategy, yaml_load, yaml_dump),
+    'toml': (TomlSettingsStrategy, toml_load, toml_dump),
+    'hcl2': (Hcl2SettingsStrategy, hcl2_load, None),
+}
+
+
+def import_settings(path: str) -> Type[BaseSettings]:
+    """
+    :param path: `package.module:ClassName` or `package.module.ClassName`
+    """
+    if ':' in path:
+        module_name, _, name = path.partition(':')
+    else:
+        module_name, _, name = path.rpartition('.')
+    clz = getattr(importlib.import_module(module_name), name)
+    if not (isinstance(clz, type) and issubclass(clz, BaseSettings)):
+        raise TypeError(f"{path!r} is not a BaseSettings subclass")
+    return clz
+
+
+def detect_format(path: Path, config_format: Optional[str] = None) -> str:
+    for fmt, (strategy, *_) in FORMATS.items():
+        if strategy.is_acceptable(path, config_format):
+            return fmt
+    raise NotImplementedError(f"No readers found for the config file: {path}")
+
+
+def validate_file(
+    settings: str,
+    config_file: str,
+    env_file: Optional[str] = None,
+    config_format: Optional[str] = None,
+) -> Tuple[str, float, Optional[str]]:
+    """
+    :return: config file, elapsed seconds, error or None on success
+    """
+    start = time.perf_counter()
+    try:
+        import_settings(settings)(
+            env_file=env_file,
+            config_file=config_file,
+            config_format=config_format,
+        )
+    except Exception as e:  # pylint: disable=broad-except
+        return config_file, time.perf_counter() - start, format_error(e)
+    return config_file, time.perf_counter() - start, None
+
+
+def format_error(e: Exception) -> str:
+    return f"{type(e).__name__}: {e}"  # the message may be empty
+
+
+def positive_int(s: str) -> int:
+    value = int(s)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"{s} is not a positive number")
+    return value
+
+
+def cmd_validate(args: argparse.Namespace) -> int:
+    pool: Executor
+    if args.jobs == 1:
+        pool = ThreadPoolExecutor(max_workers=1)
+    else:
+        pool = ProcessPoolExecutor(max_workers=args.jobs)
+
+    failed = 0
+    with pool:
+        for config_file, elapsed, err in pool.map(
+            validate_file,
+            [args.settings] * len(args.files),
+            args.files,
+            [args.env_file] * len(args.files),
+            [args.format] * len(args.files),
+        ):
+            status = 'OK' if err is None else 'FAIL'
+            print(f"{status}\t{elapsed * 1000:.1f}ms\t{config_file}")
+            if err is not None:
+                failed += 1
+                print('\t' + err.replace('\n', '\n\t'), file=sys.stderr)
+
+    print(f"{len(args.files) - failed} passed, {failed} failed")
+    return int(bool(failed))
+
+
+def cmd_convert(args: argparse.Namespace) -> int:
+    src, dst = Path(args.src), Path(args.dst)
+    _, load, _ = FORMATS[detect_format(src, args.from_format)]
+    _, _, dump = FORMATS[detect_format(dst, args.to_format)]
+    if dump is None:
+        raise NotImplementedError(f"No writers found for the file: {dst}")
+    dump(load(src), dst)
+    return 0
+
+
+def cmd_dump(args: argparse.Namespace) -> int:
+    clz = import_settings(args.settings)
+    cfg = clz(
+        env_prefix=args.env_prefix,
+        env_file=args.env_file,
+        config_file=args.config_file,
+        config_format=args.config_format,
+    )
+    if args.format == 'env':
+        for k, v in cfg.to_env().items():
+            print(f"{k}={v}")
+    elif args.format == 'json':
+        cfg.write_json(sys.stdout, indent=2)
+        print()
+    elif args.format == 'yaml':
+        cfg.write_yaml(sys.stdout)
+    elif args.format == 'toml':
+        cfg.write_toml(sys.stdout)
+    return 0
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog='ipl_config', description='ipl-config tools'
+    )
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    p = commands.add_parser('validate', help='validate config files')
+    p.add_argument('settings', help='package.module:SettingsClass')
+    p.add_argument('files', nargs='+', help='config files')
+    p.add_argument('-e', '--env-file', default=None)
+    p.add_argument('-F', '--format', default=None, help='config format')
+    p.add_argument(
+        '-j',
+        '--jobs',
+        type=positive_int,
+        default=None,
+        help='parallel processes',
+    )
+    p.set_defaults(func=cmd_validate)
+
+    p = commands.add_parser('convert', help='convert config file format')
+    p.add_argument('src')
+    p.add_argument('dst')
+    p.add_argument('--from', dest='from_format', default=None)
+    p.add_argument('--to', dest='to_format', default=None)
+    p.set_defaults(func=cmd_convert)
+
+    p = commands.add_parser('dump', help='print the effective config')
+    p.add_argument('settings', help='package.module:SettingsClass')
+    p.add_argument('-c', '--config-file', default=None)
+    p.add_argument('-F', '--config-format', default=None)
+    p.add_argument('-e', '--env-file', default=None)
+    p.add_argument('-p', '--env-prefix', default=None)
+    p.add_argument(
+        '-f',
+        '--format',
+        choices=('json', 'yaml', 'toml', 'env'),
+        default='json',
+    )
+    p.set_defaults(func=cmd_dump)
+
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> Any:
+    """
+    :return: exit code, an error is reported on stderr
+    """
+    args = parse_args(argv)
+    try:
+        return args.func(args)
+    except Exception as e:  # pylint: disable=broad-except
+        print(format_error(e), file=sys.stderr)
+        return 1
@@ -1,21 +1,40 @@
+import codecs
 import io
 import json
+import mmap
+import sys
 from contextlib import contextmanager
+from functools import lru_cache
 from ipaddress import IPv4Address
 from os import PathLike
 from pathlib import Path
-from typing import IO, Any, Dict, Generator, Union, no_type_check  # noqa: I101
+from typing import (  # noqa: I101
+    IO,
+    Any,
+    Dict,
+    Generator,
+    Iterable,
+    Optional,
+    Set,
+    Union,
+    no_type_check,
+)
 
 from typing_extensions import Protocol  # py38
 
 from ._optional_libs import hcl2, toml, yaml
+from .limits import JSON_TOKENS, TOML_TOKENS, Guard, Limits  # noqa: I101
 
 
 StrPathIO = Union[str, PathLike, IO, io.IOBase]
+BytesLike = Union[bytes, bytearray, memoryview, mmap.mmap]
+LoadSource = Union[StrPathIO, BytesLike]
+
+MMAP_THRESHOLD = 2**20
 
 
 class ConfigLoadCallable(Protocol):  # pylint: disable=too-few-public-methods
-    def __call__(self, f: StrPathIO, **kw: Any) -> Any:
+    def __call__(self, f: LoadSource, **kw: Any) -> Any:
         pass  # pragma: no cover
 
 
@@ -51,6 +70,54 @@ def ensure_stream(
         f.close()
 
 
+def is_bytes_like(o: Any) -> bool:
+    return isinstance(o, (bytes, bytearray, memoryview, mmap.mmap))
+
+
+@contextmanager
+def ensure_input(
+    source: LoadSource, mmap_threshold: Optional[int] = None
+) -> Generator[Union[BytesLike, IO, io.IOBase], None, None]:
+    """
+    Loaders input: bytes like objects and streams as is, `-` is the stdin,
+    files from `mmap_threshold` (`MMAP_THRESHOLD`) bytes are mapped,
+    smaller ones are opened in the text mode.
+    Both are decoded as utf-8 with `surrogateescape`
+    """
+    if mmap_threshold is None:
+        mmap_threshold = MMAP_THRESHOLD
+    if is_bytes_like(source) or isinstance(source, io.IOBase):
+        yield source  # type: ignore[misc]
+        return
+    if str(source) == '-':
+        yield sys.stdin.buffer
+        return
+
+    path = Path(source).expanduser()  # type: ignore[arg-type]
+    if path.stat().st_size < mmap_threshold:
+        with ensure_stream(path) as s:
+            yield s
+        return
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
+
+
+def read_text(data: Union[str, BytesLike, IO, io.IOBase]) -> str:
+    """
+    Decode once for the parsers which accept only `str`
+    """
+    if isinstance(data, str):
+        return data
+    if not is_bytes_like(data):
+        data = data.read()  # type: ignore[union-attr]
+        if isinstance(data, str):
+            return data
+    return str(
+        data, encoding='utf-8', errors='surrogateescape'  # type: ignore
+    )
+
+
 # === JSON ===
 
 
@@ -68,15 +135,102 @@ def json_dumps(obj: Dict[str, Any], **kw: Any) -> str:
     return sio.getvalue()
 
 
-def json_load(f: StrPathIO, **kw: Any) -> Any:
-    with ensure_stream(f) as s:
-        return json.load(s, **kw)
+def json_load(
+    f: LoadSource, limits: Union[Limits, Guard, None] = None, **kw: Any
+) -> Any:
+    """
+    :param limits: the limits or the shared guard of a load
+    """
+    with ensure_input(f) as s:
+        if limits is None:
+            return _json_load(s, **kw)
+        guard = Guard.of(limits)
+        data = guard.read(s)
+        guard.scan(data, JSON_TOKENS)
+        if 'object_hook' not in kw and 'object_pairs_hook' not in kw:
+            kw['object_pairs_hook'] = guard.pairs_hook
+        doc = _json_load(data, **kw)
+        guard.check_time()
+        return doc
+
+
+def _json_load(s: Union[str, BytesLike, IO, io.IOBase], **kw: Any) -> Any:
+    # decoded straight from the buffer, as the text mode stream
+    return json.loads(read_text(s), **kw)
 
 
 def json_loads(s: str, **kw: Any) -> Any:
     return json.loads(s, **kw)
 
 
+def json_iter_array(
+    f: StrPathIO,
+    chunk_size: int = 2**16,
+    limits: Union[Limits, Guard, None] = None,
+    **kw: Any,
+) -> Generator[Any, None, None]:
+    """
+    Stream items of the top level json array without loading the document
+    :param limits: bound the read bytes, the items and the time
+    """
+    decoder = json.JSONDecoder(**kw)
+    guard = None if limits is None else Guard.of(limits)
+
+    with ensure_stream(f) as s:
+        buf, pos = '', 0
+
+        def more() -> bool:
+            nonlocal buf, pos
+            chunk = s.read(chunk_size)
+            if guard is not None:
+                encoded = chunk.encode(  # type: ignore[union-attr]
+                    'utf-8', 'surrogateescape'
+                )
+                guard.add_size(len(encoded))
+            buf, pos = buf[pos:] + chunk, 0  # type: ignore[operator]
+            return bool(chunk)
+
+        def peek() -> str:
+            nonlocal pos
+            while True:
+                while pos < len(buf) and buf[pos] in ' \t\r\n':
+                    pos += 1
+                if pos < len(buf):
+                    return buf[pos]
+                if not more():
+                    return ''
+
+        if peek() != '[':
+            raise ValueError('Expecting a json array')
+        pos += 1
+        if peek() == ']':
+            return
+
+        while True:
+            peek()
+            while True:
+                try:
+                    item, end = decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError:
+                    if more():
+                        continue
+                    raise
+                if end == len(buf) and more():  # number may continue
+                    continue
+                break
+            if guard is not None:
+                guard.node()
+            yield item
+
+            pos = end
+            c = peek()
+            if c == ']':
+                return
+            if c != ',':
+                raise ValueError(f"Expecting ',' delimiter, got {c!r}")
+            pos += 1
+
+
 # === YAML ===
 
 # TODO: DELETEME
@@ -108,13 +262,189 @@ def yaml_dumps(obj: Dict[str, Any], **kw: Any) -> str:
     return sio.getvalue()
 
 
-def yaml_load(f: StrPathIO, **_: Any) -> Any:
-    with ensure_stream(f) as s:
-        return yaml.load(s, yaml.SafeLoader)
+class Include(str):
+    """
+    Path of the `!include` yaml tag, resolved by `ipl_config.include`
+    """
+
+    __slots__ = ()
+
+    def __reduce__(self) -> Any:
+        return Include, (str(self),)
+
+
+@lru_cache(maxsize=None)
+def _yaml_loader(includes: bool = False) -> Any:
+    """
+    SafeLoader with the optional `guard`, `!include` tag support if enabled
+    """
+    loader: Any = type(
+        'IncludeSafeLoader' if includes else 'GuardSafeLoader',
+        (yaml.SafeLoader,),
+        {'guard': None, 'compose_node': _yaml_compose_node},
+    )
+    if includes:
+        loader.add_constructor(
+            '!include', lambda self, node: Include(self.construct_scalar(node))
+        )
+    return loader
+
+
+def _yaml_compose_node(loader: Any, parent: Any, index: Any) -> Any:
+    """
+    Count the nodes, an alias counts as its expanded subtree
+    """
+    guard: Optional[Guard] = loader.guard
+    if guard is None:
+        return yaml.SafeLoader.compose_node(loader, parent, index)
+
+    if loader.check_event(yaml.AliasEvent):
+        node = yaml.SafeLoader.compose_node(loader, parent, index)
+        guard.alias(loader.guard_sizes.get(id(node), 1))
+        return node
+    if loader.check_event(yaml.ScalarEvent):
+        guard.node()
+        return yaml.SafeLoader.compose_node(loader, parent, index)
+
+    nodes = guard.nodes
+    guard.enter()
+    try:
+        node = yaml.SafeLoader.compose_node(loader, parent, index)
+    finally:
+        guard.exit()
+    loader.guard_sizes[id(node)] = guard.nodes - nodes
+    return node
+
+
+def _yaml_open(
+    s: Union[BytesLike, IO, io.IOBase],
+    limits: Union[Limits, Guard, None],
+    includes: bool = False,
+) -> Any:
+    if limits is None:
+        return _yaml_loader(includes)(_yaml_input(s))
+    guard = Guard.of(limits)
+    loader = _yaml_loader(includes)(_yaml_input(guard.read(s)))
+    loader.guard = guard
+    loader.guard_sizes = {}  # id(node) -> expanded nodes of anchors
+    return loader
+
+
+def _yaml_input(s: Union[str, BytesLike, IO, io.IOBase]) -> Any:
+    """
+    yaml reads str, bytes and streams, mmap is decoded as the text mode stream
+    """
+    if isinstance(s, mmap.mmap):
+        s.seek(0)
+        return codecs.getreader('utf-8')(s, errors='surrogateescape')
+    if isinstance(s, (bytearray, memoryview)):
+        return bytes(s)
+    return s
+
+
+def yaml_load(
+    f: LoadSource,
+    limits: Union[Limits, Guard, None] = None,
+    includes: bool = False,
+    **_: Any,
+) -> Any:
+    """
+    :param includes: parse `!include path` tags for `ipl_config.include`
+    """
+    with ensure_input(f) as s:
+        loader = _yaml_open(s, limits, includes)
+        try:
+            return loader.get_single_data()
+        finally:
+            loader.dispose()
+
+
+def yaml_load_sections(
+    f: LoadSource,
+    sections: Iterable[str],
+    limits: Union[Limits, Guard, None] = None,
+    includes: bool = False,
+    **_: Any,
+) -> Any:
+    """
+    Load only the `sections` keys of the top level mapping,
+    other sections are skipped at the event level without composing
+    """
+    if limits is not None:
+        limits = Guard.of(limits)
+        counts = limits.size, limits.nodes, limits.aliases
+    with ensure_input(f) as s:
+        loader = _yaml_open(s, limits, includes)
+        try:
+            return _yaml_sections(loader, set(sections))
+        except yaml.composer.ComposerError:  # alias of a skipped anchor
+            if isinstance(s, io.IOBase) and not s.seekable():
+                raise
+        finally:
+            loader.dispose()
+
+    if limits is not None:  # the same document once more
+        limits.size, limits.nodes, limits.aliases = counts
+    with ensure_input(f) as s:
+        if isinstance(s, io.IOBase):
+            s.seek(0)
+        loader = _yaml_open(s, limits, includes)
+        try:
+            doc = loader.get_single_data()
+        finally:
+            loader.dispose()
+    if isinstance(doc, dict):
+        doc = {k: v for k, v in doc.items() if k in sections}
+    return doc
+
+
+def _yaml_sections(loader: Any, sections: Set[str]) -> Any:
+    loader.get_event()  # stream start
+    if loader.check_event(yaml.StreamEndEvent):
+        return None
+    loader.get_event()  # document start
+
+    if not loader.check_event(yaml.MappingStartEvent):
+        node = loader.compose_node(None, None)
+    else:
+        start = loader.get_event()
+        tag = loader.resolve(yaml.MappingNode, start.tag, start.implicit)
+        node = yaml.MappingNode(
+            tag, [], start.start_mark, None, flow_style=start.flow_style
+        )
+        if start.anchor is not None:
+            loader.anchors[start.anchor] = node
+
+        while not loader.check_event(yaml.MappingEndEvent):
+            key = loader.compose_node(node, None)
+            if isinstance(key, yaml.ScalarNode) and (
+                key.value in sections or key.tag == 'tag:yaml.org,2002:merge'
+            ):
+                node.value.append((key, loader.compose_node(node, key)))
+                continue
+
+            depth = 0
+            while True:  # skip the value
+                event = loader.get_event()
+                if isinstance(
+                    event, (yaml.MappingStartEvent, yaml.SequenceStartEvent)
+                ):
+                    depth += 1
+                elif isinstance(
+                    event, (yaml.MappingEndEvent, yaml.SequenceEndEvent)
+                ):
+                    depth -= 1
+                if not depth:
+                    break
+
+        node.end_mark = loader.get_event().end_mark
+
+    loader.get_event()  # document end
+    return loader.construct_document(node)
 
 
 def yaml_loads(s: str, **_: Any) -> Any:
-    return yaml.load(s, yaml.SafeLoader)
+    return yaml.load(s, _yaml_loader())  # nosec
 
 
 # === TOML ===
@@ -144,9 +474,20 @@ def toml_dumps(obj: Dict[str, Any], **kw: Any) -> str:
     return toml.dumps(obj, encoder=encoder)
 
 
-def toml_load(f: StrPathIO, **kw: Any) -> Any:
-    with ensure_stream(f) as s:
-        return toml.load(s, **kw)
+def toml_load(
+    f: LoadSource, limits: Union[Limits, Guard, None] = None, **kw: Any
+) -> Any:
+    with ensure_input(f) as s:
+        if limits is None:
+            return toml.loads(read_text(s), **kw)
+        guard = Guard.of(limits)
+        text = read_text(guard.read(s))
+        nodes = guard.nodes
+        guard.scan(text, TOML_TOKENS)
+        guard.nodes = nodes  # the scan counts are approximate
+        doc = toml.loads(text, **kw)
+        guard.walk(doc)
+        return doc
 
 
 def toml_loads(s: str, **kw: Any) -> Any:
@@ -156,9 +497,20 @@ def toml_loads(s: str, **kw: Any) -> Any:
 # === HCL2 ===
 
 
-def hcl2_load(f: StrPathIO, **_: Any) -> Any:
-    with ensure_stream(f) as s:
-        return hcl2.load(s)
+def hcl2_load(
+    f: LoadSource, limits: Union[Limits, Guard, None] = None, **_: Any
+) -> Any:
+    """
+    The parser has no hooks, the depth, the nodes and the time are
+    checked after the parse, so only `max_bytes` bounds the parse itself
+    """
+    with ensure_input(f) as s:
+        if limits is None:
+            return hcl2.loads(read_text(s))
+        guard = Guard.of(limits)
+        doc = hcl2.loads(read_text(guard.read(s)))
+        guard.walk(doc)
+        return doc
 
 
 def hcl2_loads(s: str, **_: Any) -> Any:
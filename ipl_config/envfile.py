@@ -0,0 +1,159 @@
+"""
+Streaming .env parser with the python-dotenv quoting rules
+but without the variables expansion
+"""
+
+import codecs
+import mmap
+import re
+from os import PathLike
+from pathlib import Path
+from typing import (
+    Container,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Match,
+    Optional,
+    Tuple,
+    Union,
+)
+from warnings import warn
+
+
+_key = re.compile(
+    r"[^\S\r\n]*(?:export[^\S\r\n]+)?"
+    r"(?:'(?P<qkey>[^']+)'|(?P<key>[^=#\s'][^=#\s]*))"
+    r"[^\S\r\n]*(?P<eq>=[^\S\r\n]*)?"
+)
+_blank = re.compile(r"\s*(?:#.*)?$", re.DOTALL)
+_single_quoted_value = re.compile(r"'((?:\\'|[^'])*)'")
+_double_quoted_value = re.compile(r'"((?:\\"|[^"])*)"')
+# the first quote which can end the value
+_single_quote_close = re.compile(r"(?<!\\)'")
+_double_quote_close = re.compile(r'(?<!\\)"')
+_unquoted_comment = re.compile(r"\s+#.*")
+_double_quote_escapes = re.compile(r"\\[\\'\"abfnrtv]")
+_single_quote_escapes = re.compile(r"\\[\\']")
+
+
+def _decode_escapes(m: Match[str]) -> str:
+    return codecs.decode(m.group(0), 'unicode-escape')  # type: ignore
+
+
+def parse_env(lines: Iterable[str]) -> Iterator[Tuple[str, Optional[str]]]:
+    """
+    Parse .env lines, quoted values may continue on the next lines.
+    A broken line is skipped with a warning, the next lines are parsed
+    """
+    it = iter(lines)
+    pending: List[str] = []  # lines to parse again, reversed
+
+    def next_line() -> Optional[str]:
+        if pending:
+            return pending.pop()
+        return next(it, None)
+
+    lineno = 0
+    while True:
+        line = next_line()
+        if line is None:
+            break
+        lineno += 1
+        if _blank.match(line):
+            continue
+
+        m = _key.match(line)
+        if not m:
+            warn(f"Could not parse .env line {lineno}: {line!r}", UserWarning)
+            continue
+        key = m.group('qkey') or m.group('key')
+        rest = line[m.end() :]  # noqa: E203
+
+        if not m.group('eq'):
+            if _blank.match(rest):
+                yield key, None
+            else:
+                warn(f"Could not parse .env line {lineno}", UserWarning)
+            continue
+
+        quote = rest[:1]
+        if quote not in ('"', "'"):
+            value = _unquoted_comment.sub('', rest.rstrip('\r\n')).rstrip()
+            yield key, value
+            continue
+
+        # find the closing quote line by line, then match once
+        start = lineno
+        close = _single_quote_close if quote == "'" else _double_quote_close
+        parts = [rest]
+        found = close.search(rest, 1)
+        while found is None:
+            nxt = next_line()
+            if nxt is None:
+                break
+            lineno += 1
+            parts.append(nxt)
+            found = close.search(nxt)
+
+        text = ''.join(parts)
+        pattern = (
+            _single_quoted_value if quote == "'" else _double_quoted_value
+        )
+        vm = pattern.match(text)
+        if vm is None:  # unterminated, only this line is broken
+            warn(f"Could not parse .env line {start}", UserWarning)
+            pending.extend(reversed(parts[1:]))
+            lineno = start
+            continue
+
+        # the rest of the closing line, the lines after a backtracked match
+        tail, _, after = text[vm.end() :].partition('\n')  # noqa: E203
+        if after:
+            again = after.splitlines(keepends=True)
+            pending.extend(reversed(again))
+            lineno -= len(again)
+        if not _blank.match(tail):
+            warn(f"Could not parse .env line {start}", UserWarning)
+            continue
+
+        if quote == "'":
+            yield key, _single_quote_escapes.sub(_decode_escapes, vm.group(1))
+        else:
+            yield key, _double_quote_escapes.sub(_decode_escapes, vm.group(1))
+
+
+def iter_lines(
+    path: Union[str, PathLike], encoding: str = 'utf-8', use_mmap: bool = False
+) -> Iterator[str]:
+    if not use_mmap:
+        with open(path, encoding=encoding) as f:
+            yield from f
+        return
+
+    with open(path, 'rb') as f:
+        if not Path(path).stat().st_size:  # empty file can't be mapped
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for line in iter(mm.readline, b''):
+                yield line.decode(encoding)
+
+
+def read_env(
+    path: Union[str, PathLike],
+    encoding: str = 'utf-8',
+    keys: Optional[Container[str]] = None,
+    case_sensitive: bool = True,
+    use_mmap: bool = False,
+) -> Dict[str, Optional[str]]:
+    """
+    :param keys: take only these keys, e.g. the settings env manifest
+    """
+    if isinstance(keys, (list, tuple)):
+        keys = frozenset(keys)  # a lookup per line
+    res: Dict[str, Optional[str]] = {}
+    for k, v in parse_env(iter_lines(path, encoding, use_mmap)):
+        if keys is None or (k if case_sensitive else k.lower()) in keys:
+            res[k] = v
+    return res
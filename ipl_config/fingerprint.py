@@ -0,0 +1,166 @@
+# pylint: disable=no-name-in-module
+
+import json
+import pickle  # nosec
+from hashlib import blake2b
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from pydantic.v1 import BaseModel
+from pydantic.v1.json import pydantic_encoder
+
+
+DIGEST_SIZE = 16
+
+Diff = Dict[str, Tuple[Any, Any]]
+
+
+class _Missing:  # pylint: disable=too-few-public-methods
+    def __repr__(self) -> str:
+        return 'MISSING'
+
+
+MISSING: Any = _Missing()
+
+
+def tree_digest(value: Any, memo: Optional[Dict[int, bytes]] = None) -> bytes:
+    """
+    Canonical hash of the validated tree, independent of the mapping order.
+    Digests of the `memoized` (deeply immutable) models are kept in their
+    `_digest` slot, other ones are hashed every time
+    :param memo: id -> digest of the containers, valid while the tree lives
+    """
+    if memo is None:
+        memo = {}
+    try:
+        return memo[id(value)]
+    except KeyError:
+        pass
+
+    if isinstance(value, BaseModel):
+        digest = memo[id(value)] = _model_digest(value, memo)
+        return digest
+
+    h = blake2b(digest_size=DIGEST_SIZE)
+    if isinstance(value, Mapping):
+        h.update(b'M')
+        for k in sorted(value, key=str):
+            h.update(_scalar_digest(k))
+            h.update(tree_digest(value[k], memo))
+    elif isinstance(value, (list, tuple)):
+        h.update(b'L')
+        for v in value:
+            h.update(tree_digest(v, memo))
+    elif isinstance(value, (set, frozenset)):
+        h.update(b'S')
+        for d in sorted(tree_digest(v, memo) for v in value):
+            h.update(d)
+    else:
+        return _scalar_digest(value)
+
+    digest = memo[id(value)] = h.digest()
+    return digest
+
+
+def _model_digest(model: BaseModel, memo: Dict[int, bytes]) -> bytes:
+    cached = getattr(model, '_memoized', False)
+    if cached:
+        digest = getattr(model, '_digest', None)
+        if digest is not None:
+            return digest  # type: ignore[no-any-return]
+
+    h = blake2b(digest_size=DIGEST_SIZE)
+    h.update(b'O')
+    for name in sorted(model.__fields__):
+        h.update(name.encode())
+        h.update(tree_digest(getattr(model, name), memo))
+    digest = h.digest()
+
+    if cached:
+        object.__setattr__(model, '_digest', digest)
+    return digest
+
+
+def _scalar_digest(value: Any) -> bytes:
+    """
+    :raise TypeError: the value is neither json serializable
+    nor reduced by its class, e.g. `object()`
+    """
+    h = blake2b(digest_size=DIGEST_SIZE)
+    h.update(type(value).__name__.encode())
+    try:
+        h.update(
+            json.dumps(
+                value, default=pydantic_encoder, separators=(',', ':')
+            ).encode()
+        )
+    except TypeError:
+        # the content of the types with own pickle support, e.g. `PackedSet`
+        clz = type(value)
+        if (clz.__reduce_ex__, clz.__reduce__) == (
+            object.__reduce_ex__,
+            object.__reduce__,
+        ):
+            raise
+        h.update(b'P')
+        try:
+            h.update(pickle.dumps(value, protocol=4))
+        except pickle.PicklingError as e:
+            raise TypeError(str(e)) from e
+    return h.digest()
+
+
+def fingerprint(value: Any) -> str:
+    return tree_digest(value).hex()
+
+
+def _children(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return {k: getattr(value, k) for k in value.__fields__}
+    if isinstance(value, Mapping):
+        return value
+    if isinstance(value, (list, tuple)):
+        return dict(enumerate(value))
+    return None
+
+
+def _same_kind(old: Any, new: Any) -> bool:
+    # a frozen `memoized` value is an instance of a mutable type subclass
+    return isinstance(new, type(old)) or isinstance(old, type(new))
+
+
+def tree_diff(
+    old: Any, new: Any, *path: str, memo: Optional[Dict[int, bytes]] = None
+) -> Diff:
+    """
+    :return: changed paths with (old, new) values,
+    `MISSING` marks an absent key, equal subtrees are skipped by digest
+    """
+    if memo is None:
+        memo = {}
+    if old is MISSING or new is MISSING:
+        return {'.'.join(path): (old, new)}
+    if tree_digest(old, memo) == tree_digest(new, memo):
+        return {}
+
+    old_children, new_children = _children(old), _children(new)
+    if old_children is None or new_children is None:
+        return {'.'.join(path): (old, new)}
+    resized = isinstance(old, (list, tuple)) and len(old) != len(new)
+    if resized or not _same_kind(old, new):
+        return {'.'.join(path): (old, new)}
+
+    res: Diff = {}
+    for k in (
+        *old_children,
+        *(k for k in new_children if k not in old_children),
+    ):
+        res.update(
+            tree_diff(
+                old_children.get(k, MISSING),
+                new_children.get(k, MISSING),
+                *path,
+                str(k),
+                memo=memo,
+            )
+        )
+    return res
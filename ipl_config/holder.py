@@ -0,0 +1,121 @@
+import asyncio
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import (
+    Any,
+    Callable,
+    Generator,
+    Generic,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from .settings import BaseSettings
+
+
+S = TypeVar('S', bound=BaseSettings)
+
+
+class Snapshot(NamedTuple):
+    version: int
+    settings: Any
+
+
+class SettingsHolder(Generic[S]):
+    """
+    Publishes settings through a single reference swap.
+    Readers never lock, writers are serialized and bump the version.
+    Published settings are shared between threads and must not be mutated.
+    """
+
+    __slots__ = '_snapshot', '_pinned', '_write_lock', '_waiters'
+
+    def __init__(self, settings: S) -> None:
+        self._snapshot: Snapshot = Snapshot(0, settings)
+        self._pinned: ContextVar[Optional[Snapshot]] = ContextVar(
+            f"settings_holder_{id(self)}", default=None
+        )
+        self._write_lock = threading.RLock()
+        self._waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]]
+        self._waiters = []
+
+    @property
+    def version(self) -> int:
+        return self.snapshot().version
+
+    @property
+    def settings(self) -> S:
+        return self.snapshot().settings  # type: ignore[no-any-return]
+
+    def snapshot(self) -> Snapshot:
+        """
+        :return: the pinned snapshot inside of `pin()` or the latest one
+        """
+        return self._pinned.get() or self._snapshot
+
+    def publish(self, settings: S) -> int:
+        """
+        Swap in the new settings
+        :return: new version
+        """
+        with self._write_lock:
+            version = self._snapshot.version + 1
+            snapshot = self._snapshot = Snapshot(version, settings)
+            waiters, self._waiters = self._waiters, []
+
+        for loop, fut in waiters:
+            try:
+                loop.call_soon_threadsafe(_set_result, fut, snapshot)
+            except RuntimeError:  # the loop is closed, nobody waits
+                pass
+        return version
+
+    def update(self, factory: Callable[[S], S]) -> int:
+        """
+        Build the new settings from the current ones and publish it,
+        e.g. `holder.update(lambda s: s.copy(update={'debug': True}))`
+        """
+        with self._write_lock:
+            return self.publish(factory(self._snapshot.settings))
+
+    async def reload(self, build: Callable[[], S]) -> int:
+        """
+        Build the new settings in the default executor and publish it
+        """
+        loop = asyncio.get_running_loop()
+        return self.publish(await loop.run_in_executor(None, build))
+
+    @contextmanager
+    def pin(self) -> Generator[S, None, None]:
+        """
+        Keep one settings version for the current context (e.g. request)
+        """
+        token = self._pinned.set(self.snapshot())
+        try:
+            yield self.settings
+        finally:
+            self._pinned.reset(token)
+
+    async def changed(self, version: Optional[int] = None) -> Snapshot:
+        """
+        Wait for a version newer than `version` (default: the current one)
+        """
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        with self._write_lock:
+            snapshot = self._snapshot
+            if version is None:
+                version = snapshot.version
+            if snapshot.version > version:
+                return snapshot
+            self._waiters.append((loop, fut))
+        return await fut  # type: ignore[no-any-return]
+
+
+def _set_result(fut: asyncio.Future, result: Any) -> None:
+    if not fut.done():
+        fut.set_result(result)
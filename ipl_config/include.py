@@ -0,0 +1,183 @@
+"""
+Config includes: yaml `!include path` tag and `include` key
+(a path or a list of paths) for any format, off unless
+`Config.config_include_key` is set.
+Included documents are merged in order, the including document overrides
+them, so they must be mappings. Paths are relative to the including file
+and may not leave the root, the directory of the top level config
+or `Config.config_include_root` relative to it.
+With a `Guard` every include counts as the expanded subtree and
+the included depth adds to the depth of the include point.
+"""
+
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from pydantic.v1.utils import deep_update
+
+from .dumploads import Include
+from .limits import Guard
+
+
+class IncludeError(ValueError):
+    pass
+
+
+class IncludeResolver:
+    """
+    Loads the include DAG, every file is parsed once per resolver
+    """
+
+    __slots__ = (
+        'parse',
+        'include_key',
+        'guard',
+        'root',
+        'docs',
+        'sizes',
+        'graph',
+        '_stack',
+        '_depth',
+    )
+
+    def __init__(
+        self,
+        parse: Callable[[Path], Any],
+        include_key: Optional[str] = 'include',
+        guard: Optional[Guard] = None,
+        root: Optional[Path] = None,
+    ) -> None:
+        """
+        :param guard: the budget of the load, `parse` must count into it
+        :param root: the included files are under it, the directory
+        of the first loaded file by default
+        """
+        self.parse: Callable[[Path], Any] = parse
+        self.include_key: Optional[str] = include_key
+        self.guard: Optional[Guard] = guard
+        self.root: Optional[Path] = root
+        self.docs: Dict[Path, Any] = {}
+        # file -> nodes and depth of the resolved document
+        self.sizes: Dict[Path, Tuple[int, int]] = {}
+        # file -> directly included files
+        self.graph: Dict[Path, Tuple[Path, ...]] = {}
+        self._stack: List[Path] = []
+        self._depth: int = 0  # of the document being resolved
+
+    def load(self, path: Path) -> Any:
+        path = path.expanduser().resolve()
+        if self.root is None:
+            self.root = path.parent
+        if path in self._stack:
+            cycle = self._stack[self._stack.index(path) :]  # noqa: E203
+            raise IncludeError(
+                'Include cycle: ' + ' -> '.join(map(str, (*cycle, path)))
+            )
+        try:
+            return self.docs[path]
+        except KeyError:
+            pass
+
+        self._stack.append(path)
+        nodes = self.guard.nodes if self.guard is not None else 0
+        depth, self._depth = self._depth, 0
+        try:
+            deps: List[Path] = []
+            doc = self._resolve(self.parse(path), path.parent, deps, 0)
+            if self.guard is not None:
+                self.sizes[path] = self.guard.nodes - nodes, self._depth
+        finally:
+            self._stack.pop()
+            self._depth = depth
+
+        self.graph[path] = tuple(dict.fromkeys(deps))
+        self.docs[path] = doc
+        return doc
+
+    def resolve(self, doc: Any, base: Path) -> Any:
+        """
+        Resolve includes of a document without a file (stdin, bytes),
+        paths are relative to `base`
+        """
+        base = base.expanduser().resolve()
+        if self.root is None:
+            self.root = base
+        return self._resolve(doc, base, [], 0)
+
+    def _include(
+        self, base: Path, name: Any, deps: List[Path], depth: int
+    ) -> Any:
+        """
+        :param depth: of the container the included document goes to
+        """
+        if not isinstance(name, str):
+            raise IncludeError(f"Include path must be a string, got {name!r}")
+        if Path(name).expanduser().is_absolute():
+            raise IncludeError(f"Include path must be relative: {name!r}")
+        path = (base / name).resolve()
+        root = self.root or base
+        if root != path and root not in path.parents:
+            raise IncludeError(f"Include path {name!r} is outside of {root}")
+        deps.append(path)
+        loaded = path in self.docs
+        doc = self.load(path)
+        if self.guard is not None:
+            nodes, doc_depth = self.sizes[path]
+            if loaded:  # one more copy in the resolved tree
+                self.guard.node(nodes)
+            self._depth = max(self._depth, depth + doc_depth)
+            self.guard.check_depth(self._depth)
+        return doc
+
+    def _resolve(
+        self, node: Any, base: Path, deps: List[Path], depth: int
+    ) -> Any:
+        if isinstance(node, Include):
+            return self._include(base, node, deps, depth)
+
+        if isinstance(node, dict):
+            depth += 1
+            self._depth = max(self._depth, depth)
+            node = {
+                k: self._resolve(v, base, deps, depth) for k, v in node.items()
+            }
+            if self.include_key and self.include_key in node:
+                names = node.pop(self.include_key)
+                if isinstance(names, str):
+                    names = [names]
+                if not isinstance(names, list):
+                    raise IncludeError(
+                        f"{self.include_key!r} must be a path or a list"
+                    )
+                included = []
+                for name in names:
+                    # merged into this mapping
+                    doc = self._include(base, name, deps, depth - 1)
+                    if not isinstance(doc, dict):
+                        raise IncludeError(
+                            f"Included {name!r} is not a mapping"
+                        )
+                    included.append(doc)
+                node = deep_update(*included, node) if included else node
+            return node
+
+        if isinstance(node, list):
+            depth += 1
+            self._depth = max(self._depth, depth)
+            return [self._resolve(v, base, deps, depth) for v in node]
+
+        return node
+
+    def affected(self, *changed: Path) -> Set[Path]:
+        """
+        :return: the changed files and all files including them
+        """
+        res = {p.expanduser().resolve() for p in changed}
+        pending = list(res)
+        while pending:
+            p = pending.pop()
+            for parent, deps in self.graph.items():
+                if p in deps and parent not in res:
+                    res.add(parent)
+                    pending.append(parent)
+        return res
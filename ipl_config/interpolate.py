@@ -0,0 +1,210 @@
+"""
+`${VAR}`, `${VAR:-default}` and `${path.to.key}` interpolation
+of the loaded config string values, `$${` is a literal `${`.
+
+A name with a dot is a config path (list items by index, a not string key
+by its str, e.g. yaml `80: x` is `${ports.80}`),
+otherwise it is an env variable, unset one without a default is an error.
+A value which is a single path reference keeps the referenced value type.
+A document without `${` is returned as is after a scan.
+"""
+
+import os
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Tuple, Union
+
+from .limits import Guard
+
+
+_ref = re.compile(r'\$\$\{|\$\{([^}:]+)(?::-([^}]*))?\}')
+
+
+class InterpolationError(ValueError):
+    pass
+
+
+class Ref(NamedTuple):
+    name: str
+    default: Optional[str]
+
+    @property
+    def is_path(self) -> bool:
+        return '.' in self.name
+
+
+Template = Tuple[Union[str, Ref], ...]
+
+
+@lru_cache(maxsize=4096)
+def compile_template(s: str) -> Template:
+    parts: List[Union[str, Ref]] = []
+    pos = 0
+    for m in _ref.finditer(s):
+        if m.start() > pos:
+            parts.append(s[pos : m.start()])  # noqa: E203
+        if m.group(1) is None:
+            parts.append('${')
+        else:
+            parts.append(Ref(m.group(1).strip(), m.group(2)))
+        pos = m.end()
+    if pos < len(s):
+        parts.append(s[pos:])
+    return tuple(parts)
+
+
+class Interpolator:
+    __slots__ = 'doc', 'env', 'guard', 'env_refs', '_memo', '_stack'
+
+    def __init__(
+        self,
+        doc: Any,
+        env: Optional[Mapping[str, str]] = None,
+        guard: Optional[Guard] = None,
+        env_refs: Optional[Dict[str, Optional[str]]] = None,
+    ) -> None:
+        """
+        :param guard: counts the walked nodes into the budget of the load
+        :param env_refs: collects the env variables read and their values
+        """
+        self.doc: Any = doc
+        self.env: Mapping[str, str] = os.environ if env is None else env
+        self.guard: Optional[Guard] = guard
+        self.env_refs: Optional[Dict[str, Optional[str]]] = env_refs
+        # config path (the document keys) -> evaluated value
+        self._memo: Dict[Tuple[Any, ...], Any] = {}
+        self._stack: List[Tuple[Any, ...]] = []
+
+    def __call__(self) -> Any:
+        return self._walk(self.doc, ())
+
+    def _walk(self, node: Any, path: Tuple[Any, ...]) -> Any:
+        if self.guard is not None:
+            self.guard.node()
+        if isinstance(node, str):
+            return self._eval(path) if '$' in node else node
+        if isinstance(node, dict):
+            return {k: self._walk(v, path + (k,)) for k, v in node.items()}
+        if isinstance(node, list):
+            return [self._walk(v, path + (i,)) for i, v in enumerate(node)]
+        return node
+
+    @staticmethod
+    def _key(node: Any, name: Any) -> Any:
+        """
+        :return: the document key of the `${a.b}` name, e.g. yaml `1: x`
+        is `${a.1}`, an equal key is preferred
+        """
+        if isinstance(node, list):
+            return int(name)
+        if isinstance(node, dict) and isinstance(name, str):
+            if name not in node:
+                for k in node:
+                    if str(k) == name:
+                        return k
+        return name
+
+    def _get(self, path: Tuple[Any, ...]) -> Tuple[Any, Tuple[Any, ...]]:
+        """
+        :param path: the document keys or the names of a reference
+        :return: the value and its path of the document keys
+        """
+        node = self.doc
+        keys: List[Any] = []
+        for k in path:
+            if isinstance(node, str) and '$' in node:  # reference to subtree
+                node = self._eval(tuple(keys))
+            try:
+                key = self._key(node, k)
+                node = node[key]
+            except (KeyError, IndexError, ValueError, TypeError):
+                raise InterpolationError(
+                    f"No such config key: {_dotted(path)}"
+                ) from None
+            keys.append(key)
+        return node, tuple(keys)
+
+    def _eval(self, path: Tuple[Any, ...]) -> Any:
+        """
+        Evaluate the path value, references first (depth first),
+        every path value is evaluated once
+        """
+        try:
+            return self._memo[path]
+        except KeyError:
+            pass
+        value, path = self._get(path)
+        try:
+            return self._memo[path]
+        except KeyError:
+            pass
+        if path in self._stack:
+            cycle = self._stack[self._stack.index(path) :]  # noqa: E203
+            cycle_str = ' -> '.join(map(_dotted, (*cycle, path)))
+            raise InterpolationError(f"Interpolation cycle: {cycle_str}")
+
+        self._stack.append(path)
+        try:
+            if isinstance(value, str):
+                if '$' in value:
+                    value = self._render(compile_template(value))
+            else:
+                value = self._walk(value, path)
+        finally:
+            self._stack.pop()
+
+        self._memo[path] = value
+        return value
+
+    def _resolve(self, ref: Ref) -> Any:
+        if ref.is_path:
+            value = self._eval(tuple(ref.name.split('.')))
+        else:
+            value = self.env.get(ref.name)
+            if self.env_refs is not None:
+                self.env_refs[ref.name] = value
+            if value is None and ref.default is None:
+                raise InterpolationError(f"Env variable {ref.name} is not set")
+        if ref.default is not None and value in (None, ''):
+            return ref.default
+        return '' if value is None else value
+
+    def _render(self, template: Template) -> Any:
+        if len(template) == 1 and isinstance(template[0], Ref):
+            return self._resolve(template[0])
+        return ''.join(
+            p if isinstance(p, str) else str(self._resolve(p))
+            for p in template
+        )
+
+
+def _dotted(path: Tuple[Any, ...]) -> str:
+    return '.'.join(map(str, path))
+
+
+def has_refs(doc: Any) -> bool:
+    """
+    :return: True if any string value of the document has `${`
+    """
+    stack = [doc]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, str):
+            if '${' in node:
+                return True
+        elif isinstance(node, dict):
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+    return False
+
+
+def interpolate(
+    doc: Any,
+    env: Optional[Mapping[str, str]] = None,
+    guard: Optional[Guard] = None,
+    env_refs: Optional[Dict[str, Optional[str]]] = None,
+) -> Any:
+    if not has_refs(doc):
+        return doc
+    return Interpolator(doc, env, guard, env_refs)()
@@ -0,0 +1,231 @@
+"""
+Resource limits of the config loaders for untrusted input.
+
+The input size is checked before parsing, json and toml brackets are
+counted by a scan before the parser sees them, yaml nodes and aliases
+are counted while composing, the parse time is checked along the way.
+One `Guard` is the budget of a whole load: the included files, every
+include as its expanded subtree, and the interpolation.
+"""
+
+import mmap
+import re
+import time
+from contextvars import ContextVar
+from typing import (  # noqa: I101
+    IO,
+    Any,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Pattern,
+    Tuple,
+    Union,
+)
+
+
+class LimitError(ValueError):
+    pass
+
+
+class Limits(NamedTuple):
+    max_bytes: Optional[int] = None
+    max_depth: Optional[int] = None
+    max_nodes: Optional[int] = None
+    max_aliases: Optional[int] = None
+    max_seconds: Optional[float] = None
+
+    @classmethod
+    def from_config(cls, config: Any) -> Optional['Limits']:
+        """
+        :return: `config_max_*` options of the settings config, None if unset
+        """
+        limits = cls(
+            *(getattr(config, 'config_' + name, None) for name in cls._fields)
+        )
+        return limits if any(v is not None for v in limits) else None
+
+
+# limits of the settings being validated, for the values read by validators
+current_limits: ContextVar[Optional[Limits]] = ContextVar(
+    'ipl_config_limits', default=None
+)
+
+
+Tokens = Tuple[Pattern[str], Pattern[bytes]]
+
+
+def compile_tokens(pattern: str) -> Tokens:
+    """
+    :param pattern: strings and comments to skip or one of `[]{},`
+    """
+    return re.compile(pattern), re.compile(pattern.encode())
+
+
+JSON_TOKENS = compile_tokens(r'"(?:[^"\\]|\\.)*"|[\[\]{},]')
+TOML_TOKENS = compile_tokens(
+    r"'''[\s\S]*?'''|\"\"\"(?:[^\\]|\\[\s\S])*?\"\"\""
+    r"|\"(?:[^\"\\\n]|\\.)*\"|'[^'\n]*'|#[^\n]*|[\[\]{},]"
+)
+
+_OPEN = {'[', '{', ord('['), ord('{')}
+_CLOSE = {']', '}', ord(']'), ord('}')}
+_COMMA = {',', ord(',')}
+CHECK_TIME_EVERY = 1024
+
+
+class Guard:
+    """
+    Counters of one load, shared by its documents
+    """
+
+    __slots__ = (
+        'limits',
+        'size',
+        'depth',
+        'nodes',
+        'aliases',
+        'deadline',
+        '_ticks',
+    )
+
+    def __init__(self, limits: Limits) -> None:
+        self.limits: Limits = limits
+        self.size: int = 0
+        self.depth: int = 0
+        self.nodes: int = 0
+        self.aliases: int = 0
+        self.deadline: Optional[float] = (
+            None
+            if limits.max_seconds is None
+            else time.monotonic() + limits.max_seconds
+        )
+        self._ticks: int = 0
+
+    @classmethod
+    def of(cls, limits: Union[Limits, 'Guard']) -> 'Guard':
+        """
+        :return: the shared guard as is, a new one for the limits
+        """
+        return limits if isinstance(limits, Guard) else cls(limits)
+
+    def read(self, s: Any) -> Union[str, bytes, memoryview, mmap.mmap]:
+        """
+        :return: bytes like input as is, stream content up to the limit
+        """
+        max_bytes = self.limits.max_bytes
+        if isinstance(s, (bytes, bytearray, memoryview, mmap.mmap)):
+            self.add_size(len(s))
+            return s  # type: ignore[return-value]
+        stream: IO[Any] = s
+        data = (
+            stream.read()
+            if max_bytes is None
+            else stream.read(max(max_bytes - self.size, 0) + 1)
+        )
+        if isinstance(data, str) and max_bytes is not None:
+            self.add_size(len(data.encode('utf-8', 'surrogateescape')))
+        else:
+            self.add_size(len(data))
+        return data  # type: ignore[no-any-return]
+
+    def check_size(self, size: int) -> None:
+        """
+        :param size: bytes to read in addition to the read ones
+        """
+        max_bytes = self.limits.max_bytes
+        if max_bytes is not None and self.size + size > max_bytes:
+            raise LimitError(f"Config is larger than {max_bytes} bytes")
+
+    def add_size(self, size: int) -> None:
+        self.check_size(size)
+        self.size += size
+
+    def check_time(self) -> None:
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise LimitError(
+                f"Config parse took more than {self.limits.max_seconds}s"
+            )
+
+    def check_depth(self, depth: int) -> None:
+        max_depth = self.limits.max_depth
+        if max_depth is not None and depth > max_depth:
+            raise LimitError(f"Config nesting is deeper than {max_depth}")
+
+    def enter(self) -> None:
+        self.depth += 1
+        self.check_depth(self.depth)
+        self.node()
+
+    def exit(self) -> None:
+        self.depth -= 1
+
+    def node(self, count: int = 1) -> None:
+        self.nodes += count
+        max_nodes = self.limits.max_nodes
+        if max_nodes is not None and self.nodes > max_nodes:
+            raise LimitError(f"Config has more than {max_nodes} nodes")
+        self.tick(count)
+
+    def tick(self, count: int = 1) -> None:
+        """
+        Check the time every `CHECK_TIME_EVERY` steps
+        """
+        self._ticks += count
+        if self._ticks >= CHECK_TIME_EVERY:
+            self._ticks = 0
+            self.check_time()
+
+    def pairs_hook(self, pairs: List[Tuple[str, Any]]) -> Dict[str, Any]:
+        """
+        json `object_pairs_hook`, checks the time during the parse
+        """
+        self.tick(len(pairs) + 1)
+        return dict(pairs)
+
+    def alias(self, size: int) -> None:
+        """
+        :param size: nodes of the aliased subtree, counted as expanded
+        """
+        self.aliases += 1
+        max_aliases = self.limits.max_aliases
+        if max_aliases is not None and self.aliases > max_aliases:
+            raise LimitError(f"Config has more than {max_aliases} aliases")
+        self.node(size)
+
+    def scan(self, data: Any, tokens: Tokens) -> None:
+        """
+        Count brackets and commas outside of strings and comments
+        before parsing, values of the containers are nodes
+        """
+        if self.limits.max_depth is None and self.limits.max_nodes is None:
+            return
+        pattern: Any = tokens[0] if isinstance(data, str) else tokens[1]
+        depth = self.depth
+        for m in pattern.finditer(data):
+            token = data[m.start()]
+            if token in _OPEN:
+                self.enter()
+            elif token in _CLOSE:
+                self.exit()
+            elif token in _COMMA:
+                self.node()
+        self.depth = depth
+
+    def walk(self, doc: Any) -> None:
+        """
+        Count depth and nodes of the parsed document,
+        for the parsers without hooks and the cached documents
+        """
+        stack = [(doc, 0)]
+        while stack:
+            node, depth = stack.pop()
+            self.node()
+            if isinstance(node, dict):
+                self.check_depth(depth + 1)
+                stack.extend((v, depth + 1) for v in node.values())
+            elif isinstance(node, list):
+                self.check_depth(depth + 1)
+                stack.extend((v, depth + 1) for v in node)
+        self.check_time()
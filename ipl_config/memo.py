@@ -0,0 +1,218 @@
+"""
+Keys of `BaseSettings.memoized`: the arguments digest, the env snapshot
+and the stat of every file the settings were read from,
+and the deep freeze of the shared instances.
+"""
+
+import os
+import weakref
+from hashlib import blake2b
+from os import PathLike
+from pathlib import Path
+from typing import Any, Collection, NoReturn, Optional, Tuple, Type, Union
+
+from pydantic.v1 import BaseModel  # pylint: disable=no-name-in-module
+
+from .dumploads import is_bytes_like
+from .fingerprint import DIGEST_SIZE, tree_digest
+
+
+FileStat = Optional[Tuple[int, int, int]]
+
+# model class -> its frozen subclass
+_frozen: 'weakref.WeakKeyDictionary[type, type]' = weakref.WeakKeyDictionary()
+
+
+def env_snapshot(
+    names: Collection[str], case_sensitive: bool = False
+) -> Tuple[Tuple[str, Optional[str]], ...]:
+    """
+    :param names: env names the settings read, see `env_manifest`
+    :return: the env items of these names
+    """
+    if case_sensitive:
+        return tuple((name, os.environ.get(name)) for name in names)
+    lower = frozenset(names)
+    return tuple((k, v) for k, v in os.environ.items() if k.lower() in lower)
+
+
+def file_stat(path: Union[str, PathLike]) -> FileStat:
+    """
+    :return: mtime, size and inode, None for a missing file
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+def _arg(value: Any) -> Any:
+    if is_bytes_like(value):
+        return blake2b(value, digest_size=DIGEST_SIZE).hexdigest()
+    if isinstance(value, PathLike):
+        return str(Path(value).expanduser().resolve())
+    return value
+
+
+def args_digest(*args: Any, **kw: Any) -> bytes:
+    """
+    Digest of the arguments, bytes like ones by the content
+    :raise TypeError: not json serializable argument
+    """
+    return tree_digest(
+        [[_arg(a) for a in args], {k: _arg(v) for k, v in kw.items()}]
+    )
+
+
+def _immutable(self: Any, *args: Any, **kw: Any) -> NoReturn:
+    raise TypeError(
+        f'"{type(self).__name__}" is memoized and immutable, use `copy()`'
+    )
+
+
+class FrozenList(list):  # type: ignore[type-arg]
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _immutable
+    append = extend = insert = pop = remove = clear = _immutable
+    sort = reverse = _immutable  # type: ignore[assignment]
+
+    def __reduce__(self) -> Any:
+        return FrozenList, (list(self),)
+
+
+class FrozenDict(dict):  # type: ignore[type-arg]
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    pop = popitem = setdefault = update = clear = _immutable
+
+    def __reduce__(self) -> Any:
+        return FrozenDict, (dict(self),)
+
+
+class FrozenSet(frozenset):  # type: ignore[type-arg]
+    """
+    Frozen `set`, thawed back to a `set`
+    """
+
+    __slots__ = ()
+
+
+class FrozenModel:
+    """
+    Base of the frozen copies of the nested models
+    """
+
+    __slots__ = ()
+
+    __setattr__ = __delattr__ = _immutable
+
+    @classmethod
+    def _get_value(cls, v: Any, *args: Any, **kw: Any) -> Any:
+        # dumps are plain mutable containers
+        return dumpable(super()._get_value(v, *args, **kw))  # type: ignore
+
+    def __reduce__(self) -> Any:
+        # pickled and copied as the mutable model
+        return _thawed, (thaw(self),)
+
+
+def _thawed(model: BaseModel) -> BaseModel:
+    return model
+
+
+def _frozen_class(clz: Type[BaseModel]) -> type:
+    frozen = _frozen.get(clz)
+    if frozen is None:
+        frozen = _frozen[clz] = type(
+            clz.__name__,
+            (FrozenModel, clz),
+            {
+                '__module__': clz.__module__,
+                '__qualname__': clz.__qualname__,
+                # see `fingerprint.tree_digest`
+                '__slots__': ('_memoized', '_digest'),
+            },
+        )
+    return frozen
+
+
+def _rebuild(model: BaseModel, clz: Type[Any], values: Any) -> Any:
+    obj = object.__new__(clz)
+    object.__setattr__(obj, '__dict__', values)
+    object.__setattr__(obj, '__fields_set__', set(model.__fields_set__))
+    for name in model.__private_attributes__:
+        try:
+            object.__setattr__(obj, name, getattr(model, name))
+        except AttributeError:
+            pass
+    return obj
+
+
+def freeze_values(model: BaseModel) -> Any:
+    """
+    :return: the field values of the model, frozen
+    """
+    return {k: freeze(v) for k, v in model.__dict__.items()}
+
+
+def freeze(value: Any) -> Any:
+    """
+    Immutable copy of a validated value: the nested models are frozen
+    subclass instances, lists, dicts and sets are the frozen ones
+    """
+    if isinstance(value, FrozenModel):
+        return value
+    if isinstance(value, BaseModel):
+        obj = _rebuild(value, _frozen_class(type(value)), freeze_values(value))
+        object.__setattr__(obj, '_memoized', True)
+        return obj
+    if isinstance(value, list):
+        return FrozenList(map(freeze, value))
+    if isinstance(value, dict):
+        return FrozenDict((k, freeze(v)) for k, v in value.items())
+    if isinstance(value, set):
+        return FrozenSet(map(freeze, value))
+    if type(value) is tuple:  # pylint: disable=unidiomatic-typecheck
+        return tuple(map(freeze, value))
+    return value
+
+
+def thaw_values(model: BaseModel) -> Any:
+    return {k: thaw(v) for k, v in model.__dict__.items()}
+
+
+def thaw(value: Any) -> Any:
+    """
+    Mutable copy of the `freeze` result
+    """
+    if isinstance(value, FrozenModel):
+        return _rebuild(
+            value,  # type: ignore[arg-type]
+            type(value).__bases__[1],
+            thaw_values(value),  # type: ignore[arg-type]
+        )
+    if isinstance(value, FrozenList):
+        return list(map(thaw, value))
+    if isinstance(value, FrozenDict):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, FrozenSet):
+        return set(map(thaw, value))
+    if type(value) is tuple:  # pylint: disable=unidiomatic-typecheck
+        return tuple(map(thaw, value))
+    return value
+
+
+def dumpable(value: Any) -> Any:
+    """
+    The dumped container of a frozen one is a plain one
+    """
+    if isinstance(value, FrozenList):
+        return list(value)
+    if isinstance(value, FrozenSet):
+        return set(value)
+    if isinstance(value, FrozenDict):
+        return dict(value)
+    return value
@@ -0,0 +1,166 @@
+"""
+Startup cost of the settings classes by source strategy, field,
+file parse, merge and validation
+
+    with profile() as p:
+        IplConfig()
+    print(p.report())
+    p.write_collapsed('settings.folded')  # flamegraph.pl settings.folded
+
+Spans are recorded only inside of `profile()` of the current context,
+otherwise `span()` is a context variable lookup.
+"""
+
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Any, ContextManager, Dict, Generator, List, Optional, Tuple
+
+from .dumploads import StrPathIO, ensure_stream
+
+
+Path_ = Tuple[str, ...]
+
+_active: ContextVar[Optional['Profiler']] = ContextVar(
+    'ipl_config_profiler', default=None
+)
+_null: ContextManager[None] = nullcontext()
+
+
+class Stat:
+    __slots__ = 'calls', 'total_ns', 'child_ns', 'alloc', 'child_alloc'
+
+    def __init__(self) -> None:
+        self.calls: int = 0
+        self.total_ns: int = 0
+        self.child_ns: int = 0
+        self.alloc: int = 0  # net traced bytes
+        self.child_alloc: int = 0
+
+    @property
+    def self_ns(self) -> int:
+        return self.total_ns - self.child_ns
+
+    @property
+    def self_alloc(self) -> int:
+        return self.alloc - self.child_alloc
+
+
+class _Span:
+    __slots__ = 'profiler', 'name', 'path', 'start_ns', 'start_mem'
+
+    def __init__(self, profiler: 'Profiler', name: str) -> None:
+        self.profiler: Profiler = profiler
+        self.name: str = name
+
+    def __enter__(self) -> None:
+        stack = self.profiler.stack
+        self.path: Path_ = (stack[-1].path if stack else ()) + (self.name,)
+        stack.append(self)
+        self.start_mem: int = self.profiler.traced_memory()
+        self.start_ns: int = time.perf_counter_ns()
+
+    def __exit__(self, *_: Any) -> None:
+        elapsed = time.perf_counter_ns() - self.start_ns
+        profiler = self.profiler
+        alloc = profiler.traced_memory() - self.start_mem
+        stack = profiler.stack
+        stack.pop()
+
+        stat = profiler.stats.get(self.path)
+        if stat is None:
+            stat = profiler.stats[self.path] = Stat()
+        stat.calls += 1
+        stat.total_ns += elapsed
+        stat.alloc += alloc
+        if stack:
+            parent = profiler.stats.get(stack[-1].path)
+            if parent is None:
+                parent = profiler.stats[stack[-1].path] = Stat()
+            parent.child_ns += elapsed
+            parent.child_alloc += alloc
+
+
+def span(kind: str, name: Optional[str] = None) -> ContextManager[None]:
+    """
+    :return: a profiled span `kind:name` or a no-op outside of `profile()`
+    """
+    profiler = _active.get()
+    if profiler is None:
+        return _null
+    return _Span(profiler, kind if name is None else f"{kind}:{name}")
+
+
+class Profiler:
+    __slots__ = 'stats', 'stack', 'allocations'
+
+    def __init__(self, allocations: bool = False) -> None:
+        self.stats: Dict[Path_, Stat] = {}
+        self.stack: List[_Span] = []
+        self.allocations: bool = allocations
+
+    def traced_memory(self) -> int:
+        return tracemalloc.get_traced_memory()[0] if self.allocations else 0
+
+    def sorted(self) -> List[Tuple[Path_, Stat]]:
+        """
+        :return: spans by the total time, the slowest first
+        """
+        return sorted(self.stats.items(), key=lambda x: (-x[1].total_ns, x[0]))
+
+    def report(self, limit: Optional[int] = None) -> str:
+        header = f"{'total ms':>10} {'self ms':>10} {'calls':>7}"
+        if self.allocations:
+            header += f" {'net KiB':>9}"
+        lines = [header + '  span']
+        for path, stat in self.sorted()[:limit]:
+            line = (
+                f"{stat.total_ns / 1e6:10.3f} {stat.self_ns / 1e6:10.3f}"
+                f" {stat.calls:7d}"
+            )
+            if self.allocations:
+                line += f" {stat.alloc / 1024:9.1f}"
+            lines.append(line + '  ' + ' > '.join(path))
+        return '\n'.join(lines)
+
+    def collapsed(self, allocations: bool = False) -> str:
+        """
+        :return: flamegraph collapsed stacks, self microseconds
+        or self net allocated bytes per stack
+        """
+        lines = []
+        for path, stat in sorted(self.stats.items()):
+            value = stat.self_alloc if allocations else stat.self_ns // 1000
+            if value > 0:
+                # `;` separates the frames
+                frames = (name.replace(';', ',') for name in path)
+                lines.append(f"{';'.join(frames)} {value}")
+        return '\n'.join(lines) + '\n' if lines else ''
+
+    def write_collapsed(
+        self, f: StrPathIO = sys.stdout, allocations: bool = False
+    ) -> None:
+        text = self.collapsed(allocations)
+        with ensure_stream(f, write=True) as s:
+            s.write(text)  # type: ignore[arg-type]
+
+
+@contextmanager
+def profile(allocations: bool = False) -> Generator[Profiler, None, None]:
+    """
+    Profile the settings loaded in the block
+    :param allocations: trace the net allocations with `tracemalloc`
+    """
+    profiler = Profiler(allocations)
+    started = allocations and not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    token = _active.set(profiler)
+    try:
+        yield profiler
+    finally:
+        _active.reset(token)
+        if started:
+            tracemalloc.stop()
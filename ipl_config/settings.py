@@ -1,6 +1,9 @@
 # pylint: disable=no-name-in-module
 
+import os
 import sys
+import threading
+import weakref
 from collections import OrderedDict
 from decimal import Decimal
 from os import PathLike
@@ -8,51 +11,158 @@ from pathlib import Path
 from typing import (
     AbstractSet,
     Any,
+    Callable,
     ClassVar,
     Dict,
     Generator,
+    List,
     Mapping,
     Optional,
     Sequence,
     Tuple,
     Type,
+    TypeVar,
     Union,
 )
 
-from pydantic import BaseConfig, BaseModel
-from pydantic.config import Extra
-from pydantic.utils import deep_update
+from pydantic.v1 import BaseConfig, BaseModel, ValidationError
+from pydantic.v1.config import Extra
+from pydantic.v1.error_wrappers import ErrorWrapper
+from pydantic.v1.errors import MissingError
+from pydantic.v1.fields import SHAPE_SINGLETON, ModelField  # noqa: I101
+from pydantic.v1.utils import deep_update, lenient_issubclass
 
-from .dumploads import StrPathIO, json_dump, toml_dump, yaml_dump
+from . import shm
+from .dumploads import (
+    BytesLike,
+    StrPathIO,
+    ensure_stream,
+    is_bytes_like,
+    json_dump,
+    json_dumps,
+    toml_dump,
+    yaml_dump,
+)
+from .fingerprint import Diff, fingerprint, tree_diff
+from .limits import Limits, current_limits
+from .memo import (
+    args_digest,
+    dumpable,
+    env_snapshot,
+    file_stat,
+    freeze_values,
+    thaw_values,
+)
+from .profiler import span
 from .source import (
     DotEnvSettingsStrategy,
     EnvSettingsStrategy,
-    Hcl2SettingsStrategy,
-    JsonSettingsStrategy,
+    FileSettingsStrategy,
     KwSettingsStrategy,
     SettingsStrategy,
-    TomlSettingsStrategy,
-    YamlSettingsStrategy,
+    get_env_manifest,
+    get_file_strategy,
 )
+from .types import PackedSet
+from .utils import SectionTree, make_section_tree, project
 
 
 IntStr = Union[int, str]
 AbstractSetIntStr = AbstractSet[IntStr]
 MappingIntStrAny = Mapping[IntStr, Any]
 TupleGenerator = Generator[Tuple[str, Any], None, None]
+SettingsT = TypeVar('SettingsT', bound='BaseSettings')
+
+# class -> {cache key: value}, dropped together with the class
+_class_cache: 'weakref.WeakKeyDictionary[type, Dict[Any, Any]]' = (
+    weakref.WeakKeyDictionary()
+)
+# guards the `memoized` memos, the instances are built outside
+_memo_lock = threading.Lock()
+
+
+def flatten_env(ns: Dict[str, Any], *path: str) -> Dict[str, str]:
+    """
+    :return: env variables of the dumped settings, nested names joined by `_`
+    """
+    res = OrderedDict()
+
+    for name, model in ns.items():
+        _path = path + (name,)
+        env_name = '_'.join(_.upper() for _ in _path)
+
+        if not isinstance(model, dict):
+            # for mypy
+            env_val: Union[bool, bytes, str, int, float, complex, Decimal]
+            if model is None:
+                env_val = ''
+            elif isinstance(model, bool):
+                env_val = int(model)
+            elif isinstance(model, bytes):
+                env_val = model.decode(
+                    encoding='utf-8', errors='surrogateescape'
+                )
+            elif isinstance(model, (str, int, float, complex, Decimal)):
+                env_val = model
+            elif isinstance(model, PackedSet):
+                env_val = ','.join(map(str, model.to_list()))
+            else:
+                raise NotImplementedError(
+                    f"Not a scalar: {env_name}={type(model)}"
+                )
+
+            res[env_name] = str(env_val)
+        else:
+            for k, v in flatten_env(model, *_path).items():
+                res[k] = v
+
+    return res
+
+
+def class_cached(clz: type, key: Any, factory: Callable[[], Any]) -> Any:
+    """
+    Memoize the `factory` result per class,
+    unhashable key means no caching
+    """
+    try:
+        cache = _class_cache[clz]
+    except KeyError:
+        cache = _class_cache.setdefault(clz, {})
+    try:
+        return cache[key]
+    except KeyError:
+        res = cache[key] = factory()
+        return res
+    except TypeError:
+        return factory()
 
 
 class BaseSettings(BaseModel):
-    __slots__ = ()
+    __slots__ = ('_memoized', '_digest')
 
     class Config(BaseConfig):  # pylint: disable=too-few-public-methods
         env_prefix: Optional[str] = 'APP'
         env_file: Union[str, PathLike, None] = '.env'
         env_file_encoding: Optional[str] = None
+        env_file_parser: Optional[str] = None  # or `dotenv`
+        config_cache_dir: Union[str, PathLike, None] = None
+        config_cache_size: int = 64 * 2**20
+        config_include_key: Optional[str] = None  # `include` to enable
+        # includes stay under it, relative to the config dir, `..` e.g.
+        config_include_root: Union[str, PathLike, None] = None
+        config_interpolate: bool = False
+        # loader limits for untrusted configs, None is unlimited
+        config_max_bytes: Optional[int] = None
+        config_max_depth: Optional[int] = None
+        config_max_nodes: Optional[int] = None
+        config_max_aliases: Optional[int] = None
+        config_max_seconds: Optional[float] = None
+        memo_size: int = 128  # instances per class, see `memoized`
         case_sensitive: bool = False
         validate_all: bool = True
         extra: Extra = Extra.ignore
         arbitrary_types_allowed = True
+        json_encoders = {PackedSet: PackedSet.to_list}
 
     __config__: ClassVar[Type[Config]] = Config
 
@@ -60,54 +170,318 @@ class BaseSettings(BaseModel):
         self,
         env_prefix: Optional[str] = None,
         env_file: Union[str, PathLike, None] = None,
-        config_file: Union[str, PathLike, None] = None,
+        config_file: Union[str, PathLike, BytesLike, None] = None,
         config_format: Optional[str] = None,
         source_strategies: Optional[Sequence[SettingsStrategy]] = None,
         **kw: Any,
     ) -> None:
-        if source_strategies is None:
-            cfg = self.__config__
-
-            if config_file is not None:
-                config_file = Path(config_file)
-            if env_prefix is None:
-                env_prefix = cfg.env_prefix
-
-            source_strategies = [
-                KwSettingsStrategy(**kw),
-                EnvSettingsStrategy(
-                    env_prefix=env_prefix, case_sensitive=cfg.case_sensitive
-                ),
-                DotEnvSettingsStrategy(
-                    env_prefix=env_prefix,
-                    env_file=env_file or cfg.env_file,
-                    env_file_encoding=cfg.env_file_encoding,
-                    case_sensitive=cfg.case_sensitive,
+        with span('settings', type(self).__name__):
+            if source_strategies is None:
+                with span('strategies'):
+                    source_strategies = self.get_source_strategies(
+                        env_prefix=env_prefix,
+                        env_file=env_file,
+                        config_file=config_file,
+                        config_format=config_format,
+                        **kw,
+                    )
+
+            values = self.read_sources(source_strategies, self)
+            token = current_limits.set(Limits.from_config(self.__config__))
+            try:
+                with span('validate'):
+                    super().__init__(**values)
+            finally:
+                current_limits.reset(token)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if getattr(self, '_memoized', False):
+            raise TypeError(
+                f'"{type(self).__name__}" is memoized and immutable,'
+                ' use `copy()`'
+            )
+        super().__setattr__(name, value)
+
+    @classmethod
+    def get_source_strategies(  # pylint: disable=too-many-arguments
+        cls,
+        env_prefix: Optional[str] = None,
+        env_file: Union[str, PathLike, None] = None,
+        config_file: Union[str, PathLike, BytesLike, None] = None,
+        config_format: Optional[str] = None,
+        sections: Optional[Sequence[str]] = None,
+        **kw: Any,
+    ) -> List[SettingsStrategy]:
+        """
+        :param sections: top level keys, the config file may skip other ones
+        """
+        cfg = cls.__config__
+
+        if env_prefix is None:
+            env_prefix = cfg.env_prefix
+
+        source_strategies: List[SettingsStrategy] = [
+            KwSettingsStrategy(**kw),
+            EnvSettingsStrategy(
+                env_prefix=env_prefix, case_sensitive=cfg.case_sensitive
+            ),
+            DotEnvSettingsStrategy(
+                env_prefix=env_prefix,
+                env_file=env_file or cfg.env_file,
+                env_file_encoding=cfg.env_file_encoding,
+                env_file_parser=cfg.env_file_parser,
+                env_keys=class_cached(
+                    cls,
+                    ('env_keys', env_prefix),
+                    lambda: frozenset(cls.env_manifest(env_prefix)),
                 ),
-            ]
-            if config_file:
-                for s in (
-                    JsonSettingsStrategy,
-                    YamlSettingsStrategy,
-                    TomlSettingsStrategy,
-                    Hcl2SettingsStrategy,
+                case_sensitive=cfg.case_sensitive,
+            ),
+        ]
+        if config_file is not None:
+            source_strategies.append(
+                get_file_strategy(config_file, config_format, sections)
+            )
+
+        return source_strategies
+
+    @staticmethod
+    def read_sources(
+        source_strategies: Sequence[SettingsStrategy],
+        clazz: Union[Type['BaseSettings'], 'BaseSettings'],
+        sections: Optional[SectionTree] = None,
+    ) -> Dict[str, Any]:
+        """
+        Merge the sources, the first strategy has the highest priority
+        :param sections: drop everything else before the merge
+        """
+        values = []
+        for s in source_strategies:
+            with span('source', type(s).__name__):
+                values.append(project(s(clazz), sections))
+        with span('merge'):
+            return deep_update(*reversed(values))
+
+    @classmethod
+    def load_sections(  # pylint: disable=too-many-arguments
+        cls,
+        *paths: str,
+        env_prefix: Optional[str] = None,
+        env_file: Union[str, PathLike, None] = None,
+        config_file: Union[str, PathLike, BytesLike, None] = None,
+        config_format: Optional[str] = None,
+        **kw: Any,
+    ) -> Dict[str, Any]:
+        """
+        Load and validate only the `paths` sections, e.g. `http.transport`
+        :return: path -> validated value
+        """
+        # the sources are keyed by the aliases
+        tree = make_section_tree(
+            [f.alias for f in cls._section_fields(path)] for path in paths
+        )
+        source_strategies = cls.get_source_strategies(
+            env_prefix=env_prefix,
+            env_file=env_file,
+            config_file=config_file,
+            config_format=config_format,
+            sections=tuple(tree),
+            **kw,
+        )
+        values = cls.read_sources(source_strategies, cls, tree)
+        return {path: cls._validate_section(path, values) for path in paths}
+
+    @classmethod
+    def load_section(cls, path: str, **kw: Any) -> Any:
+        return cls.load_sections(path, **kw)[path]
+
+    @classmethod
+    def _section_fields(cls, path: str) -> List[ModelField]:
+        """
+        :return: the fields of the dotted field names path
+        """
+        model: Type[BaseModel] = cls
+        fields: List[ModelField] = []
+        for name in path.split('.'):
+            if fields:
+                parent = fields[-1]
+                # not into the models of a list or dict
+                if parent.shape != SHAPE_SINGLETON or not lenient_issubclass(
+                    parent.type_, BaseModel
                 ):
-                    if s.is_acceptable(config_file, config_format):
-                        source_strategies.append(
-                            s(
-                                config_file,
-                                config_format,  # type: ignore[abstract]
-                            )
-                        )
-                        break
-                else:
-                    raise NotImplementedError(
-                        f"No readers found for the config file: {config_file}"
-                    )
+                    raise ValueError(f"{path!r} is not a settings section")
+                model = parent.type_
+            field = model.__fields__.get(name)
+            if field is None:
+                raise ValueError(f"{path!r} is not a settings section")
+            fields.append(field)
+        return fields
 
-        super().__init__(
-            **deep_update(*reversed([s(self) for s in source_strategies]))
+    @classmethod
+    def _validate_section(cls, path: str, values: Any) -> Any:
+        model: Type[BaseModel] = cls
+        loc: Tuple[str, ...] = ()
+        *parents, field = cls._section_fields(path)
+
+        for parent in parents:
+            model, loc = parent.type_, loc + (parent.name,)
+            values = values.get(parent.alias) or {}
+        loc += (field.name,)
+
+        if field.alias not in values:
+            if not field.required:
+                return field.get_default()
+            raise ValidationError([ErrorWrapper(MissingError(), loc)], model)
+
+        value, errors = field.validate(values[field.alias], {}, loc=loc)
+        if errors:
+            raise ValidationError([errors], model)
+        return value
+
+    @classmethod
+    def memoized(  # pylint: disable=too-many-arguments
+        cls: Type[SettingsT],
+        env_prefix: Optional[str] = None,
+        env_file: Union[str, PathLike, None] = None,
+        config_file: Union[str, PathLike, BytesLike, None] = None,
+        config_format: Optional[str] = None,
+        **kw: Any,
+    ) -> SettingsT:
+        """
+        Shared immutable instance for the same arguments, env and files,
+        the nested models, lists, dicts and sets are frozen too.
+        Up to `Config.memo_size` instances per class, least recently used
+        are evicted, a changed env variable the class reads
+        (interpolated ones included) or file stat is a miss
+        """
+        cfg = cls.__config__
+        # the relative paths are keyed by the working dir
+        paths_key = [
+            Path(p) if isinstance(p, str) and p != '-' else p
+            for p in (env_file or cfg.env_file, config_file)
+        ]
+        digest: Optional[bytes]
+        try:
+            digest = args_digest(env_prefix, *paths_key, config_format, **kw)
+        except TypeError:  # not serializable argument
+            digest = None
+        if digest is None or cfg.memo_size <= 0 or config_file == '-':
+            return cls(
+                env_prefix=env_prefix,
+                env_file=env_file,
+                config_file=config_file,
+                config_format=config_format,
+                **kw,
+            )
+
+        memo: 'OrderedDict[Any, Any]' = class_cached(cls, 'memo', OrderedDict)
+        key = digest, env_snapshot(
+            cls.env_manifest(env_prefix), cfg.case_sensitive
         )
+        with _memo_lock:
+            entry = memo.get(key)
+        if entry is not None:
+            stats, refs, obj = entry
+            if all(file_stat(path) == st for path, st in stats) and all(
+                os.environ.get(k) == v for k, v in refs
+            ):
+                with _memo_lock:
+                    if key in memo:
+                        memo.move_to_end(key)
+                return obj  # type: ignore[no-any-return]
+
+        sources = [env_file or cfg.env_file]
+        if not is_bytes_like(config_file):
+            sources.append(config_file)  # type: ignore[arg-type]
+        paths = [Path(_).expanduser().resolve() for _ in sources if _]
+        stats = [(path, file_stat(path)) for path in paths]
+
+        source_strategies = cls.get_source_strategies(
+            env_prefix=env_prefix,
+            env_file=env_file,
+            config_file=config_file,
+            config_format=config_format,
+            **kw,
+        )
+        obj = cls(source_strategies=source_strategies)
+        object.__setattr__(obj, '__dict__', freeze_values(obj))
+        object.__setattr__(obj, '_memoized', True)
+
+        env_refs: Dict[str, Optional[str]] = {}
+        for s in source_strategies:
+            if isinstance(s, FileSettingsStrategy):
+                stats.extend(
+                    (path, file_stat(path))
+                    for path in s.includes
+                    if path not in paths
+                )
+                env_refs.update(s.env_refs)
+        with _memo_lock:
+            memo[key] = tuple(stats), tuple(env_refs.items()), obj
+            while len(memo) > cfg.memo_size:
+                memo.popitem(last=False)
+        return obj
+
+    @classmethod
+    def invalidate_memo(cls) -> None:
+        """
+        Drop the `memoized` instances of the class
+        """
+        with _memo_lock:
+            class_cached(cls, 'memo', OrderedDict).clear()
+
+    def copy(
+        self: SettingsT,
+        *,
+        include: Optional[Union[AbstractSetIntStr, MappingIntStrAny]] = None,
+        exclude: Optional[Union[AbstractSetIntStr, MappingIntStrAny]] = None,
+        update: Optional[Dict[str, Any]] = None,
+        deep: bool = False,
+    ) -> SettingsT:
+        """
+        The copy of a `memoized` instance is mutable, nested models too
+        """
+        res = super().copy(
+            include=include, exclude=exclude, update=update, deep=deep
+        )
+        if getattr(self, '_memoized', False):
+            object.__setattr__(res, '__dict__', thaw_values(res))
+        return res
+
+    @classmethod
+    def _get_value(cls, v: Any, *args: Any, **kw: Any) -> Any:
+        # dumps of a `memoized` instance are plain mutable containers
+        return dumpable(super()._get_value(v, *args, **kw))
+
+    def fingerprint(self) -> str:
+        """
+        Stable content hash of the validated settings tree
+        """
+        return fingerprint(self)
+
+    def diff(self, other: 'BaseSettings') -> Diff:
+        """
+        :return: changed dotted paths with (self value, other value)
+        """
+        return tree_diff(self, other)
+
+    def publish(self, name: str) -> int:
+        """
+        Share the settings with other processes via shared memory
+        :return: published version
+        """
+        return shm.publish(self, name)
+
+    @classmethod
+    def attach(cls: Type[SettingsT], name: str) -> SettingsT:
+        """
+        Take the settings published by `publish(name)` without reloading
+        """
+        shared = shm.AttachedSettings(name, cls)
+        try:
+            return shared.get()
+        finally:
+            shared.close()
 
     def safe_dict(
         self,
@@ -161,8 +535,48 @@ class BaseSettings(BaseModel):
         encoder = kw.pop('default', self.__json_encoder__)
         json_dump(o, f, default=encoder, **kw)
 
-    def write_schema(self, f: StrPathIO = sys.stdout, **kw: Any) -> None:
-        return self._write_json(self.schema(), f, **kw)
+    @classmethod
+    def schema_text(cls, by_alias: bool = True, **kw: Any) -> str:
+        """
+        Serialized json schema, cached per class and dump options
+        """
+
+        def dumps() -> str:
+            encoder = kw.pop('default', cls.__json_encoder__)
+            return json_dumps(
+                cls.schema(by_alias=by_alias), default=encoder, **kw
+            )
+
+        key = 'schema_text', by_alias, tuple(sorted(kw.items()))
+        return class_cached(cls, key, dumps)  # type: ignore[no-any-return]
+
+    @classmethod
+    def schema_bytes(cls, by_alias: bool = True, **kw: Any) -> bytes:
+        key = 'schema_bytes', by_alias, tuple(sorted(kw.items()))
+        return class_cached(  # type: ignore[no-any-return]
+            cls, key, lambda: cls.schema_text(by_alias, **kw).encode()
+        )
+
+    @classmethod
+    def write_schema(cls, f: StrPathIO = sys.stdout, **kw: Any) -> None:
+        text = cls.schema_text(**kw)
+        with ensure_stream(f, write=True) as s:
+            s.write(text)  # type: ignore[arg-type]
+
+    @classmethod
+    def env_manifest(cls, env_prefix: Optional[str] = None) -> Tuple[str, ...]:
+        """
+        :return: env names, including nested ones, the class would consult
+        """
+        cfg = cls.__config__
+        if env_prefix is None:
+            env_prefix = cfg.env_prefix
+
+        return class_cached(  # type: ignore[no-any-return]
+            cls,
+            ('env_manifest', env_prefix),
+            lambda: get_env_manifest(cls, env_prefix, cfg.case_sensitive),
+        )
 
     def write_json(self, f: StrPathIO = sys.stdout, **kw: Any) -> None:
         return self._write_json(self.dict(), f, **kw)
@@ -176,37 +590,5 @@ class BaseSettings(BaseModel):
     def to_env(self, **kw: Any) -> Dict[str, str]:
         prefix = self.__config__.env_prefix
         if not prefix:
-            return self._to_env(self.dict(**kw))
-        return self._to_env(self.dict(**kw), prefix)
-
-    def _to_env(self, ns: Dict[str, Any], *path: str) -> Dict[str, str]:
-        res = OrderedDict()
-
-        for name, model in ns.items():
-            _path = path + (name,)
-            env_name = '_'.join(_.upper() for _ in _path)
-
-            if not isinstance(model, dict):
-                # for mypy
-                env_val: Union[bool, bytes, str, int, float, complex, Decimal]
-                if model is None:
-                    env_val = ''
-                elif isinstance(model, bool):
-                    env_val = int(model)
-                elif isinstance(model, bytes):
-                    env_val = model.decode(
-                        encoding='utf-8', errors='surrogateescape'
-                    )
-                elif isinstance(model, (str, int, float, complex, Decimal)):
-                    env_val = model
-                else:
-                    raise NotImplementedError(
-                        f"Not a scalar: {env_name}={type(model)}"
-                    )
-
-                res[env_name] = str(env_val)
-            else:
-                for k, v in self._to_env(model, *_path).items():
-                    res[k] = v
-
-        return res
+            return flatten_env(self.dict(**kw))
+        return flatten_env(self.dict(**kw), prefix)
@@ -0,0 +1,238 @@
+"""
+Share validated settings with worker processes
+
+Parent:
+    cfg = IplConfig(config_file='config.yaml')
+    cfg.publish('myapp_settings')  # again on reload, the version is bumped
+
+Worker:
+    cfg = IplConfig.attach('myapp_settings')
+    # or keep the handle and take the latest version cheaply
+    shared = AttachedSettings('myapp_settings', IplConfig)
+    cfg = shared.get()
+"""
+
+import os
+import pickle  # nosec
+import struct
+import time
+from typing import Any, Generic, Optional, Set, Tuple, Type, TypeVar
+
+from ._optional_libs import shared_memory
+
+
+T = TypeVar('T')
+
+# control segment: seq, version, data segment name length, name
+CONTROL = struct.Struct('<QQH64s')
+# data segment: payload length, pickled settings
+HEADER = struct.Struct('<Q')
+# seqlock read deadline, seconds, a publisher died mid write otherwise
+READ_TIMEOUT = 1.0
+
+# segments created by this process, registered by its resource tracker
+_created: Set[str] = set()
+# a forked child shares the resource tracker of the parent
+_forked = False
+
+
+def _after_fork() -> None:
+    global _forked  # pylint: disable=global-statement
+    _forked = True
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork)
+
+
+def _shared_memory(
+    name: Optional[str] = None, create: bool = False, size: int = 0
+) -> Any:
+    if isinstance(shared_memory, Exception):
+        raise shared_memory
+    return shared_memory.SharedMemory(name, create=create, size=size)
+
+
+def _own_tracker(name: str) -> bool:
+    """
+    Whether the attach registered the segment in a resource tracker
+    of this process only: not the creator, not a forked or spawned child
+    sharing the tracker, where the unregister drops the creator entry
+    """
+    if name in _created or _forked:
+        return False
+    try:
+        from multiprocessing import resource_tracker
+
+        tracker: Any = resource_tracker._resource_tracker  # type: ignore
+    except (ImportError, AttributeError):  # pragma: no cover
+        return False
+    # a spawned child has the fd of the parent tracker, but not its pid
+    return tracker._fd is None or tracker._pid is not None
+
+
+def _attach(name: str) -> Any:
+    """
+    Open the segment without tracking,
+    only the publisher should unlink the segment at exit
+    """
+    if isinstance(shared_memory, Exception):
+        raise shared_memory
+    try:
+        return shared_memory.SharedMemory(  # py313
+            name, track=False  # type: ignore[call-arg]
+        )
+    except TypeError:
+        pass
+
+    own = _own_tracker(name)
+    shm = shared_memory.SharedMemory(name)
+    if own:
+        try:
+            from multiprocessing import resource_tracker
+
+            resource_tracker.unregister(
+                shm._name, 'shared_memory'  # type: ignore[attr-defined]
+            )  # pylint: disable=protected-access
+        except (ImportError, AttributeError):  # pragma: no cover
+            pass
+    return shm
+
+
+def _unlink(name: str) -> None:
+    try:
+        shm = _shared_memory(name)
+    except FileNotFoundError:
+        return
+    shm.close()
+    shm.unlink()
+    _created.discard(name)
+
+
+def read_control(
+    control: Any, timeout: Optional[float] = None
+) -> Tuple[int, str]:
+    """
+    Seqlock read of the control segment, spins then backs off
+    :param timeout: seconds, `READ_TIMEOUT` by default
+    :return: version, data segment name
+    :raise TimeoutError: the segment is being written longer than timeout
+    """
+    deadline = time.monotonic() + (
+        READ_TIMEOUT if timeout is None else timeout
+    )
+    delay = 0.0
+    while True:
+        seq, version, size, name = CONTROL.unpack_from(control.buf)
+        if not seq % 2 and CONTROL.unpack_from(control.buf)[0] == seq:
+            return version, name[:size].decode()
+        if time.monotonic() > deadline:
+            raise TimeoutError(
+                f"Shared settings {control.name!r} are being written"
+                f" longer than the timeout, the publisher died?"
+            )
+        if delay:
+            time.sleep(delay)
+        delay = min(delay * 2 or 1e-6, 1e-3)
+
+
+def publish(obj: Any, name: str) -> int:
+    """
+    Pickle the object into a new data segment and switch the
+    `name` control segment to it, the previous data segment is unlinked
+    :return: published version
+    """
+    try:
+        control = _shared_memory(name)
+        version, prev = read_control(control)
+    except FileNotFoundError:
+        control = _shared_memory(name, create=True, size=CONTROL.size)
+        _created.add(name)
+        version, prev = 0, ''
+
+    payload = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+    data = _shared_memory(create=True, size=HEADER.size + len(payload))
+    _created.add(data.name)
+    HEADER.pack_into(data.buf, 0, len(payload))
+    end = HEADER.size + len(payload)
+    data.buf[HEADER.size : end] = payload  # noqa: E203
+
+    seq = CONTROL.unpack_from(control.buf)[0]
+    data_name = data.name.encode()
+    struct.pack_into('<Q', control.buf, 0, seq + 1)
+    CONTROL.pack_into(
+        control.buf, 0, seq + 1, version + 1, len(data_name), data_name
+    )
+    struct.pack_into('<Q', control.buf, 0, seq + 2)
+
+    data.close()
+    control.close()
+    if prev:
+        _unlink(prev)
+    return version + 1
+
+
+def unlink(name: str) -> None:
+    """
+    Remove the published control segment with its data segment
+    """
+    try:
+        control = _shared_memory(name)
+    except FileNotFoundError:
+        return
+    _, data_name = read_control(control)
+    if data_name:
+        _unlink(data_name)
+    control.close()
+    control.unlink()
+    _created.discard(name)
+
+
+def load(data_name: str) -> Any:
+    data = _attach(data_name)
+    try:
+        (size,) = HEADER.unpack_from(data.buf)
+        end = HEADER.size + size
+        with data.buf[HEADER.size : end] as buf:  # noqa: E203
+            return pickle.loads(buf)  # nosec
+    finally:
+        data.close()
+
+
+class AttachedSettings(Generic[T]):
+    """
+    Worker side handle, `get()` costs one control segment read
+    until the parent publishes a new version
+    """
+
+    __slots__ = 'name', 'clazz', '_control', '_version', '_obj'
+
+    def __init__(self, name: str, clazz: Type[T]) -> None:
+        self.name: str = name
+        self.clazz: Type[T] = clazz
+        self._control: Any = _attach(name)
+        self._version: int = 0
+        self._obj: Optional[T] = None
+
+    @property
+    def version(self) -> int:
+        return read_control(self._control)[0]
+
+    def get(self) -> T:
+        while True:
+            version, data_name = read_control(self._control)
+            if self._obj is not None and version == self._version:
+                return self._obj
+            try:
+                obj = load(data_name)
+            except FileNotFoundError:  # replaced meanwhile
+                continue
+            if not isinstance(obj, self.clazz):
+                raise TypeError(
+                    f"{self.name!r} holds {type(obj)}, not {self.clazz}"
+                )
+            self._version, self._obj = version, obj
+            return obj
+
+    def close(self) -> None:
+        self._control.close()
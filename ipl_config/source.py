@@ -4,14 +4,18 @@ from __future__ import annotations
 
 import os
 import sys
+import weakref
 from abc import ABCMeta, abstractmethod
+from functools import lru_cache, wraps
 from os import PathLike
 from pathlib import Path
 from types import ModuleType
 from typing import (  # noqa: I101
     TYPE_CHECKING,
     Any,
+    Callable,
     ClassVar,
+    Container,
     Dict,
     Optional,
     Sequence,
@@ -22,28 +26,166 @@ from typing import (  # noqa: I101
 )
 from warnings import warn
 
-import pydantic
-from pydantic import BaseModel
-from pydantic.env_settings import InitSettingsSource
-from pydantic.fields import ModelField
-from pydantic.typing import get_origin, is_union
-from pydantic.utils import lenient_issubclass
+from pydantic.v1 import BaseModel
+from pydantic.v1.env_settings import InitSettingsSource
+from pydantic.v1.fields import SHAPE_SINGLETON, ModelField  # noqa: I101
+from pydantic.v1.typing import get_origin, is_union
+from pydantic.v1.utils import lenient_issubclass
 
 from ._optional_libs import dotenv  # noqa: I202
-from ._optional_libs import hcl2, toml, yaml
+from ._optional_libs import hcl2, metadata, toml, yaml
+from .cache import ParseCache
 from .dumploads import (
+    BytesLike,
     ConfigLoadCallable,
     hcl2_load,
+    is_bytes_like,
     json_load,
     toml_load,
     yaml_load,
+    yaml_load_sections,
 )
+from .envfile import read_env
+from .include import IncludeResolver
+from .interpolate import interpolate
+from .limits import Guard, Limits
+from .profiler import span
+from .types import PackedSet, confine_file_ref
 
 
 if TYPE_CHECKING:
     from ipl_config import BaseSettings  # pragma: no cover
 
 
+# config path of stdin and in-memory content
+STDIN = Path('-')
+
+# env value kinds, see `_classify_field`
+KIND_SCALAR = 0
+KIND_MODEL = 1
+KIND_COMPLEX = 2
+KIND_UNION_COMPLEX = 3
+
+_field_kinds: 'weakref.WeakKeyDictionary[type, Dict[str, int]]' = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _classify_field(field: ModelField) -> int:
+    if field.shape == SHAPE_SINGLETON and lenient_issubclass(
+        field.type_, BaseModel
+    ):
+        return KIND_MODEL
+    if field.is_complex():
+        return KIND_COMPLEX
+    if is_union(get_origin(field.type_)):
+        # only the leading complex branches of union want a json value,
+        # the first scalar branch takes a raw string as is
+        if field.sub_fields and field.sub_fields[0].is_complex():
+            return KIND_UNION_COMPLEX
+    return KIND_SCALAR
+
+
+def get_field_kind(
+    clz: Union[Type[BaseModel], BaseModel], field: ModelField
+) -> int:
+    """
+    Classify the field once per model class
+    """
+    if not isinstance(clz, type):
+        clz = type(clz)
+    kinds = _field_kinds.get(clz)
+    if kinds is None:
+        kinds = _field_kinds[clz] = {}
+    kind = kinds.get(field.name)
+    if kind is None:
+        kind = kinds[field.name] = _classify_field(field)
+    return kind
+
+
+def get_env_name(
+    field: ModelField,
+    prefix: Optional[str] = None,
+    case_sensitive: Optional[bool] = False,
+) -> str:
+    prefix = prefix or ''
+    env_prefix = field.field_info.extra.get('env_prefix') or prefix
+    env_name = field.field_info.extra.get('env')
+    if not env_name:
+        env_name = env_prefix + (env_prefix and '_' or '') + field.name
+    if not case_sensitive:
+        env_name = env_name.lower()
+    return env_name  # type: ignore[no-any-return]
+
+
+def get_env_manifest(
+    clz: Union[Type[BaseModel], BaseModel],
+    prefix: Optional[str] = None,
+    case_sensitive: Optional[bool] = False,
+) -> Tuple[str, ...]:
+    """
+    :return: env names the `EnvSettingsStrategy` would consult for the model
+    """
+    res: Tuple[str, ...] = ()
+    for field in clz.__fields__.values():
+        env_name = get_env_name(field, prefix, case_sensitive)
+        if get_field_kind(clz, field) == KIND_MODEL:
+            res += get_env_manifest(field.type_, env_name, case_sensitive)
+        else:
+            res += (env_name,)
+    return res
+
+
+def rebase_file_refs(
+    clz: Type[BaseModel], values: Any, base: Path, root: Path
+) -> Any:
+    """
+    `@path` values of the `PackedSet` fields, nested ones too,
+    resolved from `base`, the config file directory, and confined to `root`
+    :return: the values, a changed copy if any path is rebased
+    :raise FileRefError: absolute path or path outside of `root`
+    """
+    if not isinstance(values, dict):
+        return values
+    res = values
+    for field in clz.__fields__.values():
+        value = values.get(field.alias)
+        if field.shape != SHAPE_SINGLETON or value is None:
+            continue
+        if lenient_issubclass(field.type_, PackedSet):
+            if not isinstance(value, str) or not value.startswith('@'):
+                continue
+            value = confine_file_ref(value.strip(), base, root)
+        elif lenient_issubclass(field.type_, BaseModel):
+            value = rebase_file_refs(field.type_, value, base, root)
+        if value is not values[field.alias]:
+            if res is values:
+                res = dict(values)
+            res[field.alias] = value
+    return res
+
+
+@lru_cache(maxsize=None)
+def module_version(module: ModuleType) -> str:
+    """
+    :return: `__version__` of the module, the version of its distribution
+    without it, empty if unknown
+    """
+    version = getattr(module, '__version__', None)
+    if version or isinstance(metadata, ImportError):
+        return str(version or '')
+    name = module.__name__.split('.')[0]
+    packages: Dict[str, Any] = getattr(  # py310
+        metadata, 'packages_distributions', dict
+    )()
+    for dist in packages.get(name) or (name,):
+        try:
+            return metadata.version(dist)
+        except metadata.PackageNotFoundError:
+            pass
+    return ''
+
+
 class SettingsStrategyMetaclass(ABCMeta):  # noqa: B024
     @no_type_check
     def __call__(cls, *args, **kwargs):
@@ -73,7 +215,7 @@ class SettingsStrategy(metaclass=SettingsStrategyMetaclass):
 
 # pylint: disable=too-few-public-methods
 class EnvSettingsStrategy(SettingsStrategy):
-    __slots__ = 'env_prefix', 'env_vars', 'case_sensitive'
+    __slots__ = 'env_prefix', 'env_vars', 'case_sensitive', '_json_cache'
 
     def __init__(
         self,
@@ -88,6 +230,10 @@ class EnvSettingsStrategy(SettingsStrategy):
             else os.environ
         )
         self.case_sensitive: Optional[bool] = case_sensitive
+        # raw env value -> decoded value or decode error, per `json_loads`
+        self._json_cache: Dict[
+            Tuple[Callable[..., Any], str], Union[Any, ValueError]
+        ] = {}
 
         # self.env_vars: Dict[str, Optional[str]] = {
         #     **os.environ,
@@ -125,44 +271,61 @@ class EnvSettingsStrategy(SettingsStrategy):
         field: ModelField,
         prefix: Optional[str] = None,
     ) -> Optional[Tuple[str, Any]]:
-        prefix = prefix or ''
-
-        if field.field_info.extra.get('deprecated'):
-            warn(f"{field.name!r} is deprecated", DeprecationWarning)
-        if field.has_alias:
-            warn('Instead of aliases use the `env` setting', FutureWarning)
-
-        env_prefix = field.field_info.extra.get('env_prefix') or prefix
-        env_name = field.field_info.extra.get('env')
-        if not env_name:
-            env_name = env_prefix + (env_prefix and '_' or '') + field.name
-        if not self.case_sensitive:
-            env_name = env_name.lower()
-
-        env_val: Any = self.env_vars.get(env_name)
-
-        if (
-            field.shape == pydantic.fields.SHAPE_SINGLETON
-            and lenient_issubclass(field.type_, BaseModel)  # noqa: W503
-        ):
-            env_val = self(field.type_, prefix=env_name)
-        elif field.is_complex():
+        with span('field', field.name):
+            if field.field_info.extra.get('deprecated'):
+                warn(f"{field.name!r} is deprecated", DeprecationWarning)
+            if field.has_alias:
+                warn('Instead of aliases use the `env` setting', FutureWarning)
+
+            with span('env_lookup'):
+                env_name = get_env_name(field, prefix, self.case_sensitive)
+                env_val: Any = self.env_vars.get(env_name)
+                kind = get_field_kind(clz, field)
+
+            if kind == KIND_MODEL:
+                env_val = self(field.type_, prefix=env_name)
+            elif env_val is not None and kind == KIND_COMPLEX:
+                env_val = self._json_decode(clz, env_val)
+                if isinstance(env_val, ValueError):
+                    raise env_val
+            elif env_val is not None and kind == KIND_UNION_COMPLEX:
+                decoded = self._json_decode(clz, env_val)
+                if not isinstance(decoded, ValueError):
+                    env_val = decoded
+
             if env_val is not None:
-                env_val = clz.__config__.json_loads(env_val)
-        elif is_union(get_origin(field.type_)):
-            for f in field.sub_fields:
-                try:
-                    if env_val is not None and f.is_complex():
-                        env_val = clz.__config__.json_loads(env_val)
-                    else:
-                        break
-                except ValueError:
-                    pass
+                return field.alias, env_val
 
-        if env_val is not None:
-            return field.alias, env_val
+            return None
 
-        return None
+    @staticmethod
+    def get_json_loads(
+        clz: Union[Type[BaseModel], BaseModel]
+    ) -> Callable[[str], Any]:
+        return clz.__config__.json_loads
+
+    def _json_decode(
+        self, clz: Union[Type[BaseModel], BaseModel], env_val: str
+    ) -> Union[Any, ValueError]:
+        """
+        Decode the raw env value at most once with `Config.json_loads`
+        :return: decoded value or the decode error
+        """
+        json_loads = self.get_json_loads(clz)
+        key = json_loads, env_val
+        try:
+            return self._json_cache[key]
+        except KeyError:
+            pass
+
+        res: Union[Any, ValueError]
+        try:
+            with span('json_decode'):
+                res = json_loads(env_val)
+        except ValueError as e:
+            res = e
+        self._json_cache[key] = res
+        return res
 
 
 # pylint: disable=too-few-public-methods
@@ -175,11 +338,19 @@ class DotEnvSettingsStrategy(EnvSettingsStrategy):
         case_sensitive: Optional[bool] = False,
         env_file: Union[str, PathLike, None] = None,
         env_file_encoding: Optional[str] = None,
+        env_file_parser: Optional[str] = None,
+        env_keys: Optional[Container[str]] = None,
     ):
         super().__init__(
             env_prefix=env_prefix,
             case_sensitive=case_sensitive,
-            env_vars=read_env_file(env_file, encoding=env_file_encoding)
+            env_vars=read_env_file(
+                env_file,
+                encoding=env_file_encoding,
+                keys=env_keys,
+                case_sensitive=case_sensitive,
+                parser=env_file_parser,
+            )
             if env_file
             else {},
         )
@@ -197,24 +368,194 @@ class KwSettingsStrategy(SettingsStrategy, InitSettingsSource):
 
 
 class FileSettingsStrategy(SettingsStrategy):
-    __slots__ = 'path', 'config_format'
+    __slots__ = (
+        'path',
+        'data',
+        'config_format',
+        'sections',
+        'includes',
+        'env_refs',
+    )
 
     __extensions__: ClassVar[Sequence[str]] = ()
 
     def __init__(
-        self, path: Union[str, PathLike], config_format: Optional[str] = None
+        self,
+        path: Union[str, PathLike, BytesLike],
+        config_format: Optional[str] = None,
+        sections: Optional[Sequence[str]] = None,
     ):
-        self.path: Path = Path(path).expanduser()
+        """
+        :param path: config file, `-` for stdin or the content itself
+        (bytes, memoryview, mmap), the last two require `config_format`
+        :param sections: top level keys to load, other ones may be skipped
+        """
+        self.data: Optional[BytesLike] = None
+        if is_bytes_like(path):
+            self.data, path = path, STDIN  # type: ignore[assignment]
+        self.path: Path = Path(path).expanduser()  # type: ignore[arg-type]
         self.config_format: Optional[str] = config_format
+        self.sections: Optional[Sequence[str]] = sections
+        # resolved include graph of the last load: file -> included files
+        self.includes: Dict[Path, Tuple[Path, ...]] = {}
+        # env variables the last interpolation read and their values
+        self.env_refs: Dict[str, Optional[str]] = {}
 
     def __call__(
         self, clazz: Union[Type[BaseSettings], BaseSettings]
     ) -> Dict[str, Any]:
+        return self.rebase(clazz, self.load(clazz))
+
+    def load(self, clazz: Union[Type[BaseSettings], BaseSettings]) -> Any:
+        """
+        The document with the includes resolved and interpolated,
+        shareable by the classes with the same config options
+        """
         if not self.is_acceptable(self.path, self.config_format):
             return {}
 
-        loader = self.get_loader(clazz)
-        return loader(self.path)
+        limits = Limits.from_config(clazz.__config__)
+        # one budget for the included files and the interpolation
+        guard = None if limits is None else Guard(limits)
+        data: Union[Path, BytesLike] = self.path.resolve()
+        if self.path == STDIN:
+            data = (
+                self.data if self.data is not None else sys.stdin.buffer.read()
+            )
+        include_key = getattr(clazz.__config__, 'config_include_key', None)
+        if include_key is None:
+            res = self.parse(clazz, data, guard)
+            self.includes = {}
+        else:
+            resolver = IncludeResolver(
+                lambda path: self.parse(clazz, path, guard),
+                include_key,
+                guard,
+                self.include_root(clazz),
+            )
+            if isinstance(data, Path):
+                res = resolver.load(data)
+            else:
+                # includes of the content are relative to the working dir
+                res = resolver.resolve(
+                    self.parse(clazz, data, guard), Path.cwd()
+                )
+            self.includes = resolver.graph
+        self.env_refs = {}
+        if getattr(clazz.__config__, 'config_interpolate', False):
+            with span('interpolate'):
+                res = interpolate(res, guard=guard, env_refs=self.env_refs)
+        if self.sections is not None and isinstance(res, dict):
+            res = {k: v for k, v in res.items() if k in self.sections}
+        return res
+
+    def rebase(
+        self, clazz: Union[Type[BaseSettings], BaseSettings], doc: Any
+    ) -> Any:
+        """
+        :return: the document with the `@path` values of the class fields
+        resolved, see `rebase_file_refs`
+        """
+        clz = clazz if isinstance(clazz, type) else type(clazz)
+        if not lenient_issubclass(clz, BaseModel):
+            return doc
+        return rebase_file_refs(
+            clz, doc, self.base_dir(), self.include_root(clazz)
+        )
+
+    def base_dir(self) -> Path:
+        """
+        :return: the config directory, the working dir for the content
+        as for its includes
+        """
+        if self.path == STDIN:
+            return Path.cwd()
+        return self.path.resolve().parent
+
+    def include_root(
+        self, clazz: Union[Type[BaseSettings], BaseSettings]
+    ) -> Path:
+        """
+        :return: the directory the includes and `@path` values stay under,
+        `Config.config_include_root` relative to the config directory
+        """
+        base = self.base_dir()
+        root = getattr(clazz.__config__, 'config_include_root', None)
+        if root is None:
+            return base
+        return (base / Path(root).expanduser()).resolve()
+
+    def parse(
+        self,
+        clazz: Union[Type[BaseSettings], BaseSettings],
+        path: Union[Path, BytesLike],
+        guard: Optional[Guard] = None,
+    ) -> Any:
+        """
+        Parse the config, its content or the included file,
+        detect the format of last one
+        :param guard: the budget of the load, the config limits by default
+        """
+        strategy: FileSettingsStrategy = self
+        if isinstance(path, Path) and path != self.path.resolve():
+            for s in FILE_STRATEGIES:
+                if s.is_acceptable(path):
+                    strategy = s(path)  # type: ignore[abstract]
+                    break
+
+        loader = strategy.get_loader(clazz)
+        if guard is None:
+            limits = Limits.from_config(clazz.__config__)
+            guard = None if limits is None else Guard(limits)
+        kw = {} if guard is None else {'limits': guard}
+        cache_dir = getattr(clazz.__config__, 'config_cache_dir', None)
+        with span('parse', str(path) if isinstance(path, Path) else '<data>'):
+            if not cache_dir:
+                return loader(path, **kw)
+
+            version = strategy.get_parser_version()
+            if getattr(clazz.__config__, 'config_include_key', None):
+                version += ' includes'
+            skip = strategy.skip_sections(clazz)
+            if skip is not None:
+                version += ' sections=' + ','.join(sorted(skip))
+            cache = ParseCache(cache_dir, clazz.__config__.config_cache_size)
+            if guard is None:
+                return cache.load(path, loader, version)
+
+            # the cache reads the whole file before the loader
+            size = (
+                os.stat(path).st_size if isinstance(path, Path) else len(path)
+            )
+            guard.check_size(size)
+            parsed = False
+
+            @wraps(loader)
+            def load(f: Any, **kw: Any) -> Any:
+                nonlocal parsed
+                parsed = True
+                return loader(f, **kw)
+
+            doc = cache.load(path, load, version, **kw)
+            if not parsed:  # a cached document is checked as parsed
+                guard.add_size(size)
+                guard.walk(doc)
+            return doc
+
+    def get_parser_version(self) -> str:
+        """
+        :return: version of python and the parser dependencies,
+        part of the parse cache key
+        """
+        return ' '.join(
+            [
+                '%d.%d' % sys.version_info[:2],
+                *map(
+                    module_version,  # type: ignore[arg-type]
+                    self.__dependencies__ or (),
+                ),
+            ]
+        )
 
     @abstractmethod
     def get_loader(
@@ -222,6 +563,18 @@ class FileSettingsStrategy(SettingsStrategy):
     ) -> ConfigLoadCallable:
         pass  # pragma: no cover
 
+    def skip_sections(
+        self, clazz: Union[Type[BaseSettings], BaseSettings]
+    ) -> Optional[Sequence[str]]:
+        """
+        :return: the sections the loader may take, skipping other ones,
+        None is the whole document: the interpolation references
+        may point to any section
+        """
+        if getattr(clazz.__config__, 'config_interpolate', False):
+            return None
+        return self.sections
+
     @classmethod
     def is_acceptable(
         cls, path: Optional[Path] = None, config_format: Optional[str] = None
@@ -258,7 +611,25 @@ class YamlSettingsStrategy(FileSettingsStrategy):
     def get_loader(
         self, clazz: Union[Type[BaseSettings], BaseSettings]
     ) -> ConfigLoadCallable:
-        return yaml_load
+        include_key = getattr(clazz.__config__, 'config_include_key', None)
+        sections = self.skip_sections(clazz)
+        if sections is None:
+            if include_key is None:
+                return yaml_load
+
+            def yaml_load_includes(f: Any, **kw: Any) -> Any:
+                return yaml_load(f, includes=True, **kw)
+
+            return yaml_load_includes
+
+        sections = (*sections, include_key or '')
+
+        def yaml_load_sections_(f: Any, **kw: Any) -> Any:
+            return yaml_load_sections(
+                f, sections, includes=include_key is not None, **kw
+            )
+
+        return yaml_load_sections_
 
 
 class TomlSettingsStrategy(FileSettingsStrategy):
@@ -281,18 +652,74 @@ class Hcl2SettingsStrategy(FileSettingsStrategy):
         return hcl2_load
 
 
-def read_env_file(
-    path: Union[str, PathLike], *, encoding: Optional[str] = None
+FILE_STRATEGIES: Tuple[Type[FileSettingsStrategy], ...] = (
+    JsonSettingsStrategy,
+    YamlSettingsStrategy,
+    TomlSettingsStrategy,
+    Hcl2SettingsStrategy,
+)
+
+
+def get_file_strategy(
+    config_file: Union[str, PathLike, BytesLike],
+    config_format: Optional[str] = None,
+    sections: Optional[Sequence[str]] = None,
+) -> FileSettingsStrategy:
+    """
+    :return: strategy for the config file format
+    """
+    path = (
+        STDIN
+        if is_bytes_like(config_file)
+        else Path(config_file)  # type: ignore[arg-type]
+    )
+    for s in FILE_STRATEGIES:
+        if s.is_acceptable(path, config_format):
+            return s(config_file, config_format, sections)  # type: ignore
+    raise NotImplementedError(f"No readers found for the config file: {path}")
+
+
+def read_env_file(  # pylint: disable=too-many-arguments
+    path: Union[str, PathLike],
+    *,
+    encoding: Optional[str] = None,
+    keys: Optional[Container[str]] = None,
+    case_sensitive: Optional[bool] = True,
+    parser: Optional[str] = None,
+    use_mmap: bool = False,
 ) -> Dict[str, Optional[str]]:
+    """
+    :param keys: read only these keys, e.g. the settings env manifest
+    :param parser: `dotenv` to parse with python-dotenv (variables expansion)
+    """
     path = Path(path).expanduser()
     is_env_default = str(path) == '.env'
     is_env_exists = path.is_file()
 
-    if is_env_exists and isinstance(dotenv, Exception):
-        warn(str(dotenv), ImportWarning)
-    elif not is_env_exists and not is_env_default:
-        warn(f"{str(path)!r} is not a file", UserWarning)
-    else:
-        return dotenv.dotenv_values(path, encoding=encoding or 'utf-8')
+    if not is_env_exists:
+        if not is_env_default:
+            warn(f"{str(path)!r} is not a file", UserWarning)
+        return {}
 
-    return {}
+    if isinstance(keys, (list, tuple)):
+        keys = frozenset(keys)  # a lookup per line
+    if parser == 'dotenv':
+        if isinstance(dotenv, Exception):
+            warn(str(dotenv), ImportWarning)
+            return {}
+        env_vars = dotenv.dotenv_values(path, encoding=encoding or 'utf-8')
+        if keys is None:
+            return env_vars  # type: ignore[no-any-return]
+        return {
+            k: v
+            for k, v in env_vars.items()
+            if (k if case_sensitive else k.lower()) in keys
+        }
+
+    return read_env(
+        path,
+        encoding=encoding or 'utf-8',
+        keys=keys,
+        case_sensitive=bool(case_sensitive),
+        use_mmap=use_mmap,
+    )
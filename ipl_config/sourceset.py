@@ -0,0 +1,223 @@
+import os
+import sys
+from os import PathLike
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
+
+from pydantic.v1.config import Extra
+
+from .dumploads import BytesLike
+from .limits import Limits
+from .settings import BaseSettings
+from .source import (
+    EnvSettingsStrategy,
+    FileSettingsStrategy,
+    KwSettingsStrategy,
+    SettingsStrategy,
+    get_file_strategy,
+    read_env_file,
+)
+
+
+S = TypeVar('S', bound=BaseSettings)
+
+Clazz = Union[Type[BaseSettings], BaseSettings]
+
+
+class SharedSettingsStrategy(SettingsStrategy):
+    """
+    Strategy over a source already read by the `SourceSet`
+    """
+
+    __slots__ = ('read',)
+
+    def __init__(self, read: Callable[[Clazz], Dict[str, Any]]) -> None:
+        self.read: Callable[[Clazz], Dict[str, Any]] = read
+
+    def __call__(self, clazz: Clazz) -> Dict[str, Any]:
+        return self.read(clazz)
+
+
+class SourceSet:
+    """
+    Reads env, .env and the config file once for many settings classes.
+    The env is a snapshot taken by the constructor, every .env and
+    the config file are read on the first use and then indexed
+    by the settings options they depend on (case sensitivity,
+    include key, interpolation, limits). The read documents are shared,
+    the settings built from them must not be mutated.
+    """
+
+    __slots__ = (
+        'env_file',
+        'config_file',
+        'config_format',
+        'env_vars',
+        '_env',
+        '_dotenv',
+        '_docs',
+    )
+
+    def __init__(
+        self,
+        env_file: Union[str, PathLike, None] = None,
+        config_file: Union[str, PathLike, BytesLike, None] = None,
+        config_format: Optional[str] = None,
+        env_vars: Optional[Mapping[str, Optional[str]]] = None,
+    ) -> None:
+        """
+        :param env_file: .env for all classes, `Config.env_file` otherwise
+        :param config_file: as `BaseSettings` `config_file`
+        :param env_vars: the env, `os.environ` snapshot by default
+        """
+        if isinstance(config_file, str) and config_file == '-':
+            config_file = sys.stdin.buffer.read()  # once for all formats
+        self.env_file: Union[str, PathLike, None] = env_file
+        self.config_file: Union[str, PathLike, BytesLike, None] = config_file
+        self.config_format: Optional[str] = config_format
+        self.env_vars: Dict[str, Optional[str]] = dict(
+            os.environ if env_vars is None else env_vars
+        )
+        # case_sensitive -> env index
+        self._env: Dict[bool, EnvSettingsStrategy] = {}
+        # (path, encoding, parser, case_sensitive) -> .env index
+        self._dotenv: Dict[Tuple[Any, ...], EnvSettingsStrategy] = {}
+        # (strategy, include key, interpolate, cache, limits) -> document
+        self._docs: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+
+    def build(self, *classes: Type[BaseSettings]) -> Tuple[Any, ...]:
+        """
+        :return: an instance of every class in the same order
+        """
+        return tuple(self.load(clz) for clz in classes)
+
+    def load(
+        self, clz: Type[S], env_prefix: Optional[str] = None, **kw: Any
+    ) -> S:
+        return clz(
+            source_strategies=self.get_source_strategies(clz, env_prefix, **kw)
+        )
+
+    def get_source_strategies(
+        self,
+        clz: Type[BaseSettings],
+        env_prefix: Optional[str] = None,
+        **kw: Any
+    ) -> List[SettingsStrategy]:
+        """
+        Same sources and priorities as `BaseSettings.get_source_strategies`
+        """
+        cfg = clz.__config__
+        case_sensitive = bool(cfg.case_sensitive)
+        if env_prefix is None:
+            env_prefix = cfg.env_prefix
+        if env_prefix and not case_sensitive:
+            env_prefix = env_prefix.lower()
+
+        source_strategies: List[SettingsStrategy] = [
+            KwSettingsStrategy(**kw),
+            self._env_source(self._get_env(case_sensitive), env_prefix),
+        ]
+        env_file = self.env_file or cfg.env_file
+        if env_file:
+            dotenv = self._get_dotenv(
+                env_file,
+                cfg.env_file_encoding,
+                cfg.env_file_parser,
+                case_sensitive,
+            )
+            source_strategies.append(self._env_source(dotenv, env_prefix))
+        if self.config_file is not None:
+            strategy = get_file_strategy(self.config_file, self.config_format)
+            source_strategies.append(
+                SharedSettingsStrategy(
+                    lambda clazz: self._get_doc(strategy, clazz)
+                )
+            )
+        return source_strategies
+
+    @staticmethod
+    def _env_source(
+        strategy: EnvSettingsStrategy, env_prefix: Optional[str]
+    ) -> SharedSettingsStrategy:
+        return SharedSettingsStrategy(
+            lambda clazz: strategy(clazz, env_prefix)
+        )
+
+    def _get_env(self, case_sensitive: bool) -> EnvSettingsStrategy:
+        try:
+            return self._env[case_sensitive]
+        except KeyError:
+            pass
+        strategy = self._env[case_sensitive] = EnvSettingsStrategy(
+            env_vars=self.env_vars, case_sensitive=case_sensitive
+        )
+        return strategy
+
+    def _get_dotenv(
+        self,
+        env_file: Union[str, PathLike],
+        encoding: Optional[str],
+        parser: Optional[str],
+        case_sensitive: bool,
+    ) -> EnvSettingsStrategy:
+        key = os.fspath(env_file), encoding, parser, case_sensitive
+        try:
+            return self._dotenv[key]
+        except KeyError:
+            pass
+        # all keys, the set serves classes with different manifests
+        env_vars = read_env_file(
+            env_file,
+            encoding=encoding,
+            case_sensitive=case_sensitive,
+            parser=parser,
+        )
+        strategy = self._dotenv[key] = EnvSettingsStrategy(
+            env_vars=env_vars, case_sensitive=case_sensitive
+        )
+        return strategy
+
+    def _get_doc(
+        self, strategy: FileSettingsStrategy, clazz: Clazz
+    ) -> Dict[str, Any]:
+        cfg = clazz.__config__
+        key = (
+            type(strategy),
+            getattr(cfg, 'config_include_key', None),
+            getattr(cfg, 'config_include_root', None),
+            getattr(cfg, 'config_interpolate', False),
+            getattr(cfg, 'config_cache_dir', None),
+            Limits.from_config(cfg),
+        )
+        try:
+            doc = self._docs[key]
+        except KeyError:
+            doc = self._docs[key] = strategy.load(clazz)
+        # the `@path` values of the class fields
+        doc = strategy.rebase(clazz, doc)
+        if cfg.extra == Extra.allow or not isinstance(doc, dict):
+            return doc
+        # only the class fields, the rest would be ignored after the merge
+        return {
+            f.alias: doc[f.alias]
+            for f in clazz.__fields__.values()
+            if f.alias in doc
+        }
+
+    def clear(self) -> None:
+        """
+        Forget the read .env and config files, the env snapshot is kept
+        """
+        self._dotenv.clear()
+        self._docs.clear()
@@ -0,0 +1,288 @@
+"""
+Compact field types for huge homogeneous lists.
+
+Items are kept sorted and unique in `array`, membership is a binary search.
+The value may be a list, any iterable, a json array string,
+a comma separated string or a `@path` to a json array (`.json`)
+or a text file with an item per line (`#` comments are skipped),
+a `@path` of the config file is relative to its directory and may not
+leave it (see `config_include_root`), the env and arguments are trusted,
+the files are streamed and validated by chunks, within the `config_max_*`
+limits of the settings being validated.
+"""
+
+import heapq
+from array import array
+from bisect import bisect_left
+from ipaddress import IPv4Address
+from itertools import groupby, islice
+from pathlib import Path
+from typing import (  # noqa: I101
+    IO,
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Type,
+    TypeVar,
+    Union,
+    overload,
+)
+
+from .dumploads import json_iter_array, json_loads
+from .limits import Guard, LimitError, Limits, current_limits
+
+
+CHUNK_SIZE = 2**16
+
+P = TypeVar('P', bound='PackedSet')
+
+
+class FileRefError(ValueError):
+    pass
+
+
+def confine_file_ref(value: str, base: Path, root: Path) -> str:
+    """
+    :param value: `@path` of a config file
+    :return: `@` and the resolved path under `root`
+    :raise FileRefError: absolute path or path outside of `root`
+    """
+    name = value[1:]
+    if Path(name).expanduser().is_absolute():
+        raise FileRefError(f"File reference must be relative: {value!r}")
+    path = (base / name).resolve()
+    root = root.resolve()
+    if root != path and root not in path.parents:
+        raise FileRefError(f"File reference {value!r} is outside of {root}")
+    return f"@{path}"
+
+
+def _typecode(size: int, signed: bool) -> str:
+    for code in 'bhilq' if signed else 'BHILQ':
+        if array(code).itemsize == size:
+            return code
+    raise TypeError(f"No array typecode for {size} bytes")  # pragma: no cover
+
+
+def iter_file(
+    path: Union[str, Path], limits: Optional[Limits] = None
+) -> Iterator[Any]:
+    """
+    :param limits: `max_bytes` of the file, `max_nodes` items, `max_seconds`
+    """
+    guard = None if limits is None else Guard(limits)
+    path = Path(path).expanduser()
+    if path.suffix == '.json':
+        yield from json_iter_array(path, limits=guard)
+        return
+    with open(path, encoding='utf-8') as f:
+        for line in _read_lines(f, guard):
+            line = line.split('#', 1)[0].strip()
+            if line:
+                if guard is not None:
+                    guard.node()
+                yield line
+
+
+def _read_lines(f: IO[str], guard: Optional[Guard]) -> Iterator[str]:
+    """
+    Lines by chunks, a line without the end is bounded by `max_bytes`
+    """
+    if guard is None:
+        yield from f
+        return
+    parts: List[str] = []
+    while True:
+        part = f.readline(CHUNK_SIZE)
+        if not part:
+            break
+        guard.add_size(len(part.encode('utf-8', 'surrogateescape')))
+        parts.append(part)
+        if part.endswith('\n'):
+            yield ''.join(parts)
+            parts.clear()
+    if parts:
+        yield ''.join(parts)
+
+
+class PackedSet(Sequence[Any]):
+    __slots__ = ('_data',)
+
+    typecode: str = _typecode(8, signed=True)
+
+    def __init__(self, items: Iterable[Any] = ()) -> None:
+        self._data: array = self.pack(items)
+
+    @classmethod
+    def to_int(cls, item: Any) -> int:
+        return int(item)
+
+    @classmethod
+    def from_int(cls, value: int) -> Any:
+        return value
+
+    @classmethod
+    def pack(cls, items: Iterable[Any]) -> array:
+        """
+        Sort by chunks and merge, so only one chunk of python objects
+        is alive at the same time
+        """
+        it = iter(items)
+        chunks: List[array] = []
+        while True:
+            chunk = sorted(map(cls.to_int, islice(it, CHUNK_SIZE)))
+            if not chunk:
+                break
+            try:
+                chunks.append(array(cls.typecode, chunk))
+            except OverflowError as e:
+                raise ValueError(
+                    f"{cls.__name__} item out of range: {e}"
+                ) from e
+        if len(chunks) == 1:
+            return array(cls.typecode, (k for k, _ in groupby(chunks[0])))
+        return array(
+            cls.typecode, (k for k, _ in groupby(heapq.merge(*chunks)))
+        )
+
+    @classmethod
+    def from_file(
+        cls: Type[P], path: Union[str, Path], limits: Optional[Limits] = None
+    ) -> P:
+        return cls(iter_file(path, limits))
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._data) * self._data.itemsize
+
+    def __contains__(self, item: Any) -> bool:
+        try:
+            value = self.to_int(item)
+        except (TypeError, ValueError):
+            return False
+        i = bisect_left(self._data, value)  # type: ignore[arg-type]
+        return i < len(self._data) and self._data[i] == value
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @overload
+    def __getitem__(self, i: int) -> Any:
+        ...  # pragma: no cover
+
+    @overload
+    def __getitem__(self, i: slice) -> List[Any]:
+        ...  # pragma: no cover
+
+    def __getitem__(self, i: Union[int, slice]) -> Any:
+        if isinstance(i, slice):
+            return [self.from_int(v) for v in self._data[i]]
+        return self.from_int(self._data[i])
+
+    def __iter__(self) -> Iterator[Any]:
+        return map(self.from_int, self._data)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, PackedSet):
+            return self._data == other._data
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self._data.tobytes())
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(<{len(self)} items>)"
+
+    def __reduce__(self) -> Any:
+        return _unpickle, (type(self), self._data)
+
+    @classmethod
+    def __get_validators__(cls) -> Generator[Callable[..., Any], None, None]:
+        yield cls.validate
+
+    @classmethod
+    def __modify_schema__(cls, field_schema: Dict[str, Any]) -> None:
+        field_schema.update(type='array', uniqueItems=True)
+
+    @classmethod
+    def validate(cls: Type[P], v: Any) -> P:
+        if isinstance(v, cls):
+            return v
+        if isinstance(v, str):
+            v = v.strip()
+            if v.startswith('@'):
+                try:
+                    return cls.from_file(v[1:], current_limits.get())
+                except OSError as e:
+                    raise ValueError(str(e)) from e
+                except LimitError:
+                    raise
+                except (ValueError, TypeError):
+                    # the file content is not in the error
+                    raise ValueError(
+                        f"{v[1:]!r} is not a valid {cls.__name__} file"
+                    ) from None
+            if v.startswith('['):
+                v = json_loads(v)
+            else:
+                v = (_.strip() for _ in v.split(',') if _.strip())
+        if isinstance(v, (dict, bytes)) or not isinstance(v, Iterable):
+            raise TypeError(f"{cls.__name__} expects a list of items")
+        return cls(v)
+
+    def to_list(self) -> List[Any]:
+        """
+        :return: json compatible items
+        """
+        return list(map(self.json_item, self._data))
+
+    @classmethod
+    def json_item(cls, value: int) -> Any:
+        return value
+
+
+def _unpickle(cls: Type[P], data: array) -> P:
+    obj = cls.__new__(cls)
+    obj._data = data  # pylint: disable=protected-access
+    return obj
+
+
+class PackedIntSet(PackedSet):
+    """
+    Set of signed 64 bit integers
+    """
+
+    __slots__ = ()
+
+
+class PackedIPv4Set(PackedSet):
+    """
+    Set of IPv4 addresses, 4 bytes per address
+    """
+
+    __slots__ = ()
+
+    typecode = _typecode(4, signed=False)
+
+    @classmethod
+    def to_int(cls, item: Any) -> int:
+        return int(IPv4Address(item))
+
+    @classmethod
+    def from_int(cls, value: int) -> IPv4Address:
+        return IPv4Address(value)
+
+    @classmethod
+    def json_item(cls, value: int) -> str:
+        return str(IPv4Address(value))
+
+    @classmethod
+    def __modify_schema__(cls, field_schema: Dict[str, Any]) -> None:
+        super().__modify_schema__(field_schema)
+        field_schema.update(items={'type': 'string', 'format': 'ipv4'})
@@ -1,6 +1,15 @@
 import sys
 from collections.abc import MutableMapping
-from typing import Any, AnyStr, Iterator, Optional
+from typing import (
+    Any,
+    AnyStr,
+    Dict,
+    Iterable,
+    Iterator,
+    Mapping,
+    Optional,
+    Sequence,
+)
 
 
 if sys.version_info[:2] < (3, 9):
@@ -35,3 +44,34 @@ class LowerCaseDict(M):
 
     def __repr__(self) -> str:
         return f"{type(self).__name__}({dict(self.items())})"
+
+
+# section keys tree, `None` is the whole subtree
+SectionTree = Dict[str, Optional['SectionTree']]  # type: ignore[misc]
+
+
+def make_section_tree(paths: Iterable[Sequence[str]]) -> SectionTree:
+    """
+    (('http', 'transport'), ('http', 'port'), ('version',)) ->
+    {'http': {'transport': None, 'port': None}, 'version': None}
+    """
+    tree: SectionTree = {}
+    for path in paths:
+        node = tree
+        *parents, name = path
+        for k in parents:
+            if k in node and node[k] is None:  # the whole subtree is taken
+                break
+            node = node.setdefault(k, {})  # type: ignore[assignment]
+        else:
+            node[name] = None
+    return tree
+
+
+def project(doc: Any, tree: Optional[SectionTree]) -> Any:
+    """
+    Drop everything except of the tree sections
+    """
+    if tree is None or not isinstance(doc, Mapping):
+        return doc
+    return {k: project(doc[k], tree[k]) for k in tree if k in doc}
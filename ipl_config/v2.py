@@ -0,0 +1,438 @@
+"""
+`BaseSettings` on pydantic v2, validated and serialized by pydantic-core.
+
+Same sources, priorities and env names as `ipl_config.BaseSettings`,
+the settings options are `model_config` keys (`SettingsConfigDict`).
+Field `env` and `env_prefix` go to `json_schema_extra`.
+"""
+
+# pylint: disable=no-name-in-module
+
+import json
+import sys
+import weakref
+from collections.abc import Collection
+from dataclasses import is_dataclass
+from os import PathLike
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
+from warnings import warn
+
+
+try:
+    from pydantic import BaseModel, ConfigDict  # type: ignore[attr-defined]
+    from pydantic.fields import FieldInfo  # type: ignore[attr-defined]
+except ImportError as e:  # pragma: no cover
+    raise ImportError('ipl_config.v2 requires pydantic v2') from e
+
+from pydantic.v1.typing import get_args, get_origin, is_union
+from pydantic.v1.utils import deep_update, lenient_issubclass
+
+from . import shm
+from .dumploads import (
+    BytesLike,
+    StrPathIO,
+    ensure_stream,
+    json_dumps,
+    toml_dump,
+    yaml_dump,
+)
+from .fingerprint import Diff, fingerprint, tree_diff
+from .profiler import span
+from .settings import class_cached, flatten_env
+from .source import (  # noqa: I101
+    KIND_COMPLEX,
+    KIND_MODEL,
+    KIND_SCALAR,
+    KIND_UNION_COMPLEX,
+    DotEnvSettingsStrategy,
+    EnvSettingsStrategy,
+    KwSettingsStrategy,
+    SettingsStrategy,
+    get_file_strategy,
+)
+
+
+class SettingsConfigDict(ConfigDict, total=False):  # type: ignore
+    env_prefix: Optional[str]
+    env_file: Union[str, PathLike, None]
+    env_file_encoding: Optional[str]
+    env_file_parser: Optional[str]
+    config_cache_dir: Union[str, PathLike, None]
+    config_cache_size: int
+    config_include_key: Optional[str]
+    config_include_root: Union[str, PathLike, None]
+    config_interpolate: bool
+    config_max_bytes: Optional[int]
+    config_max_depth: Optional[int]
+    config_max_nodes: Optional[int]
+    config_max_aliases: Optional[int]
+    config_max_seconds: Optional[float]
+    case_sensitive: bool
+    env_json_loads: Callable[[str], Any]
+
+
+NoneType = type(None)
+SettingsT = TypeVar('SettingsT', bound='BaseSettings')
+
+_field_kinds: 'weakref.WeakKeyDictionary[type, Dict[str, int]]' = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _field_extra(info: FieldInfo) -> Dict[str, Any]:
+    extra = info.json_schema_extra
+    return extra if isinstance(extra, dict) else {}
+
+
+def _classify_annotation(tp: Any) -> int:
+    origin = get_origin(tp)
+    if is_union(origin):
+        args = [a for a in get_args(tp) if a is not NoneType]
+        if len(args) == 1:  # Optional
+            return _classify_annotation(args[0])
+        # as v1, only the leading complex branch wants a json value
+        if args and _classify_annotation(args[0]) != KIND_SCALAR:
+            return KIND_UNION_COMPLEX
+        return KIND_SCALAR
+    if lenient_issubclass(tp, BaseModel):
+        return KIND_MODEL
+    if lenient_issubclass(tp, (list, set, frozenset, tuple, dict)):
+        return KIND_COMPLEX
+    if lenient_issubclass(origin, Collection) or is_dataclass(tp):
+        return KIND_COMPLEX
+    return KIND_SCALAR
+
+
+def _model_type(tp: Any) -> Type[BaseModel]:
+    """
+    :return: the model of `KIND_MODEL` field, `Optional` is unwrapped
+    """
+    if is_union(get_origin(tp)):
+        return next(a for a in get_args(tp) if a is not NoneType)
+    return tp  # type: ignore[no-any-return]
+
+
+def get_field_kind(clz: Type[BaseModel], name: str, info: FieldInfo) -> int:
+    """
+    Classify the field once per model class
+    """
+    kinds = _field_kinds.get(clz)
+    if kinds is None:
+        kinds = _field_kinds[clz] = {}
+    kind = kinds.get(name)
+    if kind is None:
+        kind = kinds[name] = _classify_annotation(info.annotation)
+    return kind
+
+
+def get_env_name(
+    name: str,
+    info: FieldInfo,
+    prefix: Optional[str] = None,
+    case_sensitive: Optional[bool] = False,
+) -> str:
+    extra = _field_extra(info)
+    env_prefix = extra.get('env_prefix') or prefix or ''
+    env_name = extra.get('env')
+    if not env_name:
+        env_name = env_prefix + (env_prefix and '_' or '') + name
+    if not case_sensitive:
+        env_name = env_name.lower()
+    return env_name  # type: ignore[no-any-return]
+
+
+def get_env_manifest(
+    clz: Type[BaseModel],
+    prefix: Optional[str] = None,
+    case_sensitive: Optional[bool] = False,
+) -> Tuple[str, ...]:
+    res: Tuple[str, ...] = ()
+    for name, info in clz.model_fields.items():
+        env_name = get_env_name(name, info, prefix, case_sensitive)
+        if get_field_kind(clz, name, info) == KIND_MODEL:
+            res += get_env_manifest(
+                _model_type(info.annotation), env_name, case_sensitive
+            )
+        else:
+            res += (env_name,)
+    return res
+
+
+# pylint: disable=too-few-public-methods
+class EnvSettingsStrategyV2(EnvSettingsStrategy):
+    """
+    `EnvSettingsStrategy` over pydantic v2 `model_fields`
+    """
+
+    __slots__ = ()
+
+    def __call__(  # type: ignore[override]
+        self, clz: Any, prefix: Optional[str] = None
+    ) -> Dict[str, Any]:
+        if not isinstance(clz, type):
+            clz = type(clz)
+        if prefix is None:
+            prefix = self.env_prefix
+
+        res: Dict[str, Any] = {}
+        for name, info in clz.model_fields.items():
+            with span('field', name):
+                env_val = self._get_field_val(clz, name, info, prefix)
+            if env_val is not None:
+                res[info.alias or name] = env_val
+        return res
+
+    def _get_field_val(
+        self,
+        clz: Type[BaseModel],
+        name: str,
+        info: FieldInfo,
+        prefix: Optional[str],
+    ) -> Any:
+        if getattr(info, 'deprecated', None) or _field_extra(info).get(
+            'deprecated'
+        ):
+            warn(f"{name!r} is deprecated", DeprecationWarning)
+        if info.alias and info.alias != name:
+            warn('Instead of aliases use the `env` setting', FutureWarning)
+
+        with span('env_lookup'):
+            env_name = get_env_name(name, info, prefix, self.case_sensitive)
+            env_val: Any = self.env_vars.get(env_name)
+            kind = get_field_kind(clz, name, info)
+
+        if kind == KIND_MODEL:
+            return self(_model_type(info.annotation), prefix=env_name)
+        if env_val is not None and kind == KIND_COMPLEX:
+            env_val = self._json_decode(clz, env_val)  # type: ignore
+            if isinstance(env_val, ValueError):
+                raise env_val
+        elif env_val is not None and kind == KIND_UNION_COMPLEX:
+            decoded = self._json_decode(clz, env_val)  # type: ignore
+            if not isinstance(decoded, ValueError):
+                env_val = decoded
+        return env_val
+
+    @staticmethod
+    def get_json_loads(clz: Any) -> Callable[[str], Any]:
+        return clz.model_config.get(  # type: ignore[no-any-return]
+            'env_json_loads', json.loads
+        )
+
+
+# pylint: disable=too-few-public-methods
+class DotEnvSettingsStrategyV2(EnvSettingsStrategyV2, DotEnvSettingsStrategy):
+    __slots__ = ()
+
+
+def settings_config(config: Mapping[str, Any]) -> type:
+    """
+    :return: `model_config` as the v1 `Config` class for the file strategies
+    """
+    return type('Config', (), dict(config))
+
+
+class BaseSettings(BaseModel):  # type: ignore[misc]
+    model_config = SettingsConfigDict(
+        env_prefix='APP',
+        env_file='.env',
+        env_file_encoding=None,
+        env_file_parser=None,  # or `dotenv`
+        config_cache_dir=None,
+        config_cache_size=64 * 2**20,
+        config_include_key=None,
+        config_include_root=None,
+        config_interpolate=False,
+        case_sensitive=False,
+        env_json_loads=json.loads,
+        coerce_numbers_to_str=True,  # as v1
+        validate_default=True,
+        extra='ignore',
+        arbitrary_types_allowed=True,
+    )
+
+    __config__: ClassVar[type]
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        env_prefix: Optional[str] = None,
+        env_file: Union[str, PathLike, None] = None,
+        config_file: Union[str, PathLike, BytesLike, None] = None,
+        config_format: Optional[str] = None,
+        source_strategies: Optional[Sequence[SettingsStrategy]] = None,
+        **kw: Any,
+    ) -> None:
+        with span('settings', type(self).__name__):
+            if source_strategies is None:
+                with span('strategies'):
+                    source_strategies = self.get_source_strategies(
+                        env_prefix=env_prefix,
+                        env_file=env_file,
+                        config_file=config_file,
+                        config_format=config_format,
+                        **kw,
+                    )
+
+            values = self.read_sources(source_strategies, type(self))
+            with span('validate'):
+                super().__init__(**values)
+
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kw: Any) -> None:
+        super().__pydantic_init_subclass__(**kw)
+        cls.__config__ = settings_config(cls.model_config)
+
+    @classmethod
+    def get_source_strategies(  # pylint: disable=too-many-arguments
+        cls,
+        env_prefix: Optional[str] = None,
+        env_file: Union[str, PathLike, None] = None,
+        config_file: Union[str, PathLike, BytesLike, None] = None,
+        config_format: Optional[str] = None,
+        **kw: Any,
+    ) -> List[SettingsStrategy]:
+        cfg = cls.model_config
+        if env_prefix is None:
+            env_prefix = cfg['env_prefix']
+
+        source_strategies: List[SettingsStrategy] = [
+            KwSettingsStrategy(**kw),
+            EnvSettingsStrategyV2(
+                env_prefix=env_prefix, case_sensitive=cfg['case_sensitive']
+            ),
+            DotEnvSettingsStrategyV2(
+                env_prefix=env_prefix,
+                env_file=env_file or cfg['env_file'],
+                env_file_encoding=cfg['env_file_encoding'],
+                env_file_parser=cfg['env_file_parser'],
+                env_keys=frozenset(
+                    get_env_manifest(cls, env_prefix, cfg['case_sensitive'])
+                ),
+                case_sensitive=cfg['case_sensitive'],
+            ),
+        ]
+        if config_file is not None:
+            source_strategies.append(
+                get_file_strategy(config_file, config_format)
+            )
+
+        return source_strategies
+
+    @staticmethod
+    def read_sources(
+        source_strategies: Sequence[SettingsStrategy],
+        clazz: Type['BaseSettings'],
+    ) -> Dict[str, Any]:
+        """
+        Merge the sources, the first strategy has the highest priority
+        """
+        values = []
+        for s in source_strategies:
+            with span('source', type(s).__name__):
+                values.append(s(clazz))  # type: ignore[arg-type]
+        with span('merge'):
+            return deep_update(*reversed(values))
+
+    @classmethod
+    def env_manifest(cls, env_prefix: Optional[str] = None) -> Tuple[str, ...]:
+        cfg = cls.model_config
+        if env_prefix is None:
+            env_prefix = cfg['env_prefix']
+        return get_env_manifest(cls, env_prefix, cfg['case_sensitive'])
+
+    def write_json(self, f: StrPathIO = sys.stdout, **kw: Any) -> None:
+        """
+        Serialized by pydantic-core, `kw` are `model_dump_json` options
+        """
+        text = self.model_dump_json(**kw)
+        with ensure_stream(f, write=True) as s:
+            s.write(text)  # type: ignore[arg-type]
+
+    def write_toml(self, f: StrPathIO = sys.stdout, **kw: Any) -> None:
+        return toml_dump(self.safe_dict(), f, **kw)
+
+    def write_yaml(self, f: StrPathIO = sys.stdout, **kw: Any) -> None:
+        return yaml_dump(self.safe_dict(), f, **kw)
+
+    def safe_dict(self, **kw: Any) -> Dict[str, Any]:
+        """
+        Dump of json compatible values, `kw` are `model_dump` options
+        """
+        return self.model_dump(mode='json', **kw)  # type: ignore
+
+    def to_env(self, **kw: Any) -> Dict[str, str]:
+        prefix = self.model_config['env_prefix']
+        if not prefix:
+            return flatten_env(self.model_dump(**kw))
+        return flatten_env(self.model_dump(**kw), prefix)
+
+    @classmethod
+    def schema_text(cls, by_alias: bool = True, **kw: Any) -> str:
+        """
+        Serialized json schema, cached per class and dump options
+        """
+        key = 'schema_text', by_alias, tuple(sorted(kw.items()))
+        return class_cached(  # type: ignore[no-any-return]
+            cls,
+            key,
+            lambda: json_dumps(cls.model_json_schema(by_alias=by_alias), **kw),
+        )
+
+    @classmethod
+    def schema_bytes(cls, by_alias: bool = True, **kw: Any) -> bytes:
+        key = 'schema_bytes', by_alias, tuple(sorted(kw.items()))
+        return class_cached(  # type: ignore[no-any-return]
+            cls, key, lambda: cls.schema_text(by_alias, **kw).encode()
+        )
+
+    @classmethod
+    def write_schema(cls, f: StrPathIO = sys.stdout, **kw: Any) -> None:
+        text = cls.schema_text(**kw)
+        with ensure_stream(f, write=True) as s:
+            s.write(text)  # type: ignore[arg-type]
+
+    def fingerprint(self) -> str:
+        """
+        Stable content hash of the dumped settings tree
+        """
+        return fingerprint(self.model_dump())
+
+    def diff(self, other: 'BaseSettings') -> Diff:
+        """
+        :return: changed dotted paths with (self value, other value)
+        """
+        return tree_diff(self.model_dump(), other.model_dump())
+
+    def publish(self, name: str) -> int:
+        """
+        Share the settings with other processes via shared memory
+        :return: published version
+        """
+        return shm.publish(self, name)
+
+    @classmethod
+    def attach(cls: Type[SettingsT], name: str) -> SettingsT:
+        """
+        Take the settings published by `publish(name)` without reloading
+        """
+        shared = shm.AttachedSettings(name, cls)
+        try:
+            return shared.get()
+        finally:
+            shared.close()
+
+
+BaseSettings.__config__ = settings_config(BaseSettings.model_config)
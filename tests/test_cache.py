@@ -0,0 +1,100 @@
+import os
+import sys
+import types
+from pathlib import Path
+from typing import Any, List
+from unittest import mock
+
+import pytest
+from pydantic.v1 import BaseModel  # pylint: disable=no-name-in-module
+
+from ipl_config import BaseSettings
+from ipl_config.cache import ParseCache
+from ipl_config.dumploads import yaml_load
+from ipl_config.source import module_version
+
+
+class Transport(BaseModel):  # pylint: disable=too-few-public-methods
+    timeout: float
+
+
+class Http(BaseModel):  # pylint: disable=too-few-public-methods
+    port: int
+    transport: Transport
+
+
+def test_parse_cache(root_dir: Path, tmp_path: Path) -> None:
+    calls: List[Any] = []
+
+    def loader(f: Any, **_: Any) -> Any:
+        calls.append(f)
+        return yaml_load(f)
+
+    cache = ParseCache(tmp_path / 'cache')
+    src = root_dir / 'examples/config_example.yaml'
+
+    expected = yaml_load(src)
+    assert cache.load(src, loader, '1') == expected
+    assert cache.load(src, loader, '1') == expected
+    assert len(calls) == 1
+
+    assert cache.load(src, loader, '2') == expected
+    assert len(calls) == 2
+    assert len(list((tmp_path / 'cache').iterdir())) == 2
+
+    with mock.patch('os.utime', side_effect=PermissionError):
+        assert cache.load(src, loader, '1') == expected
+    assert len(calls) == 2
+
+    cache.max_size = 0
+    cache.evict()
+    assert not list((tmp_path / 'cache').iterdir())
+
+
+@pytest.mark.skipif(not hasattr(os, 'getuid'), reason='posix permissions')
+def test_parse_cache_private(root_dir: Path, tmp_path: Path) -> None:
+    calls: List[Any] = []
+
+    def loader(f: Any, **_: Any) -> Any:
+        calls.append(f)
+        return yaml_load(f)
+
+    cache = ParseCache(tmp_path / 'cache')
+    src = root_dir / 'examples/config_example.yaml'
+    cache.load(src, loader)
+    assert (tmp_path / 'cache').stat().st_mode & 0o777 == 0o700
+
+    (entry,) = (tmp_path / 'cache').iterdir()
+    entry.chmod(0o666)
+    cache.load(src, loader)
+    assert len(calls) == 2  # not trusted, parsed and replaced
+    cache.load(src, loader)
+    assert len(calls) == 2
+
+    (tmp_path / 'cache').chmod(0o777)
+    with pytest.warns(UserWarning, match='is not private'):
+        cache.load(src, loader)
+    assert len(calls) == 3
+
+
+def test_module_version() -> None:
+    yaml = sys.modules['yaml']
+    with mock.patch.object(yaml, '__version__', None):
+        module_version.cache_clear()
+        assert module_version(yaml)
+    module_version.cache_clear()
+    assert module_version(types.ModuleType('not_installed')) == ''
+
+
+def test_settings_parse_cache(root_dir: Path, tmp_path: Path) -> None:
+    class Config(BaseSettings):
+        class Config:  # pylint: disable=too-few-public-methods
+            env_file = None
+            config_cache_dir = tmp_path
+
+        http: Http
+
+    for _ in range(2):
+        cfg = Config(config_file=root_dir / 'examples/config_example.tf')
+        assert cfg.http.transport.timeout == 60
+    assert len(list(tmp_path.iterdir())) == 1
@@ -0,0 +1,94 @@
+import json
+from pathlib import Path
+from unittest import mock
+
+import pytest
+from pydantic.v1 import BaseModel  # pylint: disable=no-name-in-module
+
+from ipl_config import BaseSettings
+from ipl_config.cli import main, validate_file
+from ipl_config.dumploads import yaml_load
+
+
+class Transport(BaseModel):  # pylint: disable=too-few-public-methods
+    timeout: float
+
+
+class Http(BaseModel):  # pylint: disable=too-few-public-methods
+    port: int
+    transport: Transport
+
+
+class Config(BaseSettings):
+    class Config:  # pylint: disable=too-few-public-methods
+        env_file = None
+
+    http: Http
+
+
+def test_validate(  # type: ignore[no-untyped-def]
+    root_dir: Path, tmp_path: Path, capsys
+) -> None:
+    broken = tmp_path / 'broken.json'
+    broken.write_text('{"http": {"port": "x"}}')
+    files = [
+        str(root_dir / 'examples/config_example.json'),
+        str(root_dir / 'examples/config_example.yaml'),
+        str(broken),
+    ]
+
+    assert main(['validate', 'tests.test_cli:Config', *files, '-j', '1']) == 1
+
+    out, err = capsys.readouterr()
+    assert out.count('OK\t') == 2
+    assert "FAIL\t" in out and str(broken) in out
+    assert 'http -> port' in err
+    assert out.endswith('2 passed, 1 failed\n')
+
+    with pytest.raises(SystemExit):
+        main(['validate', 'tests.test_cli:Config', *files, '-j', '0'])
+
+
+def test_validate_empty_error() -> None:
+    with mock.patch('ipl_config.cli.import_settings', side_effect=KeyError):
+        _, _, err = validate_file('x:Config', 'config.json')
+    assert err == 'KeyError: '
+
+
+def test_convert(  # type: ignore[no-untyped-def]
+    root_dir: Path, tmp_path: Path, capsys
+) -> None:
+    dst = tmp_path / 'config.yaml'
+    src = str(root_dir / 'examples/config_example.json')
+    assert main(['convert', src, str(dst)]) == 0
+
+    with open(root_dir / 'examples/config_example.json') as f:
+        assert yaml_load(dst) == json.load(f)
+
+    capsys.readouterr()
+    assert main(['convert', str(dst), str(tmp_path / 'config.tf')]) == 1
+    _, err = capsys.readouterr()
+    assert err.startswith('NotImplementedError: No writers found')
+
+    assert main(['convert', str(tmp_path / 'x.json'), str(dst)]) == 1
+    _, err = capsys.readouterr()
+    assert err.startswith('FileNotFoundError: ')
+
+
+def test_dump(root_dir: Path, capsys) -> None:  # type: ignore[no-untyped-def]
+    config_file = str(root_dir / 'examples/config_example.toml')
+
+    main(['dump', 'tests.test_cli.Config', '-c', config_file, '-f', 'env'])
+    out, _ = capsys.readouterr()
+    assert out == 'APP_HTTP_PORT=10001\nAPP_HTTP_TRANSPORT_TIMEOUT=60.0\n'
+
+    main(['dump', 'tests.test_cli:Config', '-c', config_file])
+    out, _ = capsys.readouterr()
+    assert json.loads(out) == {
+        'http': {'port': 10001, 'transport': {'timeout': 60.0}}
+    }
+
+    assert main(['dump', 'tests.test_cli:Config']) == 1
+    out, err = capsys.readouterr()
+    assert not out
+    assert err.startswith('ValidationError: ') and 'http' in err
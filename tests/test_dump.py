@@ -1,8 +1,9 @@
+import io
 import json
 from ipaddress import IPv4Address
 
 import pytest
-from pydantic import BaseModel  # pylint: disable=no-name-in-module
+from pydantic.v1 import BaseModel  # pylint: disable=no-name-in-module
 
 from ipl_config import BaseSettings
 from ipl_config.dumploads import json_dumps, yaml_dumps, yaml_loads
@@ -43,3 +44,23 @@ def test_json_dumps() -> None:
 # TODO: test only the write_yaml
 def test_yaml_dumps() -> None:
     assert yaml_loads(yaml_dumps(cfg.safe_dict())) == expected
+
+
+def test_schema_cached() -> None:
+    text = Config.schema_text()
+    assert json.loads(text) == Config.schema()
+    assert Config.schema_text() is text
+    assert Config.schema_bytes() is Config.schema_bytes()
+    assert (
+        Config.schema_bytes(indent=2) == Config.schema_text(indent=2).encode()
+    )
+
+    f = io.StringIO()
+    cfg.write_schema(f)
+    assert f.getvalue() == text
+
+
+def test_env_manifest() -> None:
+    assert Config.env_manifest() == ('app_http_listen', 'app_port', 'app_host')
+    assert Config.env_manifest('X') == ('x_http_listen', 'x_port', 'x_host')
+    assert Config.env_manifest() is Config.env_manifest()
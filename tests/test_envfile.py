@@ -0,0 +1,102 @@
+import time
+import warnings
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from ipl_config import BaseSettings
+from ipl_config._optional_libs import dotenv
+from ipl_config.envfile import parse_env, read_env
+from ipl_config.source import read_env_file
+
+
+SAMPLE = r"""
+# comment
+export A=1
+B = two words  # comment
+C='single \' quoted # not a comment'
+D="double \"quoted\"\tescape"  # comment
+E="multi
+line"
+'F'=
+G
+H=x#y
+I='a\nb'
+J="${A}"
+"""
+
+
+@pytest.mark.parametrize('use_mmap', (False, True))
+def test_read_env(root_dir: Path, tmp_path: Path, use_mmap: bool) -> None:
+    env = tmp_path / 'sample.env'
+    env.write_text(SAMPLE)
+
+    actual = read_env(env, use_mmap=use_mmap)
+    assert actual == {
+        'A': '1',
+        'B': 'two words',
+        'C': "single ' quoted # not a comment",
+        'D': 'double "quoted"\tescape',
+        'E': 'multi\nline',
+        'F': '',
+        'G': None,
+        'H': 'x#y',
+        'I': 'a\\nb',
+        'J': '${A}',
+    }
+    if not isinstance(dotenv, Exception):
+        assert actual == dotenv.dotenv_values(env, interpolate=False)
+
+    key = read_env(root_dir / 'tests/.env', use_mmap=use_mmap)[
+        'APP_PRIVATE_KEY'
+    ]
+    assert key is not None
+    assert key.count('\n') == 4
+    assert key.endswith('-----END PRIVATE KEY-----')
+
+
+def test_read_env_keys(tmp_path: Path) -> None:
+    env = tmp_path / 'sample.env'
+    env.write_text(SAMPLE)
+
+    assert read_env(env, keys={'a', 'e'}, case_sensitive=False) == {
+        'A': '1',
+        'E': 'multi\nline',
+    }
+    assert not read_env(env, keys={'a'})
+
+
+def test_read_env_broken(tmp_path: Path) -> None:
+    env = tmp_path / 'broken.env'
+    env.write_text('A="unterminated\nB=1\nC=\'x\'\n')
+
+    with pytest.warns(UserWarning, match='Could not parse .env line 1'):
+        assert read_env(env) == {'B': '1', 'C': 'x'}
+    if not isinstance(dotenv, Exception):
+        assert read_env(env) == dotenv.dotenv_values(env, interpolate=False)
+
+
+def test_parse_env_unterminated_linear() -> None:
+    lines = ['A="x\n'] * 10**5 + ['B=1\n']
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        started = time.perf_counter()
+        assert dict(parse_env(lines)) == {'B': '1'}
+    assert time.perf_counter() - started < 5
+
+
+def test_read_env_keys_set(tmp_path: Path) -> None:
+    class Config(BaseSettings):
+        port: int = 0
+
+    path = tmp_path / '.env'
+    path.write_text('APP_PORT=1\nOTHER=2\n')
+    with mock.patch(
+        'ipl_config.source.read_env_file', wraps=read_env_file
+    ) as read:
+        assert Config(env_file=path).port == 1
+    assert isinstance(read.call_args.kwargs['keys'], frozenset)
+    assert read_env(path, keys=('app_port',), case_sensitive=False) == {
+        'APP_PORT': '1'
+    }
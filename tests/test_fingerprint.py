@@ -0,0 +1,113 @@
+from pathlib import Path
+from typing import Dict, List
+from unittest import mock
+
+import pytest
+from pydantic.v1 import BaseModel  # pylint: disable=no-name-in-module
+
+from ipl_config import BaseSettings
+from ipl_config.fingerprint import MISSING, fingerprint
+from ipl_config.types import PackedIntSet
+
+
+class Transport(BaseModel):  # pylint: disable=too-few-public-methods
+    class Config:  # pylint: disable=too-few-public-methods
+        frozen = True
+
+    timeout: float
+    hosts: List[str] = []
+
+
+class Http(BaseModel):  # pylint: disable=too-few-public-methods
+    port: int
+    transport: Transport
+    meta: Dict[str, int] = {}
+
+
+class Config(BaseSettings):
+    class Config:  # pylint: disable=too-few-public-methods
+        env_file = None
+
+    version: str
+    http: Http
+
+
+def make(**http: object) -> Config:
+    kw = {'port': 80, 'transport': {'timeout': 1, 'hosts': ['a', 'b']}}
+    kw.update(http)
+    return Config(version='v1', http=kw)
+
+
+def test_fingerprint() -> None:
+    assert make().fingerprint() == make().fingerprint()
+    assert make().fingerprint() != make(port=81).fingerprint()
+    assert fingerprint({'a': 1, 'b': 2}) == fingerprint({'b': 2, 'a': 1})
+    assert fingerprint([1, 2]) != fingerprint([2, 1])
+    assert fingerprint(1) != fingerprint(1.0)
+
+
+def test_diff() -> None:
+    a = make(meta={'x': 1})
+    assert not a.diff(make(meta={'x': 1}))
+
+    b = make(
+        port=81, meta={'y': 1}, transport={'timeout': 1, 'hosts': ['a', 'c']}
+    )
+    assert a.diff(b) == {
+        'http.port': (80, 81),
+        'http.transport.hosts.1': ('b', 'c'),
+        'http.meta.x': (1, MISSING),
+        'http.meta.y': (MISSING, 1),
+    }
+
+    c = make(transport={'timeout': 1, 'hosts': ['a']})
+    assert a.diff(c)['http.transport.hosts'] == (['a', 'b'], ['a'])
+
+
+def test_fingerprint_fallback() -> None:
+    class Packed(BaseModel):  # pylint: disable=too-few-public-methods
+        ids: PackedIntSet
+
+    assert fingerprint(Packed(ids=[1, 2])) == fingerprint(Packed(ids=[2, 1]))
+    assert fingerprint(Packed(ids=[1, 2])) != fingerprint(Packed(ids=[1]))
+    with pytest.raises(TypeError):
+        fingerprint(object())
+
+
+def test_fingerprint_mutation() -> None:
+    transport = Transport(timeout=1, hosts=['a'])
+    digest = fingerprint(transport)
+    transport.hosts.append('b')  # frozen model, mutable list
+    assert fingerprint(transport) != digest
+
+
+def test_fingerprint_memoized(tmp_path: Path) -> None:
+    config = tmp_path / 'config.json'
+    config.write_text(
+        '{"version": "v1", "http": {"port": 80, "transport": {"timeout": 1}}}'
+    )
+    cfg = Config.memoized(config_file=config)
+    digest = cfg.fingerprint()
+    assert digest == Config(config_file=config).fingerprint()
+    with mock.patch('ipl_config.fingerprint.blake2b') as blake2b:
+        assert cfg.fingerprint() == digest
+    blake2b.assert_not_called()
+
+
+def test_diff_memoized(tmp_path: Path) -> None:
+    config = tmp_path / 'config.json'
+    config.write_text(
+        '{"version": "v1", "http": {"port": 80,'
+        ' "transport": {"timeout": 1, "hosts": ["a", "b"]}}}'
+    )
+    cfg = Config.memoized(config_file=config)
+    fresh = make(port=81, transport={'timeout': 1, 'hosts': ['a', 'c']})
+
+    assert cfg.diff(fresh) == {
+        'http.port': (80, 81),
+        'http.transport.hosts.1': ('b', 'c'),
+    }
+    assert fresh.diff(cfg) == {
+        'http.port': (81, 80),
+        'http.transport.hosts.1': ('c', 'b'),
+    }
@@ -0,0 +1,58 @@
+import asyncio
+
+from ipl_config import BaseSettings, SettingsHolder
+
+
+class Config(BaseSettings):
+    class Config:  # pylint: disable=too-few-public-methods
+        env_file = None
+        frozen = True
+
+    version: int = 0
+
+
+def test_publish_and_pin() -> None:
+    holder = SettingsHolder(Config())
+    assert holder.version == 0
+
+    with holder.pin() as pinned:
+        assert holder.publish(Config(version=1)) == 1
+        assert pinned.version == 0
+        assert holder.settings is pinned
+    assert holder.settings.version == 1
+
+    assert holder.update(lambda s: s.copy(update={'version': 2})) == 2
+    assert holder.snapshot() == (2, holder.settings)
+
+
+async def test_changed() -> None:
+    holder = SettingsHolder(Config())
+
+    waiter = asyncio.ensure_future(holder.changed())
+    await asyncio.sleep(0)
+    assert not waiter.done()
+
+    version = await holder.reload(lambda: Config(version=1))
+    snapshot = await asyncio.wait_for(waiter, 1)
+    assert snapshot.version == version == 1
+    assert snapshot.settings.version == 1
+
+    assert (await holder.changed(0)).version == 1
+
+
+def test_publish_closed_loop() -> None:
+    holder = SettingsHolder(Config())
+    loop = asyncio.new_event_loop()
+    waiter = loop.create_task(holder.changed())
+    loop.run_until_complete(asyncio.sleep(0))
+    waiter.cancel()
+    loop.run_until_complete(asyncio.gather(waiter, return_exceptions=True))
+    loop.close()
+
+    ready = asyncio.new_event_loop()
+    other = ready.create_task(holder.changed())
+    ready.run_until_complete(asyncio.sleep(0))
+
+    assert holder.publish(Config(version=1)) == 1
+    assert ready.run_until_complete(other).version == 1
+    ready.close()
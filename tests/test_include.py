@@ -0,0 +1,169 @@
+import json
+from pathlib import Path
+from typing import Any, List
+
+import pytest
+from pydantic.v1 import BaseModel  # pylint: disable=no-name-in-module
+from yaml.constructor import ConstructorError  # type: ignore[import]
+
+from ipl_config import BaseSettings
+from ipl_config.dumploads import json_load, yaml_load
+from ipl_config.include import IncludeError, IncludeResolver
+from ipl_config.source import YamlSettingsStrategy
+
+
+class Tls(BaseModel):  # pylint: disable=too-few-public-methods
+    cert: str
+    verify: bool = True
+
+
+class Upstream(BaseModel):  # pylint: disable=too-few-public-methods
+    tls: Tls
+    hosts: List[str]
+
+
+class Settings(BaseSettings):
+    class Config:  # pylint: disable=too-few-public-methods
+        env_file = None
+        config_include_key = 'include'
+
+    upstream: Upstream
+    backup: Upstream
+
+
+def test_include(tmp_path: Path) -> None:
+    (tmp_path / 'common').mkdir()
+    (tmp_path / 'common/tls.json').write_text('{"cert": "a.pem"}')
+    (tmp_path / 'common/upstream.toml').write_text(
+        'include = "tls.toml"\nhosts = ["a", "b"]\n'
+    )
+    (tmp_path / 'common/tls.toml').write_text('verify = false\n')
+    (tmp_path / 'config.yaml').write_text(
+        'upstream:\n'
+        '  include: common/upstream.toml\n'
+        '  tls: !include common/tls.json\n'
+        'backup:\n'
+        '  include: [common/upstream.toml]\n'
+        '  tls: !include common/tls.json\n'
+        '  hosts: [c]\n'
+    )
+
+    strategy = YamlSettingsStrategy(tmp_path / 'config.yaml')
+    cfg = Settings(source_strategies=[strategy])
+
+    assert cfg.upstream.hosts == ['a', 'b']
+    assert cfg.upstream.tls.cert == 'a.pem'
+    assert cfg.upstream.tls.verify
+    assert cfg.backup.hosts == ['c']
+
+    common = tmp_path.resolve() / 'common'
+    config = tmp_path.resolve() / 'config.yaml'
+    assert strategy.includes == {
+        common / 'tls.json': (),
+        common / 'tls.toml': (),
+        common / 'upstream.toml': (common / 'tls.toml',),
+        config: (common / 'tls.json', common / 'upstream.toml'),
+    }
+
+
+def test_include_parse_once(tmp_path: Path) -> None:
+    (tmp_path / 'a.json').write_text('{"include": ["b.json", "b.json"]}')
+    (tmp_path / 'b.json').write_text('{"x": 1}')
+    (tmp_path / 'c.yaml').write_text('a: !include a.json\nb: !include b.json')
+
+    parsed: List[Path] = []
+
+    def parse(path: Path) -> Any:
+        parsed.append(path)
+        if path.suffix == '.json':
+            return json_load(path)
+        return yaml_load(path, includes=True)
+
+    resolver = IncludeResolver(parse)
+    assert resolver.load(tmp_path / 'c.yaml') == {'a': {'x': 1}, 'b': {'x': 1}}
+    assert sorted(p.name for p in parsed) == ['a.json', 'b.json', 'c.yaml']
+    assert resolver.affected(tmp_path / 'b.json') == {
+        (tmp_path / name).resolve() for name in ('a.json', 'b.json', 'c.yaml')
+    }
+
+
+def test_include_cycle(tmp_path: Path) -> None:
+    (tmp_path / 'a.json').write_text('{"include": "b.json"}')
+    (tmp_path / 'b.json').write_text('{"include": "a.json"}')
+
+    with pytest.raises(IncludeError, match='Include cycle'):
+        IncludeResolver(json_load).load(tmp_path / 'a.json')
+
+
+def test_include_off(tmp_path: Path) -> None:
+    class Globs(BaseSettings):  # pylint: disable=too-few-public-methods
+        class Config:  # pylint: disable=too-few-public-methods
+            env_file = None
+
+        include: List[str]
+
+    config = tmp_path / 'config.json'
+    config.write_text('{"include": ["*.py"]}')
+    assert Globs(config_file=config).include == ['*.py']
+    with pytest.raises(ConstructorError, match='!include'):
+        yaml_load(b'a: !include b.yaml')
+
+
+@pytest.mark.parametrize(
+    argnames=('include', 'match'),
+    argvalues=(
+        ('/etc/hostname', 'must be relative'),
+        ('~/x.json', 'must be relative'),
+        ('../x.json', 'outside of'),
+        ('sub/../../x.json', 'outside of'),
+        ('text.yaml', 'not a mapping'),
+        ([1], 'must be a string'),
+    ),
+)
+def test_include_rejected(tmp_path: Path, include: Any, match: str) -> None:
+    (tmp_path / 'sub').mkdir()
+    (tmp_path / 'sub/text.yaml').write_text('text')
+    (tmp_path / 'x.json').write_text('{}')
+    config = tmp_path / 'sub/config.json'
+    config.write_text(json.dumps({'upstream': {'include': include}}))
+
+    with pytest.raises(IncludeError, match=match):
+        Settings(config_file=config)
+
+
+def test_include_root(tmp_path: Path) -> None:
+    class Shared(Settings):  # pylint: disable=too-few-public-methods
+        class Config:  # pylint: disable=too-few-public-methods
+            config_include_root = '..'
+
+    (tmp_path / 'common').mkdir()
+    (tmp_path / 'common/upstream.json').write_text(
+        '{"tls": {"cert": "a.pem"}, "hosts": ["a"]}'
+    )
+    (tmp_path / 'app').mkdir()
+    config = tmp_path / 'app/config.json'
+    config.write_text(
+        json.dumps(
+            {
+                'upstream': {'include': '../common/upstream.json'},
+                'backup': {'include': '../../upstream.json'},
+            }
+        )
+    )
+
+    with pytest.raises(IncludeError, match='outside of'):
+        Settings(config_file=config)
+    with pytest.raises(IncludeError, match=f"outside of {tmp_path}"):
+        Shared(config_file=config)
+
+    config.write_text(
+        json.dumps(
+            {
+                'upstream': {'include': '../common/upstream.json'},
+                'backup': {'include': '../common/upstream.json'},
+            }
+        )
+    )
+    cfg = Shared(config_file=config)
+    assert cfg.upstream == cfg.backup
+    assert cfg.upstream.tls.cert == 'a.pem'
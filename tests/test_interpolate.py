@@ -0,0 +1,107 @@
+import os
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from ipl_config import BaseSettings
+from ipl_config.interpolate import (
+    InterpolationError,
+    compile_template,
+    interpolate,
+)
+
+
+def test_interpolate() -> None:
+    doc = {
+        'host': '${HOST:-localhost}',
+        'url': 'http://${http.bind}/${PATH_PREFIX:-}',
+        'http': {
+            'bind': '${HOST:-localhost}:${http.port}',
+            'port': 8080,
+            'hosts': '${upstream.hosts}',
+        },
+        'upstream': {'hosts': ['a', '${http.port}x']},
+        'first': '${http.hosts.0}',
+        'literal': 'pa$$word $${HOST}',
+    }
+    env = {'HOST': 'example.com', 'PATH_PREFIX': 'api'}
+    expected = {
+        'host': 'example.com',
+        'url': 'http://example.com:8080/api',
+        'http': {
+            'bind': 'example.com:8080',
+            'port': 8080,
+            'hosts': ['a', '8080x'],
+        },
+        'upstream': {'hosts': ['a', '8080x']},
+        'first': 'a',
+        'literal': 'pa$$word ${HOST}',
+    }
+    assert interpolate(doc, env) == expected
+    assert interpolate(doc, {})['host'] == 'localhost'
+    assert interpolate(doc, {})['url'] == 'http://localhost:8080/'
+
+
+def test_compile_once() -> None:
+    assert compile_template('${a.b}') is compile_template('${a.b}')
+
+
+def test_interpolate_errors() -> None:
+    with pytest.raises(InterpolationError, match='cycle: a.x -> b.x -> a.x'):
+        interpolate({'a': {'x': '${b.x}'}, 'b': {'x': '${a.x}'}}, {})
+    with pytest.raises(InterpolationError, match='No such config key: a.y'):
+        interpolate({'a': {'x': '${a.y}'}}, {})
+    with pytest.raises(InterpolationError, match='X_HOST is not set'):
+        interpolate({'a': 'http://${X_HOST}'}, {})
+
+
+def test_interpolate_not_str_keys() -> None:
+    doc = {
+        7: '${X_HOST}',
+        True: {2: 'x', '2': 'y'},
+        'ports': {80: 'http', 443: '${ports.80}s'},
+        'first': '${ports.443}',
+        'exact': '${True.2}',
+    }
+    assert interpolate(doc, {'X_HOST': 'example.com'}) == {
+        7: 'example.com',
+        True: {2: 'x', '2': 'y'},
+        'ports': {80: 'http', 443: 'https'},
+        'first': 'https',
+        'exact': 'y',
+    }
+
+
+def test_interpolate_nothing() -> None:
+    doc = {'a': ['pa$$word', {'b': 1}]}
+    assert interpolate(doc, {}) is doc
+
+
+def test_settings_interpolate(tmp_path: Path) -> None:
+    class Config(BaseSettings):
+        class Config:  # pylint: disable=too-few-public-methods
+            env_file = None
+            config_interpolate = True
+
+        url: str
+        port: int
+
+    config_file = tmp_path / 'config.json'
+    config_file.write_text(
+        '{"url": "http://${X_HOST}:${a.port}", "a": {"port": 1},'
+        ' "port": "${a.port}"}'
+    )
+
+    with mock.patch.dict(os.environ, {'X_HOST': 'example.com'}):
+        cfg = Config(config_file=config_file)
+    assert cfg.url == 'http://example.com:1'
+    assert cfg.port == 1
+
+    class Literal(BaseSettings):  # pylint: disable=too-few-public-methods
+        class Config:  # pylint: disable=too-few-public-methods
+            env_file = None
+
+        url: str
+
+    assert Literal(config_file=config_file).url == 'http://${X_HOST}:${a.port}'
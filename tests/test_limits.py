@@ -0,0 +1,125 @@
+import io
+from pathlib import Path
+from typing import Dict
+from unittest import mock
+
+import pytest
+
+from ipl_config import BaseSettings
+from ipl_config.dumploads import (
+    hcl2_load,
+    json_load,
+    toml_load,
+    yaml_load,
+    yaml_load_sections,
+)
+from ipl_config.limits import LimitError, Limits
+
+
+# 10**4 nodes after the alias expansion
+BOMB = '\n'.join(
+    [
+        'a: &a [x, x, x, x, x, x, x, x, x, x]',
+        *(
+            f"{c}: &{c} [{', '.join([f'*{p}'] * 10)}]"
+            for p, c in zip('abc', 'bcd')
+        ),
+    ]
+).encode()
+
+
+def test_max_bytes(tmp_path: Path) -> None:
+    limits = Limits(max_bytes=8)
+    path = tmp_path / 'config.json'
+    path.write_text('{"key": "value"}')
+
+    assert json_load(b'{"a": 1}', limits=limits) == {'a': 1}
+    with pytest.raises(LimitError, match='larger than 8 bytes'):
+        json_load(path, limits=limits)
+    with pytest.raises(LimitError, match='larger than 8 bytes'):
+        yaml_load(io.StringIO('a: ' + 'x' * 100), limits=limits)
+    with mock.patch('ipl_config.dumploads.MMAP_THRESHOLD', 0):
+        with pytest.raises(LimitError, match='larger than 8 bytes'):
+            toml_load(path, limits=limits)
+    with pytest.raises(LimitError, match='larger than 8 bytes'):
+        hcl2_load(b'key = "value"', limits=limits)
+
+
+def test_max_depth() -> None:
+    limits = Limits(max_depth=3)
+    assert json_load(b'[[[1]]]', limits=limits) == [[[1]]]
+    with pytest.raises(LimitError, match='deeper than 3'):
+        json_load(b'[[[[' * 10**5 + b']]]]' * 10**5, limits=limits)
+    with pytest.raises(LimitError, match='deeper than 3'):
+        yaml_load(b'a: {b: {c: [1]}}', limits=limits)
+    with pytest.raises(LimitError, match='deeper than 3'):
+        toml_load(b'[a.b.c]\nd = 1\n', limits=limits)
+    assert toml_load(b'a = "[[[["\n', limits=limits) == {'a': '[[[['}
+
+
+def test_yaml_aliases() -> None:
+    assert len(yaml_load(BOMB)['d']) == 10
+
+    with pytest.raises(LimitError, match='more than 5000 nodes'):
+        yaml_load(BOMB, limits=Limits(max_nodes=5000))
+    with pytest.raises(LimitError, match='more than 20 aliases'):
+        yaml_load(BOMB, limits=Limits(max_aliases=20))
+    limits = Limits(max_nodes=1000)
+    assert yaml_load_sections(BOMB, ['a'], limits=limits) == {'a': ['x'] * 10}
+    with pytest.raises(LimitError, match='more than 1000 nodes'):
+        yaml_load_sections(BOMB, ['d'], limits=limits)
+
+
+def test_max_seconds() -> None:
+    doc = ('[' + ', '.join(['x'] * 2000) + ']').encode()
+    with pytest.raises(LimitError, match='took more than 0s'):
+        yaml_load(doc, limits=Limits(max_seconds=0))
+
+
+def test_settings_limits() -> None:
+    class Settings(BaseSettings):  # pylint: disable=too-few-public-methods
+        class Config:  # pylint: disable=too-few-public-methods
+            env_file = None
+            config_max_nodes = 10
+
+        items: list
+
+    assert Settings(config_file=b'{"items": [1, 2]}', config_format='json')
+    with pytest.raises(LimitError, match='more than 10 nodes'):
+        Settings(
+            config_file=b'items: [' + b'1, ' * 20 + b']', config_format='yaml'
+        )
+
+
+@pytest.mark.parametrize(
+    argnames=('limits', 'match'),
+    argvalues=(
+        ({'config_max_nodes': 100}, 'more than 100 nodes'),
+        ({'config_max_depth': 5}, 'deeper than 5'),
+    ),
+)
+def test_include_budget(
+    tmp_path: Path, limits: Dict[str, int], match: str
+) -> None:
+    for i in range(22):  # 2**22 nodes after the includes
+        inc = f'"include": "{i + 1}.json"' if i < 21 else '"x": 1'
+        (tmp_path / f'{i}.json').write_text(
+            f'{{"a": {{{inc}}}, "b": {{{inc}}}}}'
+        )
+
+    class Settings(BaseSettings):  # pylint: disable=too-few-public-methods
+        Config = type(
+            'Config',
+            (),
+            {
+                'env_file': None,
+                'config_include_key': 'include',
+                'config_max_seconds': 1,
+                **limits,
+            },
+        )
+
+        a: dict
+
+    with pytest.raises(LimitError, match=match):
+        Settings(config_file=tmp_path / '0.json')
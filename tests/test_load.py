@@ -1,16 +1,30 @@
 import io
 import json
+import mmap
 import os
 from datetime import datetime
 from ipaddress import IPv4Address
 from pathlib import Path
-from typing import Dict, List, Union
+from typing import Any, Dict, List, Union
 from unittest import mock
 
 import pytest
-from pydantic import BaseModel, Field  # pylint: disable=no-name-in-module
+from pydantic.v1 import (  # pylint: disable=no-name-in-module
+    BaseModel,
+    Field,
+    ValidationError,
+)
 
 from ipl_config import BaseSettings
+from ipl_config.dumploads import (
+    ConfigLoadCallable,
+    ensure_input,
+    hcl2_load,
+    json_load,
+    toml_load,
+    yaml_load,
+    yaml_load_sections,
+)
 
 
 class TcpTransport(BaseModel):  # pylint: disable=too-few-public-methods
@@ -204,3 +218,181 @@ def test_env_complex_prefix() -> None:
         cfg = Config()
         expected = 'xyz'
         assert cfg.vault.token == expected
+
+
+def test_env_json_decode_once() -> None:
+    calls = []
+
+    def loads(s: str) -> Any:
+        calls.append(s)
+        return json.loads(s)
+
+    class Config(BaseSettings):
+        class Config:  # pylint: disable=too-few-public-methods
+            json_loads = staticmethod(loads)
+
+        a: Union[Dict[str, int], List[int], None]
+        b: Union[Dict[str, int], None]
+        c: Dict[str, int]
+        d: Union[Dict[str, int], str]
+
+    with mock.patch.dict(
+        os.environ,
+        {
+            'APP_A': '{"x": 1}',
+            'APP_B': '{"x": 1}',
+            'APP_C': '{"x": 1}',
+            'APP_D': '{1}',
+        },
+    ):
+        c = Config()
+
+    assert c.a == c.b == c.c == {'x': 1}
+    assert c.d == '{1}'
+    assert sorted(calls) == ['{"x": 1}', '{1}']
+
+
+@pytest.mark.parametrize(
+    'conf_file',
+    ('examples/config_example.yaml', 'examples/config_example.json'),
+)
+def test_load_section(root_dir: Path, conf_file: str) -> None:
+    with mock.patch.dict(os.environ, {'buff_size': '-1', 'APP_VERSION': '1'}):
+        transport = IplConfig.load_section(
+            'http.transport',
+            env_file=root_dir / 'tests/.env',
+            config_file=root_dir / conf_file,
+        )
+        assert transport == TcpTransport(timeout=60.0, buffer_size=-1)
+
+        sections = IplConfig.load_sections(
+            'http.port', 'version', config_file=root_dir / conf_file
+        )
+        assert sections == {'http.port': 10001, 'version': '1'}
+
+    with pytest.raises(ValidationError, match=r'http -> bind'):
+        IplConfig.load_section('http.bind', config_file=root_dir / conf_file)
+    with pytest.raises(ValueError, match='not a settings section'):
+        IplConfig.load_section('http.port.x')
+
+
+def test_load_section_not_singleton() -> None:
+    class Item(BaseModel):  # pylint: disable=too-few-public-methods
+        name: str
+
+    class Config(BaseSettings):
+        items: List[Item] = []
+        named: Dict[str, Item] = {}
+
+    for path in ('items.name', 'named.name'):
+        with pytest.raises(ValueError, match='not a settings section'):
+            Config.load_section(path)
+
+
+def test_load_section_interpolate_alias(tmp_path: Path) -> None:
+    class Http(BaseModel):  # pylint: disable=too-few-public-methods
+        url: str
+        bind_port: int = Field(alias='port')
+
+    class Config(BaseSettings):
+        class Config:  # pylint: disable=too-few-public-methods
+            env_file = None
+            config_interpolate = True
+
+        common: Dict[str, str]
+        web: Http = Field(alias='http')
+
+    config_file = tmp_path / 'config.yaml'
+    config_file.write_text(
+        'common: {host: example.com}\n'
+        'http: {url: "http://${common.host}", port: 1}\n'
+    )
+
+    with pytest.warns(FutureWarning, match='aliases'):
+        sections = Config.load_sections(
+            'web.url', 'web.bind_port', config_file=config_file
+        )
+    assert sections == {'web.url': 'http://example.com', 'web.bind_port': 1}
+
+
+def test_yaml_skip_sections() -> None:
+    doc = (
+        'base: &b {x: 1}\n'
+        'skip: {deep: [1, {a: 2}, [3]]}\n'
+        'http: {<<: *b, port: 1}\n'
+    )
+    assert yaml_load_sections(io.StringIO(doc), ['http']) == {
+        'http': {'x': 1, 'port': 1}
+    }
+    assert yaml_load_sections(io.StringIO(doc), ['skip']) == {
+        'skip': {'deep': [1, {'a': 2}, [3]]}
+    }
+
+
+@pytest.mark.parametrize(
+    argnames=('loader', 'conf_file'),
+    argvalues=(
+        (json_load, 'examples/config_example.json'),
+        (yaml_load, 'examples/config_example.yaml'),
+        (toml_load, 'examples/config_example.toml'),
+        (hcl2_load, 'examples/config_example.tf'),
+    ),
+)
+def test_load_bytes(
+    root_dir: Path, loader: ConfigLoadCallable, conf_file: str
+) -> None:
+    path = root_dir / conf_file
+    expected = loader(path)
+    content = path.read_bytes()
+
+    assert loader(content) == expected
+    assert loader(bytearray(content)) == expected
+    assert loader(memoryview(content)) == expected
+    assert loader(io.BytesIO(content)) == expected
+    with mock.patch('ipl_config.dumploads.MMAP_THRESHOLD', 0):
+        assert loader(path) == expected
+    with mock.patch('sys.stdin', io.TextIOWrapper(io.BytesIO(content))):
+        assert loader('-') == expected
+
+
+@pytest.mark.parametrize(
+    argnames=('loader', 'content', 'expected'),
+    argvalues=(
+        (json_load, b'{"a": "\xc3\xa9\xff"}', {'a': '\xe9\udcff'}),
+        (yaml_load, b'a: "\xc3\xa9"', {'a': '\xe9'}),
+    ),
+)
+def test_load_mmap(
+    tmp_path: Path, loader: ConfigLoadCallable, content: bytes, expected: Any
+) -> None:
+    path = tmp_path / 'config'
+    path.write_bytes(content)
+
+    with ensure_input(path) as s:
+        assert not isinstance(s, mmap.mmap)
+    assert loader(path) == expected
+    with mock.patch('ipl_config.dumploads.MMAP_THRESHOLD', 0):
+        with ensure_input(path) as s:
+            assert isinstance(s, mmap.mmap)
+        assert loader(path) == expected
+
+
+def test_config_bytes(root_dir: Path) -> None:
+    content = (root_dir / 'examples/config_example.json').read_bytes()
+    env_file = root_dir / 'tests/.env'
+    env = {'APP_CREATED': '2000-01-01T00:00:00Z', 'app_http_bind': '0.0.0.0'}
+    with mock.patch.dict(os.environ, env):
+        with pytest.warns(DeprecationWarning):
+            cfg = IplConfig(
+                env_file=env_file, config_file=content, config_format='json'
+            )
+        assert cfg.http.port == 10001
+
+        with mock.patch('sys.stdin', io.TextIOWrapper(io.BytesIO(content))):
+            with pytest.warns(DeprecationWarning):
+                assert cfg == IplConfig(
+                    env_file=env_file, config_file='-', config_format='json'
+                )
+
+    with pytest.raises(NotImplementedError, match='No readers found'):
+        IplConfig(config_file=content)
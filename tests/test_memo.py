@@ -0,0 +1,154 @@
+import os
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Set
+from unittest import mock
+
+import pytest
+from pydantic.v1 import BaseModel  # pylint: disable=no-name-in-module
+
+from ipl_config import BaseSettings
+
+
+class Settings(BaseSettings):  # pylint: disable=too-few-public-methods
+    class Config:  # pylint: disable=too-few-public-methods
+        env_file = None
+        config_include_key = 'include'
+        memo_size = 2
+
+    port: int
+    name: str = 'app'
+
+
+def test_memoized(tmp_path: Path) -> None:
+    (tmp_path / 'base.json').write_text('{"name": "base"}')
+    config = tmp_path / 'config.json'
+    config.write_text('{"port": 1, "include": "base.json"}')
+
+    cfg = Settings.memoized(config_file=config)
+    assert cfg.port == 1
+    assert cfg.name == 'base'
+    assert Settings.memoized(config_file=config) is cfg
+    with pytest.raises(TypeError, match='memoized and immutable'):
+        cfg.port = 2
+    copy = cfg.copy()
+    copy.port = 2
+
+    assert Settings.memoized(config_file=config, name='x') is not cfg
+    with mock.patch.dict(os.environ, {'APP_NAME': 'env'}):
+        assert Settings.memoized(config_file=config).name == 'env'
+    assert Settings.memoized(config_file=config) is not cfg  # evicted
+
+    cfg = Settings.memoized(config_file=config)
+    (tmp_path / 'base.json').write_text('{"name": "changed"}')
+    assert Settings.memoized(config_file=config).name == 'changed'
+
+    content = b'{"port": 3}'
+    cfg = Settings.memoized(config_file=content, config_format='json')
+    assert cfg is Settings.memoized(
+        config_file=bytearray(content), config_format='json'
+    )
+
+    Settings.invalidate_memo()
+    assert (
+        Settings.memoized(config_file=content, config_format='json') is not cfg
+    )
+
+
+def test_memoized_working_dir(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    class DotEnv(Settings):  # pylint: disable=too-few-public-methods
+        class Config:  # pylint: disable=too-few-public-methods
+            env_file = '.env'
+
+    for port in (1, 2):
+        (tmp_path / str(port)).mkdir()
+        (tmp_path / str(port) / 'c.json').write_text(f'{{"port": {port}}}')
+        (tmp_path / str(port) / '.env').write_text(f'APP_NAME=env{port}\n')
+
+    for port in (1, 2):
+        monkeypatch.chdir(tmp_path / str(port))
+        assert Settings.memoized(config_file='c.json').port == port
+        assert DotEnv.memoized(port=0).name == f"env{port}"
+
+
+def test_memoized_not_serializable() -> None:
+    cfg = Settings.memoized(port=1, ignored=object())
+    assert Settings.memoized(port=1, ignored=object()) is not cfg
+
+
+class Db(BaseModel):  # pylint: disable=too-few-public-methods
+    hosts: List[str]
+    options: Dict[str, List[int]] = {}
+
+
+class Nested(BaseSettings):  # pylint: disable=too-few-public-methods
+    class Config:  # pylint: disable=too-few-public-methods
+        env_file = None
+        config_interpolate = True
+
+    db: Db
+    tags: Set[str] = set()
+
+
+def test_memoized_deep_freeze(tmp_path: Path) -> None:
+    config = tmp_path / 'config.json'
+    config.write_text(
+        '{"db": {"hosts": ["a"], "options": {"x": [1]}}, "tags": ["t"]}'
+    )
+
+    cfg = Nested.memoized(config_file=config)
+    with pytest.raises(TypeError, match='"Db" is memoized and immutable'):
+        cfg.db.hosts = []
+    with pytest.raises(TypeError, match='immutable'):
+        cfg.db.hosts.append('b')
+    with pytest.raises(TypeError, match='immutable'):
+        cfg.db.options['y'] = [2]
+    with pytest.raises(TypeError, match='immutable'):
+        cfg.db.options['x'].append(2)
+    with pytest.raises(AttributeError):
+        cfg.tags.add('u')  # type: ignore[attr-defined]
+    assert isinstance(cfg.db, Db)
+    assert cfg.db == Db(hosts=['a'], options={'x': [1]})
+
+    expected = {'db': {'hosts': ['a'], 'options': {'x': [1]}}, 'tags': {'t'}}
+    assert cfg.dict() == expected
+    assert type(cfg.dict()['db']['hosts']) is list
+    assert pickle.loads(pickle.dumps(cfg.db)) == cfg.db
+
+    copy = cfg.copy()
+    copy.db.hosts.append('b')
+    copy.db.options['x'].append(2)
+    copy.tags.add('u')
+    copy.db = Db(hosts=[])
+    assert cfg.dict() == expected
+    assert Nested.memoized(config_file=config) is cfg
+
+
+def test_memoized_env(tmp_path: Path) -> None:
+    config = tmp_path / 'config.json'
+    config.write_text('{"db": {"hosts": ["${X_HOST}"]}}')
+
+    with mock.patch.dict(os.environ, {'X_HOST': 'a'}):
+        cfg = Nested.memoized(config_file=config)
+        with mock.patch.dict(os.environ, {'X_UNRELATED': '1'}):
+            assert Nested.memoized(config_file=config) is cfg
+    with mock.patch.dict(os.environ, {'X_HOST': 'b'}):
+        assert Nested.memoized(config_file=config).db.hosts == ['b']
+    with mock.patch.dict(os.environ, {'X_HOST': 'b', 'App_Tags': '["x"]'}):
+        assert Nested.memoized(config_file=config).tags == {'x'}
+
+
+def test_memoized_threads(tmp_path: Path) -> None:
+    config = tmp_path / 'config.json'
+    config.write_text('{"port": 1}')
+    Settings.invalidate_memo()
+
+    def build(i: int) -> Settings:
+        return Settings.memoized(config_file=config, name=str(i % 4))
+
+    with ThreadPoolExecutor(8) as pool:
+        res = list(pool.map(build, range(200)))
+    assert {cfg.name for cfg in res} == {'0', '1', '2', '3'}
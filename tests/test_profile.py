@@ -0,0 +1,72 @@
+import io
+import os
+from pathlib import Path
+from typing import Dict
+from unittest import mock
+
+from pydantic.v1 import BaseModel  # pylint: disable=no-name-in-module
+
+from ipl_config import BaseSettings
+from ipl_config.profiler import profile, span
+
+
+class Db(BaseModel):  # pylint: disable=too-few-public-methods
+    port: int
+
+
+class Settings(BaseSettings):  # pylint: disable=too-few-public-methods
+    class Config:  # pylint: disable=too-few-public-methods
+        env_file = None
+        config_include_key = 'include'
+
+    name: str
+    meta: Dict[str, int]
+    db: Db
+
+
+def test_profile(tmp_path: Path) -> None:
+    (tmp_path / 'base.json').write_text('{"db": {"port": 1}}')
+    config = tmp_path / 'config.json'
+    config.write_text('{"name": "x", "include": "base.json"}')
+
+    with mock.patch.dict(os.environ, {'APP_META': '{"a": 1}'}):
+        with profile(allocations=True) as p:
+            Settings(config_file=config)
+
+    root = ('settings:Settings',)
+    env = root + ('source:EnvSettingsStrategy',)
+    source = root + ('source:JsonSettingsStrategy',)
+    paths = set(p.stats)
+    assert {
+        root + ('strategies',),
+        root + ('merge',),
+        root + ('validate',),
+        env + ('field:name', 'env_lookup'),
+        env + ('field:meta', 'json_decode'),
+        env + ('field:db', 'field:port'),
+        source + (f"parse:{config}",),
+        source + (f"parse:{tmp_path / 'base.json'}",),
+    } <= paths
+
+    stat = p.stats[root]
+    assert stat.calls == 1
+    assert stat.total_ns >= stat.self_ns >= 0
+    assert stat.alloc > 0
+    assert p.sorted()[0][0] == root
+    assert p.report(limit=1).splitlines()[1].endswith('  settings:Settings')
+
+    f = io.StringIO()
+    p.write_collapsed(f)
+    for line in f.getvalue().splitlines():
+        stack, value = line.rsplit(' ', 1)
+        assert tuple(stack.split(';')) in paths
+        assert int(value) > 0
+
+
+def test_profile_inactive() -> None:
+    with profile() as p:
+        pass
+    with span('settings', 'x'):
+        pass
+    assert not p.stats
+    assert p.collapsed() == ''
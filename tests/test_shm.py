@@ -0,0 +1,96 @@
+import multiprocessing
+import os
+import struct
+import sys
+from typing import Any
+from unittest import mock
+
+import pytest
+
+from ipl_config import BaseSettings, shm
+from ipl_config.shm import AttachedSettings, read_control, unlink
+
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (3, 8), reason='multiprocessing.shared_memory'
+)
+
+
+class Config(BaseSettings):
+    class Config:  # pylint: disable=too-few-public-methods
+        env_file = None
+
+    version: int = 0
+
+
+def _attach(name: str, queue: Any) -> None:
+    queue.put(Config.attach(name).version)
+
+
+@pytest.fixture
+def name() -> Any:
+    name = f"ipl_config_test_{os.getpid()}"
+    yield name
+    unlink(name)
+
+
+def test_publish_attach(name: str) -> None:
+    assert Config(version=1).publish(name) == 1
+    assert Config.attach(name) == Config(version=1)
+
+    shared = AttachedSettings(name, Config)
+    cfg = shared.get()
+    assert shared.get() is cfg
+
+    assert Config(version=2).publish(name) == 2
+    assert shared.version == 2
+    assert shared.get().version == 2
+    shared.close()
+
+    queue = multiprocessing.get_context('spawn').Queue()
+    p = multiprocessing.get_context('spawn').Process(
+        target=_attach, args=(name, queue)
+    )
+    p.start()
+    p.join(30)
+    assert queue.get(timeout=1) == 2
+
+
+def test_attach_wrong_class(name: str) -> None:
+    class Other(BaseSettings):
+        pass
+
+    Config().publish(name)
+    with pytest.raises(TypeError):
+        Other.attach(name)
+
+
+def test_read_control_timeout(name: str) -> None:
+    Config().publish(name)
+    control = shm._shared_memory(name)  # pylint: disable=protected-access
+    seq = struct.unpack_from('<Q', control.buf)[0]
+    struct.pack_into('<Q', control.buf, 0, seq + 1)  # died mid write
+    try:
+        with pytest.raises(TimeoutError, match='being written'):
+            read_control(control, timeout=0.01)
+    finally:
+        struct.pack_into('<Q', control.buf, 0, seq + 2)
+    assert read_control(control)[0] == 1
+    control.close()
+
+
+def test_attach_untracked(name: str) -> None:
+    Config().publish(name)
+    with mock.patch(
+        'multiprocessing.resource_tracker.unregister'
+    ) as unregister:
+        shm._attach(name).close()  # the publisher keeps its registration
+        unregister.assert_not_called()
+        with mock.patch('ipl_config.shm._created', set()):
+            with mock.patch('ipl_config.shm._forked', True):
+                shm._attach(name).close()
+            unregister.assert_not_called()
+
+            shm._attach(name).close()
+    if sys.version_info < (3, 13):
+        unregister.assert_called_once()
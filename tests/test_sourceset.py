@@ -0,0 +1,108 @@
+import os
+from pathlib import Path
+from unittest import mock
+
+import pytest
+from pydantic.v1 import BaseModel  # pylint: disable=no-name-in-module
+
+from ipl_config import BaseSettings, SourceSet
+from ipl_config.dumploads import json_load
+from ipl_config.limits import LimitError
+from ipl_config.source import read_env_file
+from ipl_config.types import PackedIntSet
+
+
+class Pool(BaseModel):  # pylint: disable=too-few-public-methods
+    size: int = 1
+
+
+class HttpSettings(BaseSettings):  # pylint: disable=too-few-public-methods
+    class Config:  # pylint: disable=too-few-public-methods
+        env_prefix = 'http'
+
+    port: int
+    pool: Pool = Pool()
+
+
+class DbSettings(BaseSettings):  # pylint: disable=too-few-public-methods
+    class Config:  # pylint: disable=too-few-public-methods
+        env_prefix = 'db'
+
+    dsn: str
+    pool: Pool = Pool()
+
+
+def test_source_set(tmp_path: Path) -> None:
+    (tmp_path / '.env').write_text('DB_DSN=pg://a\nHTTP_POOL_SIZE=3\n')
+    (tmp_path / 'config.json').write_text('{"port": 80, "dsn": "pg://b"}')
+
+    with mock.patch.dict(os.environ, {'DB_POOL_SIZE': '5'}), mock.patch(
+        'ipl_config.source.json_load', wraps=json_load
+    ) as load, mock.patch(
+        'ipl_config.sourceset.read_env_file', wraps=read_env_file
+    ) as read_env:
+        sources = SourceSet(
+            env_file=tmp_path / '.env', config_file=tmp_path / 'config.json'
+        )
+        http, db = sources.build(HttpSettings, DbSettings)
+        assert sources.load(HttpSettings, port=81).port == 81
+
+        assert load.call_count == 1
+        assert read_env.call_count == 1
+
+        expected = HttpSettings(
+            env_file=tmp_path / '.env', config_file=tmp_path / 'config.json'
+        )
+        assert http == expected
+        assert http.pool.size == 3
+        assert db.dsn == 'pg://a'
+        assert db.pool.size == 5
+
+    # the env is a snapshot
+    assert sources.load(DbSettings).pool.size == 5
+
+    (tmp_path / '.env').write_text('DB_DSN=pg://c\n')
+    assert sources.load(DbSettings).dsn == 'pg://a'
+    sources.clear()
+    assert sources.load(DbSettings).dsn == 'pg://c'
+
+
+def test_source_set_limits() -> None:
+    class Loose(BaseSettings):  # pylint: disable=too-few-public-methods
+        class Config:  # pylint: disable=too-few-public-methods
+            env_file = None
+
+        name: str
+
+    class Strict(Loose):  # pylint: disable=too-few-public-methods
+        class Config:  # pylint: disable=too-few-public-methods
+            config_max_bytes = 100
+
+    sources = SourceSet(
+        config_file=b'{"name": "%s"}' % (b'x' * 5000), config_format='json'
+    )
+    assert len(sources.load(Loose).name) == 5000
+    with pytest.raises(LimitError, match='larger than 100 bytes'):
+        sources.load(Strict)
+
+
+def test_source_set_file_refs(tmp_path: Path) -> None:
+    class Plain(BaseSettings):  # pylint: disable=too-few-public-methods
+        class Config:  # pylint: disable=too-few-public-methods
+            env_file = None
+
+        ids: str
+
+    class Packed(Plain):  # pylint: disable=too-few-public-methods
+        ids: PackedIntSet  # type: ignore[assignment]
+
+    (tmp_path / 'ids.txt').write_text('2\n1\n')
+    (tmp_path / 'config.json').write_text('{"ids": "@ids.txt"}')
+
+    for classes in ((Plain, Packed), (Packed, Plain)):
+        sources = SourceSet(config_file=tmp_path / 'config.json')
+        plain, packed = sorted(
+            sources.build(*classes), key=lambda s: type(s) is Packed
+        )
+        assert plain.ids == '@ids.txt'
+        assert list(packed.ids) == [1, 2]
@@ -0,0 +1,168 @@
+import json
+import os
+import pickle
+from ipaddress import IPv4Address
+from pathlib import Path
+from typing import Any, Dict
+from unittest import mock
+
+import pytest
+from pydantic.v1 import BaseModel  # pylint: disable=no-name-in-module
+from pydantic.v1 import ValidationError  # pylint: disable=no-name-in-module
+
+from ipl_config import BaseSettings
+from ipl_config.dumploads import json_iter_array
+from ipl_config.types import (  # noqa: I101
+    FileRefError,
+    PackedIntSet,
+    PackedIPv4Set,
+)
+
+
+class Http(BaseModel):  # pylint: disable=too-few-public-methods
+    interfaces: PackedIPv4Set
+
+
+class Config(BaseSettings):
+    class Config:  # pylint: disable=too-few-public-methods
+        env_file = None
+
+    http: Http
+    ids: PackedIntSet = PackedIntSet()
+
+
+def test_packed_ipv4_set(tmp_path: Path) -> None:
+    allowlist = tmp_path / 'allow.txt'
+    allowlist.write_text('# allow\n10.0.0.2\n10.0.0.1  # gw\n\n10.0.0.2\n')
+
+    with mock.patch.dict(os.environ, {'APP_IDS': '3, 1, 2, 3'}):
+        cfg = Config(http={'interfaces': f"@{allowlist}"})
+
+    ips = cfg.http.interfaces
+    assert list(ips) == [IPv4Address('10.0.0.1'), IPv4Address('10.0.0.2')]
+    assert '10.0.0.2' in ips and IPv4Address('10.0.0.1') in ips
+    assert '10.0.0.3' not in ips and 'garbage' not in ips
+    assert ips.nbytes == 8
+    assert list(cfg.ids) == [1, 2, 3]
+
+    assert json.loads(cfg.json()) == {
+        'http': {'interfaces': ['10.0.0.1', '10.0.0.2']},
+        'ids': [1, 2, 3],
+    }
+    assert cfg.to_env() == {
+        'APP_HTTP_INTERFACES': '10.0.0.1,10.0.0.2',
+        'APP_IDS': '1,2,3',
+    }
+    assert pickle.loads(pickle.dumps(cfg)) == cfg
+
+    with pytest.raises(ValidationError):
+        Config(http={'interfaces': ['10.0.0.256']})
+    with pytest.raises(ValidationError):
+        Config(http={'interfaces': f"@{tmp_path / 'missing.txt'}"})
+    with pytest.raises(ValidationError, match='out of range'):
+        Config(http={'interfaces': []}, ids=[2**63])
+
+
+def test_packed_relative_path(tmp_path: Path) -> None:
+    (tmp_path / 'lists').mkdir()
+    (tmp_path / 'lists' / 'allow.txt').write_text('10.0.0.1\n')
+    (tmp_path / 'ids.json').write_text('[2, 1]')
+    config_file = tmp_path / 'config.json'
+    config_file.write_text(
+        '{"http": {"interfaces": "@lists/allow.txt"}, "ids": "@ids.json"}'
+    )
+
+    cfg = Config(config_file=config_file)
+    assert list(cfg.http.interfaces) == [IPv4Address('10.0.0.1')]
+    assert list(cfg.ids) == [1, 2]
+
+
+@pytest.mark.parametrize(
+    argnames=('ref', 'match'),
+    argvalues=(
+        ('@/etc/passwd', 'must be relative'),
+        ('@~/ids.txt', 'must be relative'),
+        ('@../ids.txt', 'outside of'),
+        ('@lists/../../ids.txt', 'outside of'),
+    ),
+)
+def test_packed_path_confined(tmp_path: Path, ref: str, match: str) -> None:
+    (tmp_path / 'ids.txt').write_text('1\n')
+    (tmp_path / 'sub').mkdir()
+    config_file = tmp_path / 'sub/config.json'
+    config_file.write_text(json.dumps({'http': {'interfaces': ref}}))
+
+    with pytest.raises(FileRefError, match=match):
+        Config(config_file=config_file)
+    with pytest.raises(FileRefError, match=match):
+        Config(config_file=config_file.read_bytes(), config_format='json')
+
+
+def test_packed_path_content_hidden(tmp_path: Path) -> None:
+    secret = tmp_path / 'secret.txt'
+    secret.write_text('root:x:0:0:root:/root:/bin/bash\n')
+    config_file = tmp_path / 'config.json'
+    config_file.write_text('{"http": {"interfaces": "@secret.txt"}}')
+
+    with pytest.raises(ValidationError) as e:
+        Config(config_file=config_file)
+    assert 'not a valid PackedIPv4Set file' in str(e.value)
+    assert '/bin/bash' not in str(e.value)
+
+
+def test_packed_chunks(tmp_path: Path) -> None:
+    ids = tmp_path / 'ids.json'
+    ids.write_text(json.dumps(list(range(200000, 0, -1)) + [5]))
+
+    with mock.patch('ipl_config.types.CHUNK_SIZE', 1000):
+        packed = PackedIntSet.from_file(ids)
+    assert len(packed) == 200000
+    assert packed[0] == 1 and packed[-1] == 200000
+    assert 150000 in packed and 0 not in packed
+
+
+def test_json_iter_array(tmp_path: Path) -> None:
+    f = tmp_path / 'array.json'
+    f.write_text(' [1, 2.5, "a,]", {"x": [1]}, [], 12345] ')
+    expected = [1, 2.5, 'a,]', {'x': [1]}, [], 12345]
+    assert list(json_iter_array(f, chunk_size=3)) == expected
+
+    f.write_text('{}')
+    with pytest.raises(ValueError):
+        list(json_iter_array(f))
+
+
+class Limited(Config):
+    class Config:  # pylint: disable=too-few-public-methods
+        config_max_bytes = 100
+        config_max_nodes = 10
+
+
+def test_packed_limits(tmp_path: Path) -> None:
+    ids = tmp_path / 'ids.json'
+    ids.write_text(json.dumps(list(range(20))))
+    http: Dict[str, Any] = {'interfaces': []}
+
+    assert len(Config(http=http, ids=f"@{ids}").ids) == 20
+    with pytest.raises(ValidationError, match='more than 10 nodes'):
+        Limited(http=http, ids=f"@{ids}")
+    with pytest.raises(ValidationError, match='larger than 100 bytes'):
+        Limited(http=http, ids='@/dev/zero')
+
+
+class Shared(Config):
+    class Config:  # pylint: disable=too-few-public-methods
+        config_include_root = '..'
+
+
+def test_packed_path_include_root(tmp_path: Path) -> None:
+    (tmp_path / 'ids.txt').write_text('1\n')
+    (tmp_path / 'sub').mkdir()
+    config_file = tmp_path / 'sub/config.json'
+    config_file.write_text(
+        '{"http": {"interfaces": []}, "ids": "@../ids.txt"}'
+    )
+
+    with pytest.raises(FileRefError, match='outside of'):
+        Config(config_file=config_file)
+    assert list(Shared(config_file=config_file).ids) == [1]
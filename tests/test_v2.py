@@ -0,0 +1,167 @@
+import io
+import json
+import os
+from datetime import datetime
+from ipaddress import IPv4Address
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+from unittest import mock
+
+import pytest
+
+
+pytest.importorskip('pydantic_core')
+
+# pylint: disable=wrong-import-position
+from pydantic import BaseModel, Field  # noqa: E402, I202
+
+from ipl_config import BaseSettings as BaseSettingsV1  # noqa: E402
+from ipl_config.v2 import BaseSettings, SettingsConfigDict  # noqa: E402
+
+
+class TcpTransport(BaseModel):  # pylint: disable=too-few-public-methods
+    timeout: float
+    buffer_size: int = Field(0.01, json_schema_extra={'env': 'BUFF_size'})
+
+
+class Http(BaseModel):  # pylint: disable=too-few-public-methods
+    host: str
+    bind: str
+    port: int
+    interfaces: List[IPv4Address]
+    transport: TcpTransport
+    http2: bool = Field(json_schema_extra={'env': 'HTTP_2'})
+
+
+class IplConfig(BaseSettings):  # pylint: disable=too-few-public-methods
+    created: datetime
+    version: str = 'v1'
+    http_host: str = Field(json_schema_extra={'deprecated': True})
+    http: Http
+
+
+@pytest.mark.parametrize(
+    'conf_file',
+    (
+        'examples/config_example.json',
+        'examples/config_example.yaml',
+        'examples/config_example.toml',
+    ),
+)
+def test_config_file(root_dir: Path, conf_file: str) -> None:
+    with mock.patch.dict(
+        os.environ,
+        {
+            'APP_CREATED': '2000-01-01T00:00:00Z',
+            'app_http_bind': '0.0.0.0',
+            'buff_size': '-1',
+        },
+    ):
+        with pytest.warns(
+            DeprecationWarning, match="'http_host' is deprecated"
+        ):
+            cfg = IplConfig(
+                env_file=root_dir / 'tests/.env',
+                config_file=root_dir / conf_file,
+                version=999,
+            )
+
+    f = io.StringIO()
+    cfg.write_json(f)
+    assert json.loads(f.getvalue()) == {
+        'created': '2000-01-01T00:00:00Z',
+        'version': '999',
+        'http_host': 'myname.lan',
+        'http': {
+            'host': 'myname.lan',
+            'bind': '0.0.0.0',
+            'interfaces': ['127.0.0.1', '192.168.0.1'],
+            'port': 10001,
+            'transport': {'timeout': 60.0, 'buffer_size': -1},
+            'http2': True,
+        },
+    }
+
+
+def test_env_complex() -> None:
+    class Vault(BaseModel):  # pylint: disable=too-few-public-methods
+        token: str
+
+    class Config(BaseSettings):
+        extra: Dict[str, Dict[str, float]]
+        lst: List[str]
+        js_err: Union[dict, str]
+        vault: Optional[Vault] = Field(json_schema_extra={'env_prefix': 'X'})
+
+    with mock.patch.dict(
+        os.environ,
+        {
+            'APP_EXTRA': '{"sub": {"x": 1.5}}',
+            'APP_JS_ERR': '{1}',
+            'APP_LST': '[1]',
+            'X_VAULT_TOKEN': 'xyz',
+        },
+    ):
+        c = Config()
+
+    assert c.extra == {'sub': {'x': 1.5}}
+    assert c.lst == ['1']
+    assert c.js_err == '{1}'
+    assert c.vault == Vault(token='xyz')
+    assert Config.env_manifest() == (
+        'app_extra',
+        'app_lst',
+        'app_js_err',
+        'x_vault_token',
+    )
+
+
+def test_same_as_v1() -> None:
+    class V1(BaseSettingsV1):
+        class Config:  # pylint: disable=too-few-public-methods
+            env_file = None
+
+        port: int
+        hosts: List[str]
+
+    class V2(BaseSettings):
+        model_config = SettingsConfigDict(env_file=None)
+
+        port: int
+        hosts: List[str]
+
+    config = b'{"port": 1, "hosts": ["a"], "include": []}'
+    with mock.patch.dict(os.environ, {'APP_HOSTS': '["b"]'}):
+        v1 = V1(config_file=config, config_format='json', port=2)
+        v2 = V2(config_file=config, config_format='json', port=2)
+    assert v1.dict() == v2.model_dump() == {'port': 2, 'hosts': ['b']}
+
+
+def test_same_api_as_v1(tmp_path: Path) -> None:
+    class Sub(BaseModel):  # pylint: disable=too-few-public-methods
+        flag: bool = True
+
+    class Config(BaseSettings):
+        model_config = SettingsConfigDict(env_file=None)
+
+        port: int = 1
+        created: datetime = datetime(2000, 1, 1)
+        sub: Sub = Sub()
+
+    cfg = Config()
+    assert cfg.to_env(exclude={'created'}) == {
+        'APP_PORT': '1',
+        'APP_SUB_FLAG': '1',
+    }
+    assert cfg.safe_dict()['created'] == '2000-01-01T00:00:00'
+    assert json.loads(Config.schema_text())['title'] == 'Config'
+    assert Config.schema_text() is Config.schema_text()
+    f = io.StringIO()
+    Config.write_schema(f)
+    assert f.getvalue() == Config.schema_bytes().decode()
+
+    other = Config(port=2)
+    assert cfg.fingerprint() == Config().fingerprint() != other.fingerprint()
+    assert cfg.diff(other) == {'port': (1, 2)}
+    assert not hasattr(Config, 'load_sections')
+    assert not hasattr(Config, 'memoized')